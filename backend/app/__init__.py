@@ -5,10 +5,24 @@ from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_mail import Mail
 from flask_socketio import SocketIO
+from app.utils.cache import ResponseCache
+from app.utils.email_queue import EmailDispatcher
+from app.utils.cv_queue import CVParseQueue
+from app.utils.analytics_buffer import AnalyticsBuffer
+from app.utils.revocation import TokenBlocklist
+from app.utils.passwords import PasswordHasher
 
 db = SQLAlchemy()
 bcrypt = Bcrypt()
 migrate = Migrate()
 jwt = JWTManager()
 mail = Mail()
-socketio = SocketIO() 
\ No newline at end of file
+socketio = SocketIO()
+job_cache = ResponseCache('job')
+dashboard_cache = ResponseCache('dashboard')
+identity_cache = ResponseCache('identity')
+token_blocklist = TokenBlocklist()
+password_hasher = PasswordHasher()
+email_dispatcher = EmailDispatcher()
+cv_parse_queue = CVParseQueue()
+analytics_buffer = AnalyticsBuffer() 
\ No newline at end of file
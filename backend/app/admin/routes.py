@@ -1,100 +1,122 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
+from app import db, job_cache, dashboard_cache, token_blocklist
 from app.models.user import User, UserRole
 from app.models.job import Job, JobCategory
 from app.models.application import Application
-from app.models.feedback import Feedback, FeedbackStatus
+from app.models.feedback import Feedback, FeedbackStatus, FeedbackPriority
 from app.models.notification import Notification
+from app.utils.serialization import with_serialization
+from app.utils.pagination import keyset_paginate, InvalidCursor, NEWEST_FIRST_KEYS
+from app.utils.identity import invalidate_identity, admin_required
+from app.utils.cache import invalidate_employer_jobs
 from datetime import datetime, timedelta
-from sqlalchemy import func, or_
-import functools
+from sqlalchemy import func, or_, and_, case, true
+from sqlalchemy.orm import joinedload
+import threading
 
 admin_bp = Blueprint('admin', __name__)
 
-def admin_required(f):
-    """Decorator to check if user is admin"""
-    @functools.wraps(f)
-    def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or user.role != UserRole.ADMIN:
-            return jsonify({'error': 'Admin access required'}), 403
-        
-        return f(*args, **kwargs)
-    return decorated_function
+def _count_if(condition):
+    """COUNT of the rows matching `condition`, as a conditional aggregate"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+def _dashboard_statistics():
+    """All dashboard counters in a single statement: one conditional-aggregate scan per table"""
+    today = datetime.utcnow().date()
+    users = db.session.query(
+        func.count(User.id).label('users_total'),
+        _count_if(User.role == UserRole.JOB_SEEKER).label('job_seekers'),
+        _count_if(User.role == UserRole.EMPLOYER).label('employers'),
+        _count_if(User.created_at >= today).label('users_today')
+    ).subquery()
+    jobs = db.session.query(
+        func.count(Job.id).label('jobs_total'),
+        _count_if(and_(Job.is_active == True, Job.status == 'open')).label('jobs_active'),
+        _count_if(Job.is_featured == True).label('jobs_featured'),
+        _count_if(Job.created_at >= today).label('jobs_today')
+    ).subquery()
+    applications = db.session.query(
+        func.count(Application.id).label('applications_total'),
+        _count_if(Application.applied_at >= today).label('applications_today')
+    ).subquery()
+    feedback = db.session.query(
+        _count_if(Feedback.status == FeedbackStatus.OPEN).label('feedback_open'),
+        _count_if(Feedback.priority == FeedbackPriority.URGENT).label('feedback_urgent')
+    ).subquery()
+    # Each subquery is a single row, so joining them on TRUE yields exactly one row
+    row = db.session.query(users, jobs, applications, feedback).select_from(users).join(
+        jobs, true()
+    ).join(applications, true()).join(feedback, true()).one()
+    
+    return {
+        'users': {
+            'total': row.users_total,
+            'job_seekers': row.job_seekers,
+            'employers': row.employers,
+            'new_today': row.users_today
+        },
+        'jobs': {
+            'total': row.jobs_total,
+            'active': row.jobs_active,
+            'featured': row.jobs_featured,
+            'new_today': row.jobs_today
+        },
+        'applications': {
+            'total': row.applications_total,
+            'today': row.applications_today
+        },
+        'feedback': {
+            'open': row.feedback_open,
+            'urgent': row.feedback_urgent
+        }
+    }
+
+def _dashboard_body():
+    """Serialize the dashboard snapshot (statistics plus recent activity) as a JSON body"""
+    recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
+    recent_jobs = with_serialization(Job.query, Job).order_by(Job.created_at.desc()).limit(5).all()
+    recent_applications = with_serialization(Application.query, Application).order_by(Application.applied_at.desc()).limit(5).all()
+    
+    return current_app.json.dumps({
+        'statistics': _dashboard_statistics(),
+        'recent_activity': {
+            'users': [user.to_dict() for user in recent_users],
+            'jobs': [job.to_dict() for job in recent_jobs],
+            'applications': [app.to_dict() for app in recent_applications]
+        },
+        'generated_at': datetime.utcnow().isoformat()
+    }).encode('utf-8')
+
+# Serializes snapshot rebuilds so concurrent admins on a cold cache share one scan
+_dashboard_lock = threading.Lock()
 
 @admin_bp.route('/dashboard', methods=['GET'])
 @jwt_required()
 @admin_required
 def get_dashboard():
-    """Get admin dashboard statistics"""
+    """Get admin dashboard statistics (a snapshot cached for DASHBOARD_CACHE_TTL seconds)"""
     try:
-        # User statistics
-        total_users = User.query.count()
-        job_seekers = User.query.filter_by(role=UserRole.JOB_SEEKER).count()
-        employers = User.query.filter_by(role=UserRole.EMPLOYER).count()
-        new_users_today = User.query.filter(
-            User.created_at >= datetime.utcnow().date()
-        ).count()
-        
-        # Job statistics
-        total_jobs = Job.query.count()
-        active_jobs = Job.query.filter_by(is_active=True, status='open').count()
-        featured_jobs = Job.query.filter_by(is_featured=True).count()
-        new_jobs_today = Job.query.filter(
-            Job.created_at >= datetime.utcnow().date()
-        ).count()
-        
-        # Application statistics
-        total_applications = Application.query.count()
-        applications_today = Application.query.filter(
-            Application.applied_at >= datetime.utcnow().date()
-        ).count()
-        
-        # Feedback statistics
-        open_feedback = Feedback.query.filter_by(status=FeedbackStatus.OPEN).count()
-        urgent_feedback = Feedback.query.filter_by(priority='urgent').count()
-        
-        # Recent activity
-        recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
-        recent_jobs = Job.query.order_by(Job.created_at.desc()).limit(5).all()
-        recent_applications = Application.query.order_by(Application.applied_at.desc()).limit(5).all()
+        body = dashboard_cache.get('snapshot')
         
-        return jsonify({
-            'statistics': {
-                'users': {
-                    'total': total_users,
-                    'job_seekers': job_seekers,
-                    'employers': employers,
-                    'new_today': new_users_today
-                },
-                'jobs': {
-                    'total': total_jobs,
-                    'active': active_jobs,
-                    'featured': featured_jobs,
-                    'new_today': new_jobs_today
-                },
-                'applications': {
-                    'total': total_applications,
-                    'today': applications_today
-                },
-                'feedback': {
-                    'open': open_feedback,
-                    'urgent': urgent_feedback
-                }
-            },
-            'recent_activity': {
-                'users': [user.to_dict() for user in recent_users],
-                'jobs': [job.to_dict() for job in recent_jobs],
-                'applications': [app.to_dict() for app in recent_applications]
-            }
-        }), 200
+        if body is None:
+            with _dashboard_lock:
+                body = dashboard_cache.get('snapshot')
+                if body is None:
+                    body = _dashboard_body()
+                    dashboard_cache.set('snapshot', body)
+        
+        return current_app.response_class(body, status=200, mimetype='application/json')
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _user_with_profile(user):
+    """Serialize a user with their profile embedded"""
+    user_data = user.to_dict()
+    user_data['profile'] = user.profile.to_dict() if user.profile else None
+    return user_data
+
 @admin_bp.route('/users', methods=['GET'])
 @jwt_required()
 @admin_required
@@ -107,7 +129,7 @@ def get_users():
         is_active = request.args.get('is_active', type=bool)
         search = request.args.get('search', '')
         
-        query = User.query
+        query = User.query.options(joinedload(User.profile))
         
         # Apply filters
         if role:
@@ -130,15 +152,21 @@ def get_users():
                 )
             )
         
+        # Keyset pagination (opt-in): ?cursor= starts at the first page
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            cursor_page = keyset_paginate(query, User, NEWEST_FIRST_KEYS, cursor, per_page,
+                                          include_total=request.args.get('include_total', 'false').lower() == 'true')
+            return jsonify({
+                'users': [_user_with_profile(user) for user in cursor_page.items],
+                'pagination': cursor_page.to_dict()
+            }), 200
+        
         pagination = query.order_by(User.created_at.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
         
-        users = []
-        for user in pagination.items:
-            user_data = user.to_dict()
-            user_data['profile'] = user.profile.to_dict() if user.profile else None
-            users.append(user_data)
+        users = [_user_with_profile(user) for user in pagination.items]
         
         return jsonify({
             'users': users,
@@ -152,6 +180,8 @@ def get_users():
             }
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -168,6 +198,12 @@ def toggle_user_status(user_id):
         
         user.is_active = not user.is_active
         db.session.commit()
+        invalidate_identity(user_id)
+        invalidate_employer_jobs(user)
+        if user.is_active:
+            token_blocklist.restore_user(user_id)
+        else:
+            token_blocklist.revoke_user(user_id)
         
         return jsonify({
             'message': f'User {"activated" if user.is_active else "deactivated"} successfully',
@@ -189,7 +225,7 @@ def get_jobs():
         status = request.args.get('status')
         is_featured = request.args.get('is_featured', type=bool)
         
-        query = Job.query
+        query = with_serialization(Job.query, Job)
         
         if status:
             query = query.filter(Job.status == status)
@@ -197,6 +233,16 @@ def get_jobs():
         if is_featured is not None:
             query = query.filter(Job.is_featured == is_featured)
         
+        # Keyset pagination (opt-in): ?cursor= starts at the first page
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            cursor_page = keyset_paginate(query, Job, NEWEST_FIRST_KEYS, cursor, per_page,
+                                          include_total=request.args.get('include_total', 'false').lower() == 'true')
+            return jsonify({
+                'jobs': [job.to_dict() for job in cursor_page.items],
+                'pagination': cursor_page.to_dict()
+            }), 200
+        
         pagination = query.order_by(Job.created_at.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
@@ -215,6 +261,8 @@ def get_jobs():
             }
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -231,6 +279,8 @@ def toggle_job_featured(job_id):
         
         job.is_featured = not job.is_featured
         db.session.commit()
+        job_cache.invalidate(job_id)
+        dashboard_cache.invalidate('snapshot')
         
         return jsonify({
             'message': f'Job {"featured" if job.is_featured else "unfeatured"} successfully',
@@ -253,7 +303,7 @@ def get_feedback():
         priority = request.args.get('priority')
         feedback_type = request.args.get('feedback_type')
         
-        query = Feedback.query
+        query = with_serialization(Feedback.query, Feedback)
         
         if status:
             try:
@@ -268,6 +318,16 @@ def get_feedback():
         if feedback_type:
             query = query.filter(Feedback.feedback_type == feedback_type)
         
+        # Keyset pagination (opt-in): ?cursor= starts at the first page
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            cursor_page = keyset_paginate(query, Feedback, NEWEST_FIRST_KEYS, cursor, per_page,
+                                          include_total=request.args.get('include_total', 'false').lower() == 'true')
+            return jsonify({
+                'feedback': [feedback.to_dict() for feedback in cursor_page.items],
+                'pagination': cursor_page.to_dict()
+            }), 200
+        
         pagination = query.order_by(Feedback.created_at.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
@@ -286,6 +346,8 @@ def get_feedback():
             }
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -302,6 +364,7 @@ def assign_feedback(feedback_id):
             return jsonify({'error': 'Feedback not found'}), 404
         
         feedback.assign_to(current_user_id)
+        dashboard_cache.invalidate('snapshot')
         
         return jsonify({
             'message': 'Feedback assigned successfully',
@@ -326,6 +389,7 @@ def resolve_feedback(feedback_id):
             return jsonify({'error': 'Feedback not found'}), 404
         
         feedback.resolve(current_user_id, data.get('resolution_notes'))
+        dashboard_cache.invalidate('snapshot')
         
         return jsonify({
             'message': 'Feedback resolved successfully',
@@ -390,6 +454,8 @@ def update_category(category_id):
             category.is_active = data['is_active']
         
         db.session.commit()
+        # Every cached job embeds its category
+        job_cache.invalidate_all()
         
         return jsonify({
             'message': 'Category updated successfully',
@@ -1,27 +1,19 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
+from app import db, analytics_buffer
 from app.models.user import User, UserRole
 from app.models.job import Job
 from app.models.application import Application, ApplicationStatus
-from app.models.analytics import UserAnalytics, JobAnalytics
-from datetime import datetime, timedelta
+from app.models.analytics import UserAnalytics, JobAnalytics, DailyRollup
+from app.utils.rollups import ROLLUP_COUNTERS, rollup_entry
+from app.utils.identity import admin_required
+from app.utils.serialization import with_serialization
+from datetime import datetime, time, timedelta
 from sqlalchemy import func, and_
+from collections import Counter, defaultdict
 
 analytics_bp = Blueprint('analytics', __name__)
 
-def admin_required(f):
-    """Decorator to check if user is admin"""
-    def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or user.role != UserRole.ADMIN:
-            return jsonify({'error': 'Admin access required'}), 403
-        
-        return f(*args, **kwargs)
-    return decorated_function
-
 @analytics_bp.route('/overview', methods=['GET'])
 @jwt_required()
 @admin_required
@@ -32,57 +24,44 @@ def get_analytics_overview():
         end_date = datetime.utcnow().date()
         start_date = end_date - timedelta(days=30)
         
-        # User analytics
-        new_users = User.query.filter(
-            func.date(User.created_at) >= start_date,
-            func.date(User.created_at) <= end_date
-        ).count()
-        
+        # Daily totals come from the pre-aggregated rollup table: one row per day
+        rollups = DailyRollup.query.filter(
+            DailyRollup.date >= start_date,
+            DailyRollup.date <= end_date
+        ).order_by(DailyRollup.date).all()
+        totals = {
+            counter: sum(getattr(rollup, counter) or 0 for rollup in rollups)
+            for counter in ROLLUP_COUNTERS
+        }
+        new_users = totals['new_users']
+        new_jobs = totals['new_jobs']
+        total_applications = totals['applications']
+        total_job_views = totals['job_views']
+        
+        # Distinct users over the whole window, so not a sum of daily rows; ix_users_last_login serves it
         active_users = User.query.filter(
             User.last_login >= start_date
         ).count()
         
-        # Job analytics
-        new_jobs = Job.query.filter(
-            func.date(Job.created_at) >= start_date,
-            func.date(Job.created_at) <= end_date
-        ).count()
-        
-        total_applications = Application.query.filter(
-            func.date(Application.applied_at) >= start_date,
-            func.date(Application.applied_at) <= end_date
-        ).count()
-        
         # Application conversion rate
-        total_job_views = JobAnalytics.query.filter(
-            func.date(JobAnalytics.date) >= start_date,
-            func.date(JobAnalytics.date) <= end_date
-        ).with_entities(func.sum(JobAnalytics.views)).scalar() or 0
-        
         conversion_rate = (total_applications / total_job_views * 100) if total_job_views > 0 else 0
         
-        # Top performing jobs
+        # Top performing jobs (range predicate on applied_at so its indexes apply)
+        range_start = datetime.combine(start_date, time.min)
+        range_end = datetime.combine(end_date + timedelta(days=1), time.min)
         top_jobs = db.session.query(
             Job.title,
             Job.id,
             func.count(Application.id).label('applications')
         ).join(Application).filter(
-            func.date(Application.applied_at) >= start_date,
-            func.date(Application.applied_at) <= end_date
+            Application.applied_at >= range_start,
+            Application.applied_at < range_end
         ).group_by(Job.id, Job.title).order_by(
             func.count(Application.id).desc()
         ).limit(5).all()
         
         # User growth over time
-        user_growth = db.session.query(
-            func.date(User.created_at).label('date'),
-            func.count(User.id).label('count')
-        ).filter(
-            func.date(User.created_at) >= start_date,
-            func.date(User.created_at) <= end_date
-        ).group_by(func.date(User.created_at)).order_by(
-            func.date(User.created_at)
-        ).all()
+        user_growth = [rollup for rollup in rollups if rollup.new_users]
         
         return jsonify({
             'overview': {
@@ -103,7 +82,7 @@ def get_analytics_overview():
             'user_growth': [
                 {
                     'date': str(growth.date),
-                    'count': growth.count
+                    'count': growth.new_users
                 }
                 for growth in user_growth
             ]
@@ -118,7 +97,7 @@ def get_job_analytics(job_id):
     """Get analytics for a specific job"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = current_user
         
         job = Job.query.get(job_id)
         
@@ -192,7 +171,7 @@ def get_user_analytics(user_id):
     """Get analytics for a specific user"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = current_user
         
         target_user = User.query.get(user_id)
         
@@ -235,7 +214,7 @@ def get_user_analytics(user_id):
         ]
         
         # Recent activity
-        recent_applications = Application.query.filter_by(
+        recent_applications = with_serialization(Application.query, Application).filter_by(
             applicant_id=user_id
         ).order_by(Application.applied_at.desc()).limit(5).all()
         
@@ -255,6 +234,26 @@ def get_user_analytics(user_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Activity type -> counter column
+USER_ACTIVITY_COUNTERS = {
+    'page_view': 'page_views',
+    'session_start': 'sessions',
+    'job_view': 'jobs_viewed',
+    'job_apply': 'jobs_applied',
+    'job_save': 'jobs_saved',
+    'message_send': 'messages_sent',
+    'message_receive': 'messages_received',
+}
+
+JOB_ACTIVITY_COUNTERS = {
+    'view': 'views',
+    'unique_view': 'unique_views',
+    'application': 'applications',
+    'save': 'saves',
+    'share': 'shares',
+    'click': 'clicks',
+}
+
 @analytics_bp.route('/track', methods=['POST'])
 @jwt_required()
 def track_user_activity():
@@ -265,46 +264,16 @@ def track_user_activity():
         
         today = datetime.utcnow().date()
         
-        # Get or create analytics record for today
-        analytics = UserAnalytics.query.filter_by(
-            user_id=current_user_id,
-            date=today
-        ).first()
-        
-        if not analytics:
-            analytics = UserAnalytics(
-                user_id=current_user_id,
-                date=today
-            )
-            db.session.add(analytics)
-        
-        # Update analytics based on activity type
-        activity_type = data.get('type')
-        
-        if activity_type == 'page_view':
-            analytics.page_views += 1
-        elif activity_type == 'session_start':
-            analytics.sessions += 1
-        elif activity_type == 'job_view':
-            analytics.jobs_viewed += 1
-        elif activity_type == 'job_apply':
-            analytics.jobs_applied += 1
-        elif activity_type == 'job_save':
-            analytics.jobs_saved += 1
-        elif activity_type == 'message_send':
-            analytics.messages_sent += 1
-        elif activity_type == 'message_receive':
-            analytics.messages_received += 1
-        
-        # Update device info
-        if data.get('device_type'):
-            analytics.device_type = data['device_type']
-        if data.get('browser'):
-            analytics.browser = data['browser']
-        if data.get('operating_system'):
-            analytics.operating_system = data['operating_system']
-        
-        db.session.commit()
+        # Coalesced in memory and upserted in bulk by the analytics buffer
+        device_info = {
+            field: data[field] for field in ('device_type', 'browser', 'operating_system') if data.get(field)
+        }
+        analytics_buffer.record(
+            UserAnalytics,
+            keys={'user_id': current_user_id, 'date': today},
+            counter=USER_ACTIVITY_COUNTERS.get(data.get('type')),
+            values=device_info
+        )
         
         return jsonify({'message': 'Activity tracked successfully'}), 200
         
@@ -312,6 +281,85 @@ def track_user_activity():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@analytics_bp.route('/track/batch', methods=['POST'])
+@jwt_required(optional=True)
+def track_activity_batch():
+    """Track many user and job events in one request.
+
+    Body: {"events": [{"type": "page_view"}, {"type": "view", "job_id": "..."}, ...],
+           "device_type": ..., "browser": ..., "operating_system": ...}
+    Events with a job_id count towards that job; the rest count towards the
+    current user and need a login. Increments are aggregated per row and
+    committed in one transaction before the response, bypassing the
+    write-behind buffer.
+    """
+    try:
+        current_user_id = get_jwt_identity()
+        data = request.get_json() or {}
+        events = data.get('events')
+        
+        if not isinstance(events, list) or not events:
+            return jsonify({'error': 'events must be a non-empty list'}), 400
+        max_events = current_app.config.get('ANALYTICS_MAX_BATCH_EVENTS', 1000)
+        if len(events) > max_events:
+            return jsonify({'error': f'At most {max_events} events per batch'}), 400
+        
+        user_increments = Counter()
+        job_increments = defaultdict(Counter)
+        rejected = []
+        for index, event in enumerate(events):
+            if not isinstance(event, dict):
+                rejected.append(index)
+                continue
+            if event.get('job_id'):
+                counter = JOB_ACTIVITY_COUNTERS.get(event.get('type'))
+                if not counter:
+                    rejected.append(index)
+                    continue
+                job_increments[str(event['job_id'])][counter] += 1
+            else:
+                counter = USER_ACTIVITY_COUNTERS.get(event.get('type'))
+                if not counter or not current_user_id:
+                    rejected.append(index)
+                    continue
+                user_increments[counter] += 1
+        
+        today = datetime.utcnow().date()
+        entries = []
+        if user_increments:
+            device_info = {
+                field: data[field] for field in ('device_type', 'browser', 'operating_system') if data.get(field)
+            }
+            entries.append((UserAnalytics, {'user_id': current_user_id, 'date': today}, user_increments, device_info, None))
+        rates = JobAnalytics.rate_expressions()
+        for job_id, increments in job_increments.items():
+            entries.append((JobAnalytics, {'job_id': job_id, 'date': today}, increments, None, rates))
+        job_views = sum(increments['views'] for increments in job_increments.values())
+        if job_views:
+            entries.append(rollup_entry('job_views', job_views, today))
+        analytics_buffer.write(entries)
+        
+        return jsonify({
+            'message': 'Events tracked successfully',
+            'accepted': len(events) - len(rejected),
+            'rejected': rejected
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@analytics_bp.route('/buffer', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_analytics_buffer_metrics():
+    """Depth and flush latency of this process's analytics write-behind buffer"""
+    try:
+        return jsonify({'buffer': analytics_buffer.metrics()}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @analytics_bp.route('/jobs/<job_id>/track', methods=['POST'])
 def track_job_activity(job_id):
     """Track job activity for analytics"""
@@ -320,42 +368,16 @@ def track_job_activity(job_id):
         
         today = datetime.utcnow().date()
         
-        # Get or create analytics record for today
-        analytics = JobAnalytics.query.filter_by(
-            job_id=job_id,
-            date=today
-        ).first()
-        
-        if not analytics:
-            analytics = JobAnalytics(
-                job_id=job_id,
-                date=today
-            )
-            db.session.add(analytics)
-        
-        # Update analytics based on activity type
-        activity_type = data.get('type')
-        
-        if activity_type == 'view':
-            analytics.views += 1
-        elif activity_type == 'unique_view':
-            analytics.unique_views += 1
-        elif activity_type == 'application':
-            analytics.applications += 1
-        elif activity_type == 'save':
-            analytics.saves += 1
-        elif activity_type == 'share':
-            analytics.shares += 1
-        elif activity_type == 'click':
-            analytics.clicks += 1
-        
-        # Update conversion rates
-        analytics.update_rates()
-        
-        db.session.commit()
+        # Coalesced in memory and upserted in bulk (conversion rates included) by the analytics buffer
+        counter = JOB_ACTIVITY_COUNTERS.get(data.get('type'))
+        entries = [(JobAnalytics, {'job_id': job_id, 'date': today}, {counter: 1} if counter else {}, None,
+                    JobAnalytics.rate_expressions())]
+        if counter == 'views':
+            entries.append(rollup_entry('job_views', 1, today))
+        analytics_buffer.record_batch(entries)
         
         return jsonify({'message': 'Job activity tracked successfully'}), 200
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500 
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
@@ -1,10 +1,16 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
-from app.models.user import User, UserRole
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
+from app import db, job_cache, email_dispatcher
+from app.models.user import UserRole
 from app.models.job import Job
 from app.models.application import Application, ApplicationStatus
+from app.models.notification import NotificationType, NotificationPriority
 from app.utils.email import send_application_notification, send_interview_invitation
+from app.utils.serialization import with_serialization
+from app.utils.pagination import keyset_paginate, InvalidCursor, APPLICATION_LIST_KEYS
+from app.utils.rollups import record_rollup
+from app.utils.notifications import notify, push_notifications
+from app.utils.identity import role_required
 from datetime import datetime
 
 applications_bp = Blueprint('applications', __name__)
@@ -15,7 +21,7 @@ def get_applications():
     """Get applications for current user"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = current_user
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -26,9 +32,9 @@ def get_applications():
         
         # Build query based on user role
         if user.role == UserRole.JOB_SEEKER:
-            query = Application.query.filter_by(applicant_id=current_user_id)
+            query = with_serialization(Application.query, Application).filter_by(applicant_id=current_user_id)
         elif user.role == UserRole.EMPLOYER:
-            query = Application.query.join(Job).filter(Job.employer_id == current_user_id)
+            query = with_serialization(Application.query, Application).join(Job).filter(Job.employer_id == current_user_id)
         else:
             return jsonify({'error': 'Unauthorized'}), 403
         
@@ -43,6 +49,16 @@ def get_applications():
         # Order by application date
         query = query.order_by(Application.applied_at.desc())
         
+        # Keyset pagination (opt-in): ?cursor= starts at the first page
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            cursor_page = keyset_paginate(query, Application, APPLICATION_LIST_KEYS, cursor, per_page,
+                                          include_total=request.args.get('include_total', 'false').lower() == 'true')
+            return jsonify({
+                'applications': [application.to_dict() for application in cursor_page.items],
+                'pagination': cursor_page.to_dict()
+            }), 200
+        
         # Pagination
         pagination = query.paginate(
             page=page, per_page=per_page, error_out=False
@@ -62,6 +78,8 @@ def get_applications():
             }
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -71,13 +89,13 @@ def get_application(application_id):
     """Get a specific application"""
     try:
         current_user_id = get_jwt_identity()
-        application = Application.query.get(application_id)
+        application = with_serialization(Application.query, Application).get(application_id)
         
         if not application:
             return jsonify({'error': 'Application not found'}), 404
         
         # Check if user has access to this application
-        user = User.query.get(current_user_id)
+        user = current_user
         if user.role == UserRole.JOB_SEEKER:
             if application.applicant_id != current_user_id:
                 return jsonify({'error': 'Unauthorized'}), 403
@@ -92,15 +110,11 @@ def get_application(application_id):
 
 @applications_bp.route('/', methods=['POST'])
 @jwt_required()
+@role_required(UserRole.JOB_SEEKER, message='Only job seekers can apply for jobs')
 def create_application():
     """Apply for a job"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or user.role != UserRole.JOB_SEEKER:
-            return jsonify({'error': 'Only job seekers can apply for jobs'}), 403
-        
         data = request.get_json()
         
         if not data.get('job_id'):
@@ -140,13 +154,25 @@ def create_application():
         # Increment job application count
         job.increment_applications()
         
+        notification = notify(
+            job.employer_id,
+            NotificationType.APPLICATION_RECEIVED,
+            'New application',
+            f'A new application was submitted for {job.title}',
+            related_job_id=job.id,
+            related_application=application,
+            related_user_id=current_user_id
+        )
+        
         db.session.commit()
+        job_cache.invalidate(job.id)
+        record_rollup('applications')
+        push_notifications(notification)
         
-        # Send notification email to employer
-        try:
-            send_application_notification(user, job.title, job.employer.profile.company_name if job.employer.profile else 'Company')
-        except Exception as e:
-            print(f"Failed to send application notification: {e}")
+        # Send notification email to employer; a failure is logged and doesn't fail the application
+        if send_application_notification(current_user.user, job.title, job.employer.profile.company_name if job.employer.profile else 'Company'):
+            db.session.commit()
+            email_dispatcher.wake()
         
         return jsonify({
             'message': 'Application submitted successfully',
@@ -159,15 +185,11 @@ def create_application():
 
 @applications_bp.route('/<application_id>/status', methods=['PUT'])
 @jwt_required()
+@role_required(UserRole.EMPLOYER, message='Only employers can update application status')
 def update_application_status(application_id):
     """Update application status (employers only)"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or user.role != UserRole.EMPLOYER:
-            return jsonify({'error': 'Only employers can update application status'}), 403
-        
         application = Application.query.get(application_id)
         
         if not application:
@@ -204,19 +226,32 @@ def update_application_status(application_id):
             if data.get('interview_notes'):
                 application.interview_notes = data['interview_notes']
             
-            # Send interview invitation email
-            try:
-                send_interview_invitation(
-                    application.applicant,
-                    application.job.title,
-                    application.job.employer.profile.company_name if application.job.employer.profile else 'Company',
-                    application.interview_date,
-                    application.interview_location
-                )
-            except Exception as e:
-                print(f"Failed to send interview invitation: {e}")
+            # Queue the interview invitation in the same transaction as the status change
+            if not send_interview_invitation(
+                application.applicant,
+                application.job.title,
+                application.job.employer.profile.company_name if application.job.employer.profile else 'Company',
+                application.interview_date,
+                application.interview_location
+            ):
+                return jsonify({'error': 'Failed to queue interview invitation'}), 500
+        
+        interview = new_status == ApplicationStatus.INTERVIEW_SCHEDULED
+        notification = notify(
+            application.applicant_id,
+            NotificationType.INTERVIEW_SCHEDULED if interview else NotificationType.APPLICATION_STATUS_CHANGED,
+            'Interview scheduled' if interview else 'Application status updated',
+            f"Your application for {application.job.title} is now {new_status.value.replace('_', ' ')}",
+            priority=NotificationPriority.HIGH if interview else NotificationPriority.MEDIUM,
+            related_job_id=application.job_id,
+            related_application_id=application.id,
+            related_user_id=current_user_id
+        )
         
         db.session.commit()
+        if interview:
+            email_dispatcher.wake()
+        push_notifications(notification)
         
         return jsonify({
             'message': 'Application status updated successfully',
@@ -245,6 +280,7 @@ def withdraw_application(application_id):
             return jsonify({'error': 'Cannot withdraw application in current status'}), 400
         
         application.update_status(ApplicationStatus.WITHDRAWN, current_user_id)
+        db.session.commit()
         
         return jsonify({'message': 'Application withdrawn successfully'}), 200
         
@@ -265,7 +301,7 @@ def update_application_notes(application_id):
         data = request.get_json()
         
         # Check if user has access to this application
-        user = User.query.get(current_user_id)
+        user = current_user
         if user.role == UserRole.JOB_SEEKER:
             if application.applicant_id != current_user_id:
                 return jsonify({'error': 'Unauthorized'}), 403
@@ -1,9 +1,11 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
-from app import db, bcrypt, mail
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt, decode_token, current_user
+from app import db, bcrypt, mail, token_blocklist, email_dispatcher
 from app.models.user import User, UserProfile, UserRole
 from app.utils.validators import validate_email, validate_password
 from app.utils.email import send_verification_email, send_password_reset_email
+from app.utils.rollups import record_rollup
+from app.utils.identity import access_claims
 from datetime import datetime, timedelta
 import uuid
 
@@ -68,16 +70,15 @@ def register():
         
         db.session.add(profile)
         db.session.commit()
+        record_rollup('new_users')
         
-        # Send verification email
-        try:
-            send_verification_email(user)
-        except Exception as e:
-            # Log error but don't fail registration
-            print(f"Failed to send verification email: {e}")
+        # Send verification email; a failure is logged and doesn't fail registration
+        if send_verification_email(user):
+            db.session.commit()
+            email_dispatcher.wake()
         
         # Create tokens
-        access_token = create_access_token(identity=user.id)
+        access_token = create_access_token(identity=user.id, additional_claims=access_claims(user))
         refresh_token = create_refresh_token(identity=user.id)
         
         return jsonify({
@@ -109,12 +110,16 @@ def login():
         if not user.is_active:
             return jsonify({'error': 'Account is deactivated'}), 401
         
+        # Upgrade hashes stored with an outdated bcrypt cost while we have the password
+        if user.password_needs_rehash():
+            user.set_password(data['password'])
+        
         # Update last login
         user.last_login = datetime.utcnow()
         db.session.commit()
         
         # Create tokens
-        access_token = create_access_token(identity=user.id)
+        access_token = create_access_token(identity=user.id, additional_claims=access_claims(user))
         refresh_token = create_refresh_token(identity=user.id)
         
         return jsonify({
@@ -133,8 +138,9 @@ def login():
 def refresh():
     """Refresh access token"""
     try:
-        current_user_id = get_jwt_identity()
-        new_access_token = create_access_token(identity=current_user_id)
+        # Refresh tokens carry no role, so this resolves (and re-checks) the user
+        user = current_user.user
+        new_access_token = create_access_token(identity=user.id, additional_claims=access_claims(user))
         
         return jsonify({
             'access_token': new_access_token
@@ -182,13 +188,12 @@ def forgot_password():
         reset_token = str(uuid.uuid4())
         user.password_reset_token = reset_token
         user.password_reset_expires = datetime.utcnow() + timedelta(hours=24)
-        db.session.commit()
         
-        # Send reset email
-        try:
-            send_password_reset_email(user, reset_token)
-        except Exception as e:
+        # Send reset email, committed together with the token
+        if not send_password_reset_email(user, reset_token):
             return jsonify({'error': 'Failed to send reset email'}), 500
+        db.session.commit()
+        email_dispatcher.wake()
         
         return jsonify({'message': 'Password reset email sent'}), 200
         
@@ -232,8 +237,7 @@ def reset_password():
 def change_password():
     """Change password for authenticated user"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = current_user.user
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -263,9 +267,24 @@ def change_password():
 @auth_bp.route('/logout', methods=['POST'])
 @jwt_required()
 def logout():
-    """Logout user (client should discard tokens)"""
+    """Logout user: revoke the access token, and the refresh token if one is sent"""
     try:
-        # In a real implementation, you might want to blacklist the token
+        data = request.get_json(silent=True) or {}
+        
+        refresh_claims = None
+        if data.get('refresh_token'):
+            try:
+                refresh_claims = decode_token(data['refresh_token'], allow_expired=True)
+            except Exception:
+                return jsonify({'error': 'Invalid refresh token'}), 400
+            refresh_identity = refresh_claims.get(current_app.config['JWT_IDENTITY_CLAIM'])
+            if refresh_claims.get('type') != 'refresh' or refresh_identity != get_jwt_identity():
+                return jsonify({'error': 'Invalid refresh token'}), 400
+        
+        token_blocklist.revoke_token(get_jwt())
+        if refresh_claims:
+            token_blocklist.revoke_token(refresh_claims)
+        
         return jsonify({'message': 'Logged out successfully'}), 200
         
     except Exception as e:
@@ -276,8 +295,7 @@ def logout():
 def get_current_user():
     """Get current user information"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = current_user.user
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
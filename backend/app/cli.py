@@ -0,0 +1,89 @@
+import json
+import sys
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+cv_cli = AppGroup('cv', help='CV parsing commands.')
+analytics_cli = AppGroup('analytics', help='Analytics maintenance commands.')
+messages_cli = AppGroup('messages', help='Messaging maintenance commands.')
+jobs_cli = AppGroup('jobs', help='Job maintenance commands.')
+
+
+@cv_cli.command('parse-batch')
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--workers', type=int, default=None, help='Worker processes (default: number of cores).')
+@click.option('--output', type=click.File('w'), default='-', help='NDJSON output file (default: stdout).')
+def parse_batch_command(paths, workers, output):
+    """Parse CV files, directories and .zip archives, writing one NDJSON line per CV."""
+    from app.utils.cv_batch import parse_batch, sources_from_paths
+    from app.utils.cv_parser import extraction_limits
+
+    counts = {'completed': 0, 'failed': 0, 'skipped': 0}
+    results = parse_batch(
+        sources_from_paths(paths),
+        workers=workers or current_app.config.get('CV_BATCH_WORKERS'),
+        max_file_bytes=current_app.config.get('CV_BATCH_MAX_FILE_BYTES'),
+        limits=extraction_limits(current_app.config)
+    )
+    for result in results:
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+        counts[result['status']] += 1
+
+    click.echo(f"Parsed {counts['completed']} CV(s), {counts['failed']} failed, {counts['skipped']} skipped", err=True)
+    if counts['failed']:
+        sys.exit(1)
+
+
+@analytics_cli.command('rollup')
+@click.option('--days', type=int, default=30, show_default=True, help='Number of days to recompute.')
+@click.option('--include-today', is_flag=True, help='Also recompute the current (still open) day.')
+def rollup_command(days, include_today):
+    """Recompute the daily rollup rows behind the admin analytics overview.
+
+    Run periodically (e.g. nightly from cron) to compact the incrementally
+    maintained rollups against the source tables.
+    """
+    from datetime import datetime, timedelta
+    from app.utils.rollups import rebuild_rollups
+
+    end_date = datetime.utcnow().date()
+    if not include_today:
+        end_date -= timedelta(days=1)
+    start_date = end_date - timedelta(days=days - 1)
+    written = rebuild_rollups(start_date, end_date)
+    click.echo(f"Rebuilt {written} daily rollup(s) from {start_date} to {end_date}", err=True)
+
+
+@messages_cli.command('reconcile-unread')
+def reconcile_unread_command():
+    """Recompute conversation and per-user unread message counters from the messages table."""
+    from app.utils.unread import reconcile_unread_counts
+
+    conversations, users = reconcile_unread_counts()
+    click.echo(f"Corrected unread counters on {conversations} conversation(s) and {users} user(s)", err=True)
+
+
+@jobs_cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Repopulate the job full-text search index from the jobs table.
+
+    Repairs a SQLite index that has drifted from the jobs table. A no-op on
+    PostgreSQL, whose index is generated.
+    """
+    from app import db
+    from app.utils.search import rebuild_job_search_index
+
+    with db.engine.begin() as connection:
+        rebuild_job_search_index(connection)
+    click.echo("Rebuilt the job search index", err=True)
+
+
+def register_commands(app):
+    """Register CLI command groups on the application"""
+    app.cli.add_command(cv_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(messages_cli)
+    app.cli.add_command(jobs_cli)
@@ -1,10 +1,17 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
-from app.models.user import User, UserRole
+from app import db, job_cache
+from app.models.user import UserRole
 from app.models.job import Job, JobCategory, JobType, ExperienceLevel
 from app.utils.validators import validate_salary_range, sanitize_input
+from app.utils.search import apply_job_search
+from app.utils.serialization import with_serialization
+from app.utils.pagination import keyset_paginate, InvalidCursor, JOB_LIST_KEYS, NEWEST_FIRST_KEYS
+from app.utils.rollups import record_rollup
+from app.utils.identity import role_required
+from app.utils.cache import VOLATILE_EMPLOYER_FIELDS
 from datetime import datetime
+import hashlib
 from sqlalchemy import or_, and_, desc, asc
 
 jobs_bp = Blueprint('jobs', __name__)
@@ -28,17 +35,12 @@ def get_jobs():
         is_featured = request.args.get('is_featured', type=bool)
         
         # Build query
-        query = Job.query.filter(Job.is_active == True, Job.status == 'open')
+        query = with_serialization(Job.query, Job).filter(Job.is_active == True, Job.status == 'open')
         
         # Apply filters
+        search_rank = None
         if search:
-            query = query.filter(
-                or_(
-                    Job.title.ilike(f'%{search}%'),
-                    Job.description.ilike(f'%{search}%'),
-                    Job.requirements.ilike(f'%{search}%')
-                )
-            )
+            query, search_rank = apply_job_search(query, search, db.engine.dialect.name)
         
         if category_id:
             query = query.filter(Job.category_id == category_id)
@@ -78,8 +80,24 @@ def get_jobs():
         if is_featured is not None:
             query = query.filter(Job.is_featured == is_featured)
         
-        # Sort by featured jobs first, then by creation date
-        query = query.order_by(desc(Job.is_featured), desc(Job.created_at))
+        # Sort by featured jobs first, then by search relevance and creation date
+        if search_rank is not None:
+            query = query.order_by(desc(Job.is_featured), search_rank, desc(Job.created_at))
+        else:
+            query = query.order_by(desc(Job.is_featured), desc(Job.created_at))
+        
+        # Keyset pagination (opt-in): ?cursor= starts at the first page
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            if search_rank is not None:
+                # Keyset order would replace relevance order
+                return jsonify({'error': 'cursor cannot be combined with search; use page instead'}), 400
+            cursor_page = keyset_paginate(query, Job, JOB_LIST_KEYS, cursor, per_page,
+                                          include_total=request.args.get('include_total', 'false').lower() == 'true')
+            return jsonify({
+                'jobs': [job.to_dict() for job in cursor_page.items],
+                'pagination': cursor_page.to_dict()
+            }), 200
         
         # Pagination
         pagination = query.paginate(
@@ -100,29 +118,37 @@ def get_jobs():
             }
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @jobs_bp.route('/employer', methods=['GET'])
 @jwt_required()
+@role_required(UserRole.EMPLOYER, message='Only employers can access this endpoint')
 def get_employer_jobs():
     """Get jobs posted by the current employer"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or user.role != UserRole.EMPLOYER:
-            return jsonify({'error': 'Only employers can access this endpoint'}), 403
-        
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
         # Get jobs posted by the current employer
-        query = Job.query.filter(Job.employer_id == current_user_id)
+        query = with_serialization(Job.query, Job).filter(Job.employer_id == current_user_id)
         
         # Sort by creation date (newest first)
         query = query.order_by(desc(Job.created_at))
         
+        # Keyset pagination (opt-in): ?cursor= starts at the first page
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            cursor_page = keyset_paginate(query, Job, NEWEST_FIRST_KEYS, cursor, per_page,
+                                          include_total=request.args.get('include_total', 'false').lower() == 'true')
+            return jsonify({
+                'jobs': [job.to_dict() for job in cursor_page.items],
+                'pagination': cursor_page.to_dict()
+            }), 200
+        
         # Pagination
         pagination = query.paginate(
             page=page, per_page=per_page, error_out=False
@@ -142,34 +168,45 @@ def get_employer_jobs():
             }
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @jobs_bp.route('/<job_id>', methods=['GET'])
 def get_job(job_id):
-    """Get a specific job by ID"""
+    """Get a specific job by ID (served from the job detail cache when warm)"""
     try:
-        job = Job.query.get(job_id)
-        
-        if not job:
-            return jsonify({'error': 'Job not found'}), 404
-        
-        return jsonify({'job': job.to_dict()}), 200
+        body = job_cache.get(job_id)
+        
+        if body is None:
+            job = with_serialization(Job.query, Job).get(job_id)
+            
+            if not job:
+                return jsonify({'error': 'Job not found'}), 404
+            
+            payload = job.to_dict()
+            if payload['employer']:
+                for field in VOLATILE_EMPLOYER_FIELDS:
+                    payload['employer'].pop(field, None)
+            body = current_app.json.dumps({'job': payload}).encode('utf-8')
+            job_cache.set(job_id, body)
+        
+        # Repeat clients revalidate with If-None-Match and get a 304
+        response = current_app.response_class(body, status=200, mimetype='application/json')
+        response.set_etag(hashlib.sha1(body).hexdigest())
+        return response.make_conditional(request)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @jobs_bp.route('/', methods=['POST'])
 @jwt_required()
+@role_required(UserRole.EMPLOYER, message='Only employers can create job postings')
 def create_job():
     """Create a new job posting"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or user.role != UserRole.EMPLOYER:
-            return jsonify({'error': 'Only employers can create job postings'}), 403
-        
         data = request.get_json()
         
         # Validate required fields
@@ -227,6 +264,7 @@ def create_job():
         
         db.session.add(job)
         db.session.commit()
+        record_rollup('new_jobs')
         
         return jsonify({
             'message': 'Job created successfully',
@@ -313,6 +351,7 @@ def update_job(job_id):
         
         job.updated_at = datetime.utcnow()
         db.session.commit()
+        job_cache.invalidate(job_id)
         
         return jsonify({
             'message': 'Job updated successfully',
@@ -339,6 +378,7 @@ def delete_job(job_id):
         
         db.session.delete(job)
         db.session.commit()
+        job_cache.invalidate(job_id)
         
         return jsonify({'message': 'Job deleted successfully'}), 200
         
@@ -380,15 +420,10 @@ def get_experience_levels():
 
 @jobs_bp.route('/<job_id>/apply', methods=['POST'])
 @jwt_required()
+@role_required(UserRole.JOB_SEEKER, message='Only job seekers can apply for jobs')
 def apply_for_job(job_id):
     """Apply for a specific job"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or user.role != UserRole.JOB_SEEKER:
-            return jsonify({'error': 'Only job seekers can apply for jobs'}), 403
-        
         data = request.get_json()
         
         # Add job_id to the data
@@ -403,18 +438,14 @@ def apply_for_job(job_id):
 
 @jobs_bp.route('/<job_id>/has-applied', methods=['GET'])
 @jwt_required()
+@role_required(UserRole.JOB_SEEKER, message='Only job seekers can check application status')
 def check_has_applied(job_id):
     """Check if current user has applied for this job"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or user.role != UserRole.JOB_SEEKER:
-            return jsonify({'error': 'Only job seekers can check application status'}), 403
-        
         # Check if user has already applied
         from app.models.application import Application
-        existing_application = Application.query.filter_by(
+        existing_application = with_serialization(Application.query, Application).filter_by(
             job_id=int(job_id),
             applicant_id=current_user_id
         ).first()
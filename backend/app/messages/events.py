@@ -0,0 +1,153 @@
+import time
+
+from flask import request, session
+from flask_jwt_extended import decode_token
+from flask_socketio import ConnectionRefusedError, emit, join_room, leave_room, rooms
+
+from app import db, socketio, token_blocklist
+from app.models.message import Conversation, Message
+from app.utils.identity import identity_from_token
+from app.utils.realtime import user_room, conversation_room
+
+
+def _participant_rooms(participant_ids):
+    return [user_room(user_id) for user_id in participant_ids]
+
+
+def emit_new_message(conversation, message):
+    """Deliver a new message to every socket of both participants"""
+    socketio.emit('new_message', {
+        'conversation_id': conversation.id,
+        'message': message.to_dict()
+    }, to=_participant_rooms((conversation.participant1_id, conversation.participant2_id)))
+
+
+def emit_read_receipt(conversation_id, participant_ids, reader_id, message_ids, read_at):
+    """One read-receipt event for a whole batch of messages marked read, to both participants.
+
+    Takes the participant ids rather than the conversation so callers can
+    read them before committing, without a reload afterwards.
+    """
+    socketio.emit('messages_read', {
+        'conversation_id': conversation_id,
+        'reader_id': reader_id,
+        'message_ids': message_ids,
+        'read_at': read_at.isoformat()
+    }, to=_participant_rooms(participant_ids))
+
+
+def _token(auth):
+    """Access token from the connect payload ({'token': ...}), the Authorization header or ?token="""
+    if isinstance(auth, dict) and auth.get('token'):
+        return auth['token']
+    header = request.headers.get('Authorization', '')
+    if header.startswith('Bearer '):
+        return header[len('Bearer '):]
+    return request.args.get('token')
+
+
+def _current_user_id():
+    """The socket's user, or None once its token has expired or been revoked"""
+    token = session.get('jwt')
+    if token is None or token['exp'] <= time.time() or token_blocklist.is_revoked(token):
+        return None
+    return token['sub']
+
+
+def _participant_conversation(conversation_id, user_id):
+    conversation = db.session.get(Conversation, conversation_id) if conversation_id else None
+    if conversation is None or user_id not in (conversation.participant1_id, conversation.participant2_id):
+        return None
+    return conversation
+
+
+def handle_connect(auth=None):
+    """Authenticate the socket with an access token and join the user's own room"""
+    token = _token(auth)
+    if not token:
+        raise ConnectionRefusedError('Authorization token is required')
+    try:
+        payload = decode_token(token)
+    except Exception:
+        raise ConnectionRefusedError('Invalid token')
+    if payload.get('type') != 'access' or token_blocklist.is_revoked(payload):
+        raise ConnectionRefusedError('Invalid token')
+    identity = identity_from_token(payload)
+    if identity is None:
+        raise ConnectionRefusedError('Account is deactivated')
+
+    # Only what the per-event checks need; the socket outlives the request
+    session['jwt'] = {'jti': payload['jti'], 'sub': identity.id, 'exp': payload['exp']}
+    join_room(user_room(identity.id))
+
+
+def handle_join_conversation(data):
+    """Start receiving typing events for a conversation the user takes part in"""
+    user_id = _current_user_id()
+    if user_id is None:
+        return {'error': 'Unauthorized'}
+    conversation_id = (data or {}).get('conversation_id')
+    if _participant_conversation(conversation_id, user_id) is None:
+        return {'error': 'Conversation not found'}
+    join_room(conversation_room(conversation_id))
+    return {'ok': True}
+
+
+def handle_leave_conversation(data):
+    leave_room(conversation_room((data or {}).get('conversation_id')))
+    return {'ok': True}
+
+
+def handle_typing(data):
+    """Relay a typing indicator to the other sockets viewing the conversation"""
+    user_id = _current_user_id()
+    if user_id is None:
+        return {'error': 'Unauthorized'}
+    conversation_id = (data or {}).get('conversation_id')
+    room = conversation_room(conversation_id)
+    if room not in rooms():
+        return {'error': 'Join the conversation first'}
+    emit('typing', {
+        'conversation_id': conversation_id,
+        'user_id': user_id,
+        'is_typing': bool(data.get('is_typing', True))
+    }, to=room, include_self=False)
+    return {'ok': True}
+
+
+def handle_mark_read(data):
+    """Mark the conversation read up to `up_to_message_id` (default: everything) and send one receipt"""
+    user_id = _current_user_id()
+    if user_id is None:
+        return {'error': 'Unauthorized'}
+    data = data or {}
+    try:
+        conversation = _participant_conversation(data.get('conversation_id'), user_id)
+        if conversation is None:
+            return {'error': 'Conversation not found'}
+
+        up_to = None
+        if data.get('up_to_message_id'):
+            message = db.session.get(Message, data['up_to_message_id'])
+            if message is None or message.conversation_id != conversation.id:
+                return {'error': 'Message not found'}
+            up_to = message.created_at
+
+        participant_ids = (conversation.participant1_id, conversation.participant2_id)
+        read_ids, read_at = Message.mark_read(conversation.id, user_id, up_to=up_to)
+        if read_ids:
+            db.session.commit()
+            emit_read_receipt(conversation.id, participant_ids, user_id, read_ids, read_at)
+        return {'ok': True, 'marked_read': len(read_ids)}
+    except Exception as e:
+        db.session.rollback()
+        return {'error': str(e)}
+
+
+def register_socketio_handlers(socketio):
+    """Attach the realtime event handlers; call after socketio.init_app(), which creates a new server"""
+    socketio.on_event('connect', handle_connect)
+    socketio.on_event('join_conversation', handle_join_conversation)
+    socketio.on_event('leave_conversation', handle_leave_conversation)
+    socketio.on_event('typing', handle_typing)
+    socketio.on_event('mark_read', handle_mark_read)
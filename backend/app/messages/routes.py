@@ -1,13 +1,21 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db, socketio
-from app.models.user import User
+from sqlalchemy import case, func, or_
+from app import db
+from app.models.user import User, UserProfile
 from app.models.job import Job
 from app.models.message import Message, Conversation
-from datetime import datetime
+from app.models.notification import NotificationType
+from app.messages.events import emit_new_message, emit_read_receipt
+from app.utils.notifications import notify, push_notifications
+from app.utils.serialization import with_serialization
+from app.utils.pagination import keyset_paginate, InvalidCursor, NEWEST_FIRST_KEYS, INBOX_KEYS
 
 messages_bp = Blueprint('messages', __name__)
 
+# Characters of the last message shown in the inbox
+INBOX_SNIPPET_CHARS = 120
+
 @messages_bp.route('/conversations', methods=['GET'])
 @jwt_required()
 def get_conversations():
@@ -15,7 +23,7 @@ def get_conversations():
     try:
         current_user_id = get_jwt_identity()
         
-        conversations = Conversation.query.filter(
+        conversations = with_serialization(Conversation.query, Conversation).filter(
             (Conversation.participant1_id == current_user_id) |
             (Conversation.participant2_id == current_user_id)
         ).filter(Conversation.is_active == True).order_by(Conversation.last_message_at.desc()).all()
@@ -27,6 +35,89 @@ def get_conversations():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _inbox_query(user_id):
+    """One row per active conversation of `user_id`, with everything the inbox shows joined in"""
+    is_participant1 = Conversation.participant1_id == user_id
+    other_id = case((is_participant1, Conversation.participant2_id), else_=Conversation.participant1_id)
+    return db.session.query(
+        Conversation.id.label('id'),
+        Conversation.subject.label('subject'),
+        Conversation.last_message_at.label('last_message_at'),
+        case((is_participant1, Conversation.unread_count_p1), else_=Conversation.unread_count_p2).label('unread_count'),
+        Job.id.label('job_id'),
+        Job.title.label('job_title'),
+        User.id.label('other_id'),
+        User.role.label('other_role'),
+        UserProfile.username.label('other_username'),
+        UserProfile.profile_picture.label('other_profile_picture'),
+        UserProfile.headline.label('other_headline'),
+        UserProfile.company_name.label('other_company_name'),
+        UserProfile.company_logo.label('other_company_logo'),
+        Message.id.label('last_message_id'),
+        Message.sender_id.label('last_message_sender_id'),
+        Message.message_type.label('last_message_type'),
+        func.substr(Message.content, 1, INBOX_SNIPPET_CHARS).label('last_message_snippet'),
+        Message.created_at.label('last_message_created_at')
+    ).select_from(Conversation).join(
+        User, User.id == other_id
+    ).outerjoin(
+        UserProfile, UserProfile.user_id == User.id
+    ).outerjoin(
+        Message, Message.id == Conversation.last_message_id
+    ).outerjoin(
+        Job, Job.id == Conversation.job_id
+    ).filter(
+        or_(Conversation.participant1_id == user_id, Conversation.participant2_id == user_id),
+        Conversation.is_active == True
+    )
+
+def _inbox_entry(row):
+    return {
+        'id': row.id,
+        'subject': row.subject,
+        'last_message_at': row.last_message_at.isoformat() if row.last_message_at else None,
+        'unread_count': row.unread_count,
+        'job': {'id': row.job_id, 'title': row.job_title} if row.job_id else None,
+        'other_participant': {
+            'id': row.other_id,
+            'role': row.other_role.value,
+            'username': row.other_username,
+            'profile_picture': row.other_profile_picture,
+            'headline': row.other_headline,
+            'company_name': row.other_company_name,
+            'company_logo': row.other_company_logo
+        },
+        'last_message': {
+            'id': row.last_message_id,
+            'sender_id': row.last_message_sender_id,
+            'message_type': row.last_message_type,
+            'snippet': row.last_message_snippet,
+            'created_at': row.last_message_created_at.isoformat() if row.last_message_created_at else None
+        } if row.last_message_id else None
+    }
+
+@messages_bp.route('/inbox', methods=['GET'])
+@jwt_required()
+def get_inbox():
+    """Get a page of the current user's conversations, newest activity first, in one query"""
+    try:
+        current_user_id = get_jwt_identity()
+        per_page = request.args.get('per_page', 20, type=int)
+        
+        page = keyset_paginate(_inbox_query(current_user_id), Conversation, INBOX_KEYS,
+                               request.args.get('cursor'), per_page,
+                               include_total=request.args.get('include_total', 'false').lower() == 'true')
+        
+        return jsonify({
+            'conversations': [_inbox_entry(row) for row in page.items],
+            'pagination': page.to_dict()
+        }), 200
+        
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @messages_bp.route('/conversations/<conversation_id>/messages', methods=['GET'])
 @jwt_required()
 def get_messages(conversation_id):
@@ -45,23 +136,33 @@ def get_messages(conversation_id):
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 50, type=int)
         
-        messages = Message.query.filter_by(conversation_id=conversation_id).order_by(
+        query = with_serialization(Message.query, Message).filter_by(conversation_id=conversation_id).order_by(
             Message.created_at.desc()
-        ).paginate(page=page, per_page=per_page, error_out=False)
-        
-        # Mark messages as read
-        unread_messages = Message.query.filter_by(
-            conversation_id=conversation_id,
-            recipient_id=current_user_id,
-            is_read=False
-        ).all()
-        
-        for msg in unread_messages:
-            msg.mark_as_read()
+        )
         
-        return jsonify({
-            'messages': [msg.to_dict() for msg in messages.items],
-            'pagination': {
+        # Keyset pagination (opt-in): ?cursor= starts at the newest message
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            messages = keyset_paginate(query, Message, NEWEST_FIRST_KEYS, cursor, per_page,
+                                       include_total=request.args.get('include_total', 'false').lower() == 'true')
+        else:
+            messages = query.paginate(page=page, per_page=per_page, error_out=False)
+        
+        # Mark the unread messages on this page as read in one UPDATE
+        read_ids, read_at = Message.mark_read(
+            conversation_id, current_user_id,
+            message_ids=[msg.id for msg in messages.items if msg.recipient_id == current_user_id and not msg.is_read]
+        )
+        items = [msg.to_dict() for msg in messages.items]
+        if read_ids:
+            participant_ids = (conversation.participant1_id, conversation.participant2_id)
+            db.session.commit()
+            emit_read_receipt(conversation_id, participant_ids, current_user_id, read_ids, read_at)
+        
+        if cursor is not None:
+            pagination = messages.to_dict()
+        else:
+            pagination = {
                 'page': page,
                 'per_page': per_page,
                 'total': messages.total,
@@ -69,9 +170,16 @@ def get_messages(conversation_id):
                 'has_next': messages.has_next,
                 'has_prev': messages.has_prev
             }
+        
+        return jsonify({
+            'messages': items,
+            'pagination': pagination
         }), 200
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @messages_bp.route('/conversations', methods=['POST'])
@@ -153,17 +261,28 @@ def send_message(conversation_id):
         )
         
         db.session.add(message)
-        
-        # Update conversation last message time
-        conversation.last_message_at = datetime.utcnow()
+        db.session.flush()
+        
+        # Update the conversation's last message and the recipient's unread counters
+        conversation.last_message_at = message.created_at
+        conversation.last_message_id = message.id
+        conversation.add_unread(recipient_id)
+        
+        notification = notify(
+            recipient_id,
+            NotificationType.NEW_MESSAGE,
+            'New message',
+            message.content[:INBOX_SNIPPET_CHARS],
+            related_message_id=message.id,
+            related_user_id=current_user_id,
+            notification_metadata={'conversation_id': conversation_id}
+        )
         
         db.session.commit()
         
-        # Emit socket event for real-time messaging
-        socketio.emit('new_message', {
-            'conversation_id': conversation_id,
-            'message': message.to_dict()
-        }, room=conversation_id)
+        # Push to both participants' sockets for real-time messaging
+        emit_new_message(conversation, message)
+        push_notifications(notification)
         
         return jsonify({
             'message': 'Message sent successfully',
@@ -177,7 +296,7 @@ def send_message(conversation_id):
 @messages_bp.route('/messages/<message_id>/read', methods=['PUT'])
 @jwt_required()
 def mark_message_read(message_id):
-    """Mark a message as read"""
+    """Mark a message, and every earlier unread message in its conversation, as read"""
     try:
         current_user_id = get_jwt_identity()
         message = Message.query.get(message_id)
@@ -188,11 +307,17 @@ def mark_message_read(message_id):
         if message.recipient_id != current_user_id:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        message.mark_as_read()
+        # The message is a high-water mark: everything received up to it has been seen
+        read_ids, read_at = Message.mark_read(message.conversation_id, current_user_id, up_to=message.created_at)
+        if read_ids:
+            participant_ids = (message.sender_id, message.recipient_id)
+            db.session.commit()
+            emit_read_receipt(message.conversation_id, participant_ids, current_user_id, read_ids, read_at)
         
-        return jsonify({'message': 'Message marked as read'}), 200
+        return jsonify({'message': 'Message marked as read', 'marked_read': len(read_ids)}), 200
         
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @messages_bp.route('/conversations/<conversation_id>', methods=['DELETE'])
@@ -225,10 +350,8 @@ def get_unread_count():
     try:
         current_user_id = get_jwt_identity()
         
-        unread_count = Message.query.filter_by(
-            recipient_id=current_user_id,
-            is_read=False
-        ).count()
+        # Maintained by send_message and the read path: a primary-key lookup, not a COUNT
+        unread_count = db.session.query(User.unread_messages_count).filter(User.id == current_user_id).scalar() or 0
         
         return jsonify({'unread_count': unread_count}), 200
         
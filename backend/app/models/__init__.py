@@ -5,10 +5,13 @@ from .message import Message, Conversation
 from .notification import Notification
 from .wishlist import Wishlist
 from .feedback import Feedback
-from .analytics import UserAnalytics, JobAnalytics
+from .analytics import UserAnalytics, JobAnalytics, DailyRollup
+from .outbox import EmailOutbox
+from .cv_parse_job import CVParseJob
 
 __all__ = [
     'User', 'UserProfile', 'Job', 'JobCategory', 'JobType',
     'Application', 'ApplicationStatus', 'Message', 'Conversation',
-    'Notification', 'Wishlist', 'Feedback', 'UserAnalytics', 'JobAnalytics'
+    'Notification', 'Wishlist', 'Feedback', 'UserAnalytics', 'JobAnalytics',
+    'DailyRollup', 'EmailOutbox', 'CVParseJob'
 ] 
\ No newline at end of file
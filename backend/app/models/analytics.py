@@ -1,9 +1,13 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import case
 import uuid
 
 class UserAnalytics(db.Model):
     __tablename__ = 'user_analytics'
+    __table_args__ = (
+        db.Index('ix_user_analytics_user_date', 'user_id', 'date', unique=True),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -68,6 +72,9 @@ class UserAnalytics(db.Model):
 
 class JobAnalytics(db.Model):
     __tablename__ = 'job_analytics'
+    __table_args__ = (
+        db.Index('ix_job_analytics_job_date', 'job_id', 'date', unique=True),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     job_id = db.Column(db.String(36), db.ForeignKey('jobs.id'), nullable=False)
@@ -116,8 +123,44 @@ class JobAnalytics(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
     
-    def update_rates(self):
-        if self.views > 0:
-            self.view_to_application_rate = (self.applications / self.views) * 100
-            self.view_to_save_rate = (self.saves / self.views) * 100
-        db.session.commit() 
\ No newline at end of file
+    @staticmethod
+    def rate_expressions():
+        """Conversion rates as SQL over the row's new counter values (see upsert_counters)"""
+        def rate(numerator):
+            return lambda new: case((new('views') > 0, new(numerator) * 100.0 / new('views')), else_=0.0)
+        return {
+            'view_to_application_rate': rate('applications'),
+            'view_to_save_rate': rate('saves')
+        } 
+
+
+class DailyRollup(db.Model):
+    """Site-wide totals per day, read by the admin analytics overview.
+
+    Counters are incremented through the analytics buffer as users, jobs,
+    applications and job views are recorded, and can be recomputed from the
+    source tables with `flask analytics rollup` (see app.utils.rollups).
+    """
+    __tablename__ = 'daily_rollups'
+    __table_args__ = (
+        db.Index('ix_daily_rollups_date', 'date', unique=True),
+    )
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    date = db.Column(db.Date, nullable=False)
+    
+    new_users = db.Column(db.Integer, default=0)
+    new_jobs = db.Column(db.Integer, default=0)
+    applications = db.Column(db.Integer, default=0)
+    job_views = db.Column(db.Integer, default=0)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'date': self.date.isoformat() if self.date else None,
+            'new_users': self.new_users or 0,
+            'new_jobs': self.new_jobs or 0,
+            'applications': self.applications or 0,
+            'job_views': self.job_views or 0
+        }
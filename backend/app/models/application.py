@@ -16,6 +16,11 @@ class ApplicationStatus(Enum):
 
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        db.Index('ix_applications_applicant_applied', 'applicant_id', 'applied_at'),
+        db.Index('ix_applications_job_applied', 'job_id', 'applied_at'),
+        db.Index('ix_applications_job_applicant', 'job_id', 'applicant_id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     job_id = db.Column(db.String(36), db.ForeignKey('jobs.id'), nullable=False)
@@ -52,6 +57,9 @@ class Application(db.Model):
     # Relationships
     status_updater = db.relationship('User', foreign_keys=[status_updated_by], back_populates='status_updates')
     
+    # Relationships embedded by to_dict()
+    serialize_relations = ('job', 'applicant', 'status_updater')
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -83,5 +91,4 @@ class Application(db.Model):
     def update_status(self, new_status, updated_by_id=None):
         self.status = new_status
         self.status_updated_at = datetime.utcnow()
-        self.status_updated_by = updated_by_id
-        db.session.commit() 
\ No newline at end of file
+        self.status_updated_by = updated_by_id 
\ No newline at end of file
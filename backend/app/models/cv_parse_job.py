@@ -0,0 +1,44 @@
+from app import db
+from datetime import datetime
+from enum import Enum
+import uuid
+
+class CVParseStatus(Enum):
+    QUEUED = "queued"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class CVParseJob(db.Model):
+    __tablename__ = 'cv_parse_jobs'
+    __table_args__ = (
+        db.Index('ix_cv_parse_jobs_user_status', 'user_id', 'status'),
+    )
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+
+    # Job details
+    filename = db.Column(db.String(255))
+    status = db.Column(db.Enum(CVParseStatus), nullable=False, default=CVParseStatus.QUEUED)
+    result = db.Column(db.JSON)  # {'extracted': {...}, 'raw_data': {...}}
+    error = db.Column(db.Text)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        data = {
+            'id': self.id,
+            'user_id': self.user_id,
+            'filename': self.filename,
+            'status': self.status.value if self.status else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+        if self.status == CVParseStatus.COMPLETED and self.result:
+            data['extracted'] = self.result.get('extracted')
+            data['raw_data'] = self.result.get('raw_data')
+            data['extraction'] = self.result.get('extraction')
+        return data
@@ -57,6 +57,9 @@ class Feedback(db.Model):
     assigned_admin = db.relationship('User', foreign_keys=[assigned_to])
     resolver = db.relationship('User', foreign_keys=[resolved_by])
     
+    # Relationships embedded by to_dict()
+    serialize_relations = ('user', 'assigned_admin', 'resolver')
+    
     def to_dict(self):
         return {
             'id': self.id,
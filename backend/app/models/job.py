@@ -1,4 +1,5 @@
 from app import db
+from app.utils.search import install_job_search_ddl
 from datetime import datetime
 from enum import Enum
 import uuid
@@ -46,6 +47,10 @@ class JobCategory(db.Model):
 
 class Job(db.Model):
     __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_listing', 'is_active', 'status', 'is_featured', 'created_at'),
+        db.Index('ix_jobs_employer_created', 'employer_id', 'created_at'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     employer_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -104,6 +109,9 @@ class Job(db.Model):
     applications = db.relationship('Application', backref='job', lazy='dynamic')
     wishlist_items = db.relationship('Wishlist', backref='job', lazy='dynamic')
     
+    # Relationships embedded by to_dict()
+    serialize_relations = ('employer', 'category')
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -147,8 +155,10 @@ class Job(db.Model):
         }
     
     def increment_applications(self):
-        self.current_applications += 1
-        db.session.commit()
+        """Atomically add one application (UPDATE ... SET x = x + 1) in the caller's transaction"""
+        from app.utils.counters import increment
+        increment(Job, {'id': self.id}, current_applications=1)
+        db.session.expire(self, ['current_applications'])
     
     def is_application_open(self):
         if not self.is_active or self.status != 'open':
@@ -157,4 +167,6 @@ class Job(db.Model):
             return False
         if self.max_applications and self.current_applications >= self.max_applications:
             return False
-        return True 
\ No newline at end of file
+        return True
+
+install_job_search_ddl(Job.__table__)
@@ -4,6 +4,10 @@ import uuid
 
 class Conversation(db.Model):
     __tablename__ = 'conversations'
+    __table_args__ = (
+        db.Index('ix_conversations_participant1_last', 'participant1_id', 'last_message_at'),
+        db.Index('ix_conversations_participant2_last', 'participant2_id', 'last_message_at'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     participant1_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -14,6 +18,12 @@ class Conversation(db.Model):
     subject = db.Column(db.String(200))
     is_active = db.Column(db.Boolean, default=True)
     last_message_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Newest message, kept by send_message so the inbox can join it without a per-conversation lookup
+    last_message_id = db.Column(db.String(36), db.ForeignKey('messages.id', use_alter=True, name='fk_conversations_last_message_id'))
+    
+    # Unread messages per participant, kept in step with Message.is_read
+    unread_count_p1 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    unread_count_p2 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -23,7 +33,11 @@ class Conversation(db.Model):
     participant1 = db.relationship('User', foreign_keys=[participant1_id])
     participant2 = db.relationship('User', foreign_keys=[participant2_id])
     job = db.relationship('Job')
-    messages = db.relationship('Message', backref='conversation', lazy='dynamic', order_by='Message.created_at')
+    messages = db.relationship('Message', backref='conversation', foreign_keys='Message.conversation_id',
+                               lazy='dynamic', order_by='Message.created_at')
+    
+    # Relationships embedded by to_dict()
+    serialize_relations = ('participant1', 'participant2', 'job')
     
     def to_dict(self):
         return {
@@ -34,6 +48,9 @@ class Conversation(db.Model):
             'subject': self.subject,
             'is_active': self.is_active,
             'last_message_at': self.last_message_at.isoformat() if self.last_message_at else None,
+            'last_message_id': self.last_message_id,
+            'unread_count_p1': self.unread_count_p1,
+            'unread_count_p2': self.unread_count_p2,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'participant1': self.participant1.to_dict() if self.participant1 else None,
@@ -46,15 +63,30 @@ class Conversation(db.Model):
             return self.participant2
         return self.participant1
     
+    def unread_count_for(self, user_id):
+        return self.unread_count_p1 if self.participant1_id == user_id else self.unread_count_p2
+    
+    def add_unread(self, recipient_id, count=1):
+        """Atomically count `count` new messages for `recipient_id` here and in their total, in the caller's transaction"""
+        from app.models.user import User
+        from app.utils.counters import increment
+        column = 'unread_count_p1' if self.participant1_id == recipient_id else 'unread_count_p2'
+        increment(Conversation, {'id': self.id}, **{column: count})
+        increment(User, {'id': recipient_id}, unread_messages_count=count)
+        db.session.expire(self, [column])
+    
     def mark_as_read(self, user_id):
-        if self.participant1_id == user_id:
-            self.unread_count_p1 = 0
-        else:
-            self.unread_count_p2 = 0
+        """Mark everything `user_id` has received in this conversation as read and commit"""
+        read_ids, _ = Message.mark_read(self.id, user_id)
         db.session.commit()
+        return read_ids
 
 class Message(db.Model):
     __tablename__ = 'messages'
+    __table_args__ = (
+        db.Index('ix_messages_recipient_unread', 'recipient_id', 'is_read'),
+        db.Index('ix_messages_conversation_created', 'conversation_id', 'created_at'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     conversation_id = db.Column(db.String(36), db.ForeignKey('conversations.id'), nullable=False)
@@ -81,6 +113,9 @@ class Message(db.Model):
     sender = db.relationship('User', foreign_keys=[sender_id], back_populates='sent_messages')
     recipient = db.relationship('User', foreign_keys=[recipient_id], back_populates='received_messages')
     
+    # Relationships embedded by to_dict()
+    serialize_relations = ('sender', 'recipient')
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -103,6 +138,54 @@ class Message(db.Model):
     
     def mark_as_read(self):
         if not self.is_read:
-            self.is_read = True
-            self.read_at = datetime.utcnow()
-            db.session.commit() 
\ No newline at end of file
+            Message.mark_read(self.conversation_id, self.recipient_id, message_ids=[self.id])
+            db.session.commit()
+
+    @classmethod
+    def mark_read(cls, conversation_id, recipient_id, message_ids=None, up_to=None):
+        """Mark a batch of `recipient_id`'s unread messages in a conversation as read in one UPDATE.
+
+        Limited to `message_ids` (e.g. the page being returned) and/or to
+        messages created at or before `up_to` (a high-water mark). Loaded
+        instances in the session are updated in place; the caller commits.
+        The conversation's and the recipient's unread counters are reduced
+        by the number of rows marked, in the same transaction.
+        Returns (ids marked read, read_at).
+        """
+        read_at = datetime.utcnow()
+        filters = [cls.conversation_id == conversation_id, cls.recipient_id == recipient_id, cls.is_read == False]
+        if message_ids is not None:
+            if not message_ids:
+                return [], read_at
+            filters.append(cls.id.in_(message_ids))
+        if up_to is not None:
+            filters.append(cls.created_at <= up_to)
+
+        result = db.session.execute(
+            db.update(cls).where(*filters).values(is_read=True, read_at=read_at).returning(cls.id),
+            execution_options={'synchronize_session': 'fetch'}
+        )
+        read_ids = [row[0] for row in result]
+        if read_ids:
+            cls._subtract_unread(conversation_id, recipient_id, len(read_ids))
+        return read_ids, read_at
+
+    @staticmethod
+    def _subtract_unread(conversation_id, recipient_id, count):
+        """Take `count` off the recipient's conversation and total unread counters"""
+        from app.models.user import User
+        from app.utils.counters import increment
+        db.session.execute(
+            db.update(Conversation).where(Conversation.id == conversation_id).values(
+                unread_count_p1=db.case(
+                    (Conversation.participant1_id == recipient_id, Conversation.unread_count_p1 - count),
+                    else_=Conversation.unread_count_p1
+                ),
+                unread_count_p2=db.case(
+                    (Conversation.participant1_id != recipient_id, Conversation.unread_count_p2 - count),
+                    else_=Conversation.unread_count_p2
+                )
+            ),
+            execution_options={'synchronize_session': 'fetch'}
+        )
+        increment(User, {'id': recipient_id}, unread_messages_count=-count)
@@ -79,12 +79,7 @@ class Notification(db.Model):
             'action_text': self.action_text,
             'notification_metadata': self.notification_metadata,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'user': self.user.to_dict() if self.user else None,
-            'related_job': self.related_job.to_dict() if self.related_job else None,
-            'related_application': self.related_application.to_dict() if self.related_application else None,
-            'related_message': self.related_message.to_dict() if self.related_message else None,
-            'related_user': self.related_user.to_dict() if self.related_user else None
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
     def mark_as_read(self):
@@ -95,4 +90,12 @@ class Notification(db.Model):
     
     def mark_as_deleted(self):
         self.is_deleted = True
-        db.session.commit() 
\ No newline at end of file
+        db.session.commit()
+
+# Partial indexes over live (not deleted) notifications: the newest-first list and the unread badge
+_live = Notification.is_deleted == db.false()
+_unread = db.and_(Notification.is_read == db.false(), _live)
+db.Index('ix_notifications_user_created', Notification.user_id, Notification.created_at,
+         postgresql_where=_live, sqlite_where=_live)
+db.Index('ix_notifications_user_unread', Notification.user_id,
+         postgresql_where=_unread, sqlite_where=_unread) 
\ No newline at end of file
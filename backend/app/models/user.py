@@ -1,4 +1,4 @@
-from app import db, bcrypt
+from app import db, password_hasher
 from datetime import datetime
 from enum import Enum
 import uuid
@@ -10,6 +10,10 @@ class UserRole(Enum):
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Range scan for the admin overview's active-user count
+        db.Index('ix_users_last_login', 'last_login'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -25,6 +29,9 @@ class User(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_login = db.Column(db.DateTime)
     
+    # Unread received messages across all conversations (see Conversation.unread_count_p1/p2)
+    unread_messages_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
     # Relationships
     profile = db.relationship('UserProfile', backref='user', uselist=False, cascade='all, delete-orphan')
     jobs_posted = db.relationship('Job', foreign_keys='Job.employer_id', backref='employer', lazy='dynamic')
@@ -38,10 +45,13 @@ class User(db.Model):
     status_updates = db.relationship('Application', foreign_keys='Application.status_updated_by', back_populates='status_updater', lazy='dynamic')
     
     def set_password(self, password):
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
     
     def to_dict(self):
         return {
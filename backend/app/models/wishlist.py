@@ -28,6 +28,9 @@ class Wishlist(db.Model):
     user = db.relationship('User', foreign_keys=[user_id], back_populates='wishlist_items')
     candidate = db.relationship('User', foreign_keys=[candidate_id])
     
+    # Relationships embedded by to_dict()
+    serialize_relations = ('job', 'candidate')
+    
     def to_dict(self):
         return {
             'id': self.id,
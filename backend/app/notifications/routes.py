@@ -0,0 +1,73 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import db, socketio
+from app.models.notification import Notification
+from app.utils.notifications import live_notifications, mark_notifications_read
+from app.utils.pagination import keyset_paginate, InvalidCursor, NEWEST_FIRST_KEYS
+from app.utils.realtime import user_room
+
+notifications_bp = Blueprint('notifications', __name__)
+
+@notifications_bp.route('/', methods=['GET'])
+@jwt_required()
+def get_notifications():
+    """Get a page of the current user's notifications, newest first"""
+    try:
+        current_user_id = get_jwt_identity()
+        per_page = request.args.get('per_page', 20, type=int)
+        
+        query = live_notifications(current_user_id)
+        if request.args.get('unread_only', 'false').lower() == 'true':
+            query = query.filter(Notification.is_read == db.false())
+        
+        page = keyset_paginate(query, Notification, NEWEST_FIRST_KEYS, request.args.get('cursor'), per_page,
+                               include_total=request.args.get('include_total', 'false').lower() == 'true')
+        
+        return jsonify({
+            'notifications': [notification.to_dict() for notification in page.items],
+            'pagination': page.to_dict()
+        }), 200
+        
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@notifications_bp.route('/unread-count', methods=['GET'])
+@jwt_required()
+def get_unread_count():
+    """Get count of unread notifications"""
+    try:
+        current_user_id = get_jwt_identity()
+        
+        # Counted from the partial index over unread, live notifications only
+        unread_count = live_notifications(current_user_id).filter(Notification.is_read == db.false()).count()
+        
+        return jsonify({'unread_count': unread_count}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@notifications_bp.route('/read', methods=['PUT'])
+@jwt_required()
+def mark_notifications_as_read():
+    """Mark notifications as read: the given `ids`, or all unread ones when none are given"""
+    try:
+        current_user_id = get_jwt_identity()
+        data = request.get_json(silent=True) or {}
+        
+        ids = data.get('ids')
+        if ids is not None and (not isinstance(ids, list) or not all(isinstance(i, str) for i in ids)):
+            return jsonify({'error': 'ids must be a list of notification IDs'}), 400
+        
+        read_ids = mark_notifications_read(current_user_id, ids)
+        if read_ids:
+            db.session.commit()
+            # Lets the user's other tabs clear the same badge
+            socketio.emit('notifications_read', {'ids': read_ids}, to=user_room(current_user_id))
+        
+        return jsonify({'message': 'Notifications marked as read', 'marked_read': len(read_ids)}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
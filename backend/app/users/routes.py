@@ -1,12 +1,17 @@
-from flask import Blueprint, request, jsonify, send_from_directory, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
-from app.models.user import User, UserProfile, UserRole
+from flask import Blueprint, request, jsonify, send_from_directory, current_app, Response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
+from app import db, cv_parse_queue, token_blocklist
+from app.models.user import UserProfile, UserRole
+from app.models.cv_parse_job import CVParseJob, CVParseStatus
+from app.utils.cv_queue import QueueFull
+from app.utils.cache import invalidate_employer_jobs
+from app.utils.cv_batch import parse_batch, shared_executor, sources_from_uploads, to_ndjson
+from app.utils.cv_parser import extraction_limits
+from app.utils.identity import invalidate_identity, role_required
 from app.utils.validators import validate_email, validate_phone, validate_url, sanitize_input
 from datetime import datetime
 from werkzeug.utils import secure_filename
 import os
-from pyresparser import ResumeParser
 import tempfile
 
 users_bp = Blueprint('users', __name__)
@@ -18,8 +23,7 @@ UPLOAD_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../u
 def get_profile():
     """Get current user's profile"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = current_user.user
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -38,8 +42,7 @@ def get_profile():
 def update_profile():
     """Update current user's profile"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = current_user.user
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -140,6 +143,7 @@ def update_profile():
         
         profile.updated_at = datetime.utcnow()
         db.session.commit()
+        invalidate_employer_jobs(user)
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -152,14 +156,12 @@ def update_profile():
 
 @users_bp.route('/profile/upload-resume', methods=['POST'])
 @jwt_required()
+@role_required(UserRole.JOB_SEEKER, message='Only job seekers can upload resumes')
 def upload_resume():
     print('DEBUG: request.files =', request.files)
     print('DEBUG: request.form =', request.form)
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        if not user or user.role != UserRole.JOB_SEEKER:
-            return jsonify({'error': 'Only job seekers can upload resumes'}), 403
+        user = current_user.user
         if 'resume' not in request.files:
             return jsonify({'error': 'No resume file provided'}), 400
         file = request.files['resume']
@@ -189,8 +191,7 @@ def upload_resume():
 def upload_avatar():
     """Upload profile picture"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = current_user.user
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -215,6 +216,7 @@ def upload_avatar():
         if user.profile:
             user.profile.profile_picture = filename
             db.session.commit()
+            invalidate_employer_jobs(user)
         
         return jsonify({
             'message': 'Avatar uploaded successfully',
@@ -230,7 +232,7 @@ def delete_account():
     """Delete user account"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = current_user.user
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -238,6 +240,8 @@ def delete_account():
         # In a real implementation, you might want to anonymize data instead of deleting
         db.session.delete(user)
         db.session.commit()
+        invalidate_identity(current_user_id)
+        token_blocklist.revoke_user(current_user_id)
         
         return jsonify({'message': 'Account deleted successfully'}), 200
         
@@ -247,14 +251,12 @@ def delete_account():
 
 @users_bp.route('/profile/parse-cv', methods=['POST'])
 @jwt_required()
+@role_required(UserRole.JOB_SEEKER, message='Only job seekers can parse CVs')
 def parse_cv():
-    """Parse uploaded CV and extract key information for job seekers"""
+    """Queue an uploaded CV for parsing; poll GET /profile/parse-cv/<job_id> for the result"""
     temp_path = None
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        if not user or user.role != UserRole.JOB_SEEKER:
-            return jsonify({'error': 'Only job seekers can parse CVs'}), 403
 
         if 'cv' not in request.files:
             return jsonify({'error': 'No CV file provided'}), 400
@@ -268,7 +270,6 @@ def parse_cv():
             return jsonify({'error': 'Invalid file type. Only PDF, DOC, DOCX, and TXT files are allowed'}), 400
 
         # Save file temporarily with proper extension
-        import os
         temp_fd, temp_path = tempfile.mkstemp(suffix=f'.{file_extension}')
         os.close(temp_fd)
         
@@ -277,72 +278,32 @@ def parse_cv():
         
         # Verify file exists and has content
         if not os.path.exists(temp_path) or os.path.getsize(temp_path) == 0:
+            os.remove(temp_path)
             return jsonify({'error': 'Failed to save uploaded file'}), 500
 
-        print(f"DEBUG: Saved file to {temp_path}, size: {os.path.getsize(temp_path)} bytes")
+        # The parse queue owns the temp file from here on
+        job = cv_parse_queue.submit(current_user_id, temp_path, file_extension, filename=secure_filename(file.filename))
+        temp_path = None
 
-        # Extract text content from file
-        text_content = ""
-        try:
-            if file_extension == 'pdf':
-                import PyPDF2
-                with open(temp_path, 'rb') as pdf_file:
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-                    for page in pdf_reader.pages:
-                        text_content += page.extract_text() + "\n"
-            elif file_extension in ['doc', 'docx']:
-                # For DOC/DOCX files, try to extract text using python-docx
-                try:
-                    from docx import Document
-                    doc = Document(temp_path)
-                    for paragraph in doc.paragraphs:
-                        text_content += paragraph.text + "\n"
-                except ImportError:
-                    # If python-docx is not available, return error
-                    return jsonify({'error': 'DOC/DOCX parsing requires python-docx library'}), 500
-            else:  # txt file
-                with open(temp_path, 'r', encoding='utf-8', errors='ignore') as txt_file:
-                    text_content = txt_file.read()
-            
-            print(f"DEBUG: Extracted {len(text_content)} characters of text")
-            
-        except Exception as text_error:
-            print(f"DEBUG: Text extraction error: {str(text_error)}")
-            return jsonify({'error': f'Failed to extract text from file: {str(text_error)}'}), 500
+        if job.status == CVParseStatus.COMPLETED:
+            # Same file was parsed before; the result came from the cache
+            return jsonify({
+                'message': 'CV parsed successfully',
+                'job_id': job.id,
+                **job.to_dict()
+            }), 200
 
-        # Parse the extracted text using pattern matching
-        data = _parse_cv_text(text_content)
+        return jsonify({
+            'message': 'CV queued for parsing',
+            'job_id': job.id,
+            'status': job.status.value,
+            'status_url': f'/api/users/profile/parse-cv/{job.id}'
+        }), 202
         
-        # Remove the temp file
+    except QueueFull as e:
         if temp_path and os.path.exists(temp_path):
             os.remove(temp_path)
-
-        # Enhanced data extraction with better field mapping
-        extracted = {
-            'username': data.get('name', '').strip() if data.get('name') else '',
-            'phone': data.get('phone', '') or '',
-            'skills': ', '.join(data.get('skills', [])) if data.get('skills') else '',
-            'summary': data.get('summary', '') or '',
-            'experience_years': _extract_experience_years(data.get('experience', [])),
-            'education_level': _extract_highest_education(data.get('education', [])),
-            'work_experience': _format_work_experience(data.get('experience', [])),
-            'education': _format_education(data.get('education', [])),
-            'languages': _extract_languages(data.get('languages', [])),
-            'certifications': _extract_certifications(data.get('certifications', [])),
-            'headline': _extract_headline(data.get('experience', []), data.get('skills', [])),
-        }
-        
-        # Clean up extracted data - remove empty values
-        extracted = {k: v for k, v in extracted.items() if v and v != ''}
-        
-        print(f"DEBUG: Final extracted data: {list(extracted.keys())}")
-        
-        return jsonify({
-            'message': 'CV parsed successfully',
-            'extracted': extracted,
-            'raw_data': data  # Include raw data for debugging
-        }), 200
-        
+        return jsonify({'error': str(e)}), 429
     except Exception as e:
         print(f"DEBUG: General error in parse_cv: {str(e)}")
         # Clean up temp file if it exists
@@ -353,247 +314,55 @@ def parse_cv():
                 pass
         return jsonify({'error': f'Failed to process CV: {str(e)}'}), 500
 
-def _parse_cv_text(text_content):
-    """Parse CV text content using pattern matching"""
-    import re
-    
-    # Convert to lowercase for case-insensitive matching
-    text_lower = text_content.lower()
-    lines = text_content.split('\n')
-    
-    data = {
-        'name': '',
-        'phone': '',
-        'email': '',
-        'skills': [],
-        'summary': '',
-        'experience': [],
-        'education': [],
-        'languages': [],
-        'certifications': []
-    }
-    
-    # Extract name (usually the first line or after "name:")
-    for i, line in enumerate(lines[:5]):  # Check first 5 lines
-        line_stripped = line.strip()
-        if line_stripped and not any(keyword in line_stripped.lower() for keyword in ['phone', 'email', 'address', 'summary', 'experience', 'education']):
-            # This might be the name
-            data['name'] = line_stripped
-            break
-    
-    # Extract phone number
-    phone_patterns = [
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (555) 123-4567 or 555-123-4567
-        r'\+?\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}',  # International format
-    ]
-    for pattern in phone_patterns:
-        phone_match = re.search(pattern, text_content)
-        if phone_match:
-            data['phone'] = phone_match.group()
-            break
-    
-    # Extract email
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    email_match = re.search(email_pattern, text_content)
-    if email_match:
-        data['email'] = email_match.group()
-    
-    # Extract skills
-    skills_section = _extract_section(text_content, ['skills', 'technical skills', 'competencies', 'technologies'])
-    if skills_section:
-        # Split by common delimiters and clean up
-        skills = re.split(r'[,;•\n]', skills_section)
-        data['skills'] = [skill.strip() for skill in skills if skill.strip() and len(skill.strip()) > 1]
-    
-    # Extract summary/objective
-    summary_section = _extract_section(text_content, ['summary', 'objective', 'profile', 'about'])
-    if summary_section:
-        data['summary'] = summary_section[:500]  # Limit to 500 characters
-    
-    # Extract experience
-    experience_section = _extract_section(text_content, ['experience', 'work experience', 'employment history', 'professional experience'])
-    if experience_section:
-        # Split into individual experiences
-        experiences = re.split(r'\n(?=[A-Z][a-z]+\s+at\s+|\d{4}|[A-Z][a-z]+\s+\d{4})', experience_section)
-        data['experience'] = [exp.strip() for exp in experiences if exp.strip()]
-    
-    # Extract education
-    education_section = _extract_section(text_content, ['education', 'academic background', 'qualifications'])
-    if education_section:
-        # Split into individual education entries
-        educations = re.split(r'\n(?=[A-Z][a-z]+\s+|\d{4}|University|College|School)', education_section)
-        data['education'] = [edu.strip() for edu in educations if edu.strip()]
-    
-    # Extract languages
-    languages_section = _extract_section(text_content, ['languages', 'language skills'])
-    if languages_section:
-        languages = re.split(r'[,;•\n]', languages_section)
-        data['languages'] = [lang.strip() for lang in languages if lang.strip()]
-    
-    # Extract certifications
-    certifications_section = _extract_section(text_content, ['certifications', 'certificates', 'accreditations'])
-    if certifications_section:
-        certifications = re.split(r'\n(?=[A-Z]|\d{4})', certifications_section)
-        data['certifications'] = [cert.strip() for cert in certifications if cert.strip()]
-    
-    return data
-
-def _extract_section(text, keywords):
-    """Extract a section from text based on keywords"""
-    lines = text.split('\n')
-    section_start = -1
-    section_end = -1
-    
-    # Find section start
-    for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
-        if any(keyword in line_lower for keyword in keywords):
-            section_start = i + 1
-            break
-    
-    if section_start == -1:
-        return None
-    
-    # Find section end (next major section)
-    major_sections = ['experience', 'education', 'skills', 'languages', 'certifications', 'projects', 'achievements']
-    for i in range(section_start, len(lines)):
-        line_lower = lines[i].lower().strip()
-        if any(section in line_lower for section in major_sections) and len(line_lower) < 50:
-            section_end = i
-            break
-    
-    if section_end == -1:
-        section_end = len(lines)
-    
-    # Extract section content
-    section_lines = lines[section_start:section_end]
-    return '\n'.join(section_lines).strip()
-
-def _extract_experience_years(experience_list):
-    """Extract total years of experience from experience list"""
-    if not experience_list:
-        return ''
-    
+@users_bp.route('/profile/parse-cv/<job_id>', methods=['GET'])
+@jwt_required()
+def get_parse_cv_job(job_id):
+    """Get the status (and, once completed, the extracted data) of a CV parse job"""
     try:
-        # Simple heuristic: count number of experiences and estimate years
-        # This is a basic implementation - could be enhanced with date parsing
-        return str(len(experience_list))
-    except:
-        return ''
-
-def _extract_highest_education(education_list):
-    """Extract highest education level"""
-    if not education_list:
-        return ''
-    
-    education_levels = ['phd', 'doctorate', 'master', 'bachelor', 'associate', 'diploma', 'high school']
-    
-    for edu in education_list:
-        edu_lower = str(edu).lower()
-        for level in education_levels:
-            if level in edu_lower:
-                return level.title()
-    
-    return education_list[0] if education_list else ''
-
-def _format_work_experience(experience_list):
-    """Format work experience for JSON storage"""
-    if not experience_list:
-        return []
-    
-    formatted = []
-    for exp in experience_list:
-        if isinstance(exp, str):
-            formatted.append({
-                'title': exp,
-                'company': '',
-                'duration': '',
-                'description': exp
-            })
-        elif isinstance(exp, dict):
-            formatted.append(exp)
-    
-    return formatted
-
-def _format_education(education_list):
-    """Format education for JSON storage"""
-    if not education_list:
-        return []
-    
-    formatted = []
-    for edu in education_list:
-        if isinstance(edu, str):
-            formatted.append({
-                'degree': edu,
-                'institution': '',
-                'year': '',
-                'description': edu
-            })
-        elif isinstance(edu, dict):
-            formatted.append(edu)
-    
-    return formatted
-
-def _extract_languages(languages_list):
-    """Extract languages and proficiency levels"""
-    if not languages_list:
-        return []
-    
-    formatted = []
-    for lang in languages_list:
-        if isinstance(lang, str):
-            formatted.append({
-                'language': lang,
-                'proficiency': 'Fluent'
-            })
-        elif isinstance(lang, dict):
-            formatted.append(lang)
-    
-    return formatted
+        current_user_id = get_jwt_identity()
+        job = CVParseJob.query.get(job_id)
+        
+        if not job or job.user_id != current_user_id:
+            return jsonify({'error': 'Parse job not found'}), 404
+        
+        return jsonify(job.to_dict()), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-def _extract_certifications(certifications_list):
-    """Extract certifications"""
-    if not certifications_list:
-        return []
-    
-    formatted = []
-    for cert in certifications_list:
-        if isinstance(cert, str):
-            formatted.append({
-                'name': cert,
-                'issuer': '',
-                'year': '',
-                'description': cert
-            })
-        elif isinstance(cert, dict):
-            formatted.append(cert)
-    
-    return formatted
+@users_bp.route('/cv/batch-parse', methods=['POST'])
+@jwt_required()
+@role_required(UserRole.EMPLOYER, UserRole.ADMIN, message='Only employers and admins can batch parse CVs')
+def batch_parse_cvs():
+    """Parse many CVs at once (multipart `cvs` files and/or .zip archives).
 
-def _extract_headline(experience_list, skills_list):
-    """Extract professional headline from experience and skills"""
-    if experience_list:
-        # Use the most recent job title
-        if isinstance(experience_list[0], dict) and 'title' in experience_list[0]:
-            return experience_list[0]['title']
-        elif isinstance(experience_list[0], str):
-            return experience_list[0]
-    
-    if skills_list:
-        # Create headline from top skills
-        top_skills = skills_list[:3] if len(skills_list) > 3 else skills_list
-        return f"{', '.join(top_skills)} Professional"
-    
-    return "Professional"
+    Streams one NDJSON line per file as soon as it is parsed. All batch
+    requests share one process pool of CV_BATCH_WORKERS processes.
+    """
+    try:
+        files = request.files.getlist('cvs')
+        if not files:
+            return jsonify({'error': 'No CV files provided'}), 400
+        
+        workers = current_app.config.get('CV_BATCH_WORKERS')
+        results = parse_batch(
+            sources_from_uploads(files),
+            workers=workers,
+            max_file_bytes=current_app.config.get('CV_BATCH_MAX_FILE_BYTES'),
+            limits=extraction_limits(current_app.config),
+            executor=shared_executor(workers)
+        )
+        return Response(stream_with_context(to_ndjson(results)), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @users_bp.route('/profile/delete-resume', methods=['DELETE'])
 @jwt_required()
+@role_required(UserRole.JOB_SEEKER, message='Only job seekers can delete resumes')
 def delete_resume():
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        if not user or user.role != UserRole.JOB_SEEKER:
-            return jsonify({'error': 'Only job seekers can delete resumes'}), 403
+        user = current_user.user
         if not user.profile or not user.profile.resume_url:
             return jsonify({'error': 'No resume to delete'}), 400
         # Delete the file from disk
@@ -614,8 +383,7 @@ def delete_resume():
 def serve_uploaded_file(filename):
     """Serve uploaded files (resumes, CVs, etc.)"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = current_user
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -0,0 +1,239 @@
+import atexit
+import threading
+import time
+from collections import Counter
+
+
+def _clean_entries(entries):
+    """Drop None column values, which must not overwrite what is stored"""
+    return [
+        (model, keys, increments, {column: value for column, value in (values or {}).items() if value is not None}, computed)
+        for model, keys, increments, values, computed in entries
+    ]
+
+
+class AnalyticsBuffer:
+    """Write-behind aggregation of analytics counter events.
+
+    Tracking endpoints call record(); events are coalesced in memory per
+    (model, owner, date) and written with bulk UPSERTs by a background
+    thread every ANALYTICS_FLUSH_INTERVAL_MS, or sooner once
+    ANALYTICS_FLUSH_MAX_EVENTS events are pending. The buffer holds at most
+    ANALYTICS_BUFFER_MAX_KEYS rows; when it is full the recording request
+    flushes inline, so events are never dropped. Pending events are flushed
+    on interpreter shutdown.
+
+    With ANALYTICS_BUFFER_ENABLED off, record() writes through immediately;
+    write() always does.
+    Buffered counts are per process and become visible after the next flush.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._pending = {}
+        self._events = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._atexit_registered = False
+        self._metrics = {
+            'flushes': 0,
+            'events_flushed': 0,
+            'rows_flushed': 0,
+            'failed_rows': 0,
+            'inline_flushes': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0
+        }
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['analytics_buffer'] = self
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    @property
+    def enabled(self):
+        return self.app.config.get('ANALYTICS_BUFFER_ENABLED', True)
+
+    def record(self, model, keys, counter=None, values=None, computed=None):
+        """Count one event against the row identified by `keys` (e.g. user_id and date).
+
+        `values` are plain column values (last write wins); `computed` is
+        passed through to upsert_counters_many for this model.
+        """
+        self.record_batch([(model, keys, {counter: 1} if counter else {}, values, computed)])
+
+    def record_batch(self, entries):
+        """Record pre-aggregated increments for many rows at once.
+
+        `entries` is a list of (model, keys, increments, values, computed).
+        They are merged into the buffer under one lock, or, with the buffer
+        disabled, written in a single transaction.
+        """
+        entries = _clean_entries(entries)
+        if not entries:
+            return
+        if not self.enabled:
+            self._write_through(entries)
+            return
+
+        with self._lock:
+            new_rows = {(model, tuple(sorted(keys.items()))) for model, keys, _, _, _ in entries} - self._pending.keys()
+            max_rows = self.app.config.get('ANALYTICS_BUFFER_MAX_KEYS', 10000)
+            # An empty buffer always takes the batch, so an oversized batch cannot loop
+            full = bool(self._pending) and len(self._pending) + len(new_rows) > max_rows
+            if not full:
+                for model, keys, increments, values, computed in entries:
+                    key = (model, tuple(sorted(keys.items())))
+                    entry = self._pending.get(key)
+                    if entry is None:
+                        entry = self._pending[key] = {'keys': dict(keys), 'increments': Counter(), 'values': {}, 'computed': computed}
+                    entry['increments'].update(increments)
+                    entry['values'].update(values)
+                    self._events += max(sum(increments.values()), 1)
+                pending_events = self._events
+            else:
+                self._metrics['inline_flushes'] += 1
+
+        if full:
+            # Backpressure: make room ourselves rather than grow without bound or drop events
+            self.flush()
+            self.record_batch(entries)
+            return
+
+        self._ensure_worker()
+        if pending_events >= self.app.config.get('ANALYTICS_FLUSH_MAX_EVENTS', 1000):
+            self._wakeup.set()
+
+    def write(self, entries):
+        """Apply entries now, in one transaction, bypassing the buffer.
+
+        For callers that must have the increments committed before they
+        answer; takes the same (model, keys, increments, values, computed)
+        entries as record_batch.
+        """
+        entries = _clean_entries(entries)
+        if entries:
+            self._write_through(entries)
+
+    def _write_through(self, entries):
+        from app import db
+        from app.utils.counters import upsert_counters_many
+
+        by_model = {}
+        for model, keys, increments, values, computed in entries:
+            by_model.setdefault(model, (list(keys), computed, []))[2].append((keys, increments, values))
+        try:
+            for model, (key_columns, computed, rows) in by_model.items():
+                upsert_counters_many(model, key_columns, rows, computed)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _ensure_worker(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._worker, name='analytics-flusher', daemon=True)
+                self._thread.start()
+
+    def _worker(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(timeout=self.app.config.get('ANALYTICS_FLUSH_INTERVAL_MS', 1000) / 1000)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Analytics flush error: {e}")
+
+    def flush(self):
+        """Write all pending events with bulk UPSERTs; returns the number of rows written"""
+        from app import db
+        from app.utils.counters import upsert_counters_many
+
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                events, self._events = self._events, 0
+            if not pending:
+                return 0
+
+            started = time.perf_counter()
+            by_model = {}
+            for (model, _), entry in pending.items():
+                by_model.setdefault(model, []).append(entry)
+
+            written = 0
+            with self.app.app_context():
+                for model, entries in by_model.items():
+                    key_columns = list(entries[0]['keys'])
+                    computed = entries[0]['computed']
+                    rows = [(entry['keys'], entry['increments'], entry['values']) for entry in entries]
+                    try:
+                        upsert_counters_many(model, key_columns, rows, computed)
+                        db.session.commit()
+                        written += len(rows)
+                    except Exception as e:
+                        # One bad row (e.g. an unknown job id) must not lose the whole batch
+                        db.session.rollback()
+                        print(f"Analytics bulk flush for {model.__tablename__} failed, retrying row by row: {e}")
+                        for row in rows:
+                            try:
+                                upsert_counters_many(model, key_columns, [row], computed)
+                                db.session.commit()
+                                written += 1
+                            except Exception as row_error:
+                                db.session.rollback()
+                                self._metrics['failed_rows'] += 1
+                                print(f"Dropping analytics row {row[0]}: {row_error}")
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._metrics['flushes'] += 1
+            self._metrics['events_flushed'] += events
+            self._metrics['rows_flushed'] += written
+            self._metrics['last_flush_ms'] = round(elapsed_ms, 2)
+            self._metrics['max_flush_ms'] = round(max(self._metrics['max_flush_ms'], elapsed_ms), 2)
+            self._metrics['total_flush_ms'] += elapsed_ms
+            return written
+
+    def stop(self, timeout=5):
+        """Stop the background flusher and write out whatever is still pending"""
+        thread = self._thread
+        if thread is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            thread.join(timeout)
+            self._thread = None
+        if self.app is not None and self._pending:
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Analytics flush on shutdown failed: {e}")
+
+    def metrics(self):
+        with self._lock:
+            pending_keys, pending_events = len(self._pending), self._events
+        flushes = self._metrics['flushes']
+        return {
+            'enabled': self.enabled,
+            'pending_rows': pending_keys,
+            'pending_events': pending_events,
+            'max_rows': self.app.config.get('ANALYTICS_BUFFER_MAX_KEYS', 10000),
+            'flushes': flushes,
+            'events_flushed': self._metrics['events_flushed'],
+            'rows_flushed': self._metrics['rows_flushed'],
+            'failed_rows': self._metrics['failed_rows'],
+            'inline_flushes': self._metrics['inline_flushes'],
+            'last_flush_ms': self._metrics['last_flush_ms'],
+            'max_flush_ms': self._metrics['max_flush_ms'],
+            'avg_flush_ms': round(self._metrics['total_flush_ms'] / flushes, 2) if flushes else 0.0
+        }
@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with a per-entry TTL.
+
+    Bounded by entry count and, optionally, by the total length of the
+    cached values (`max_bytes`; values must then be bytes or str).
+    """
+
+    def __init__(self, max_entries=1024, ttl=60, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _sizeof(self, value):
+        return len(value) if self.max_bytes else 0
+
+    def _pop(self, key):
+        value, _ = self._entries.pop(key)
+        self._size -= self._sizeof(value)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            if self.max_bytes and self._sizeof(value) > self.max_bytes:
+                return
+            self._entries[key] = (value, time.monotonic() + (ttl or self.ttl))
+            self._size += self._sizeof(value)
+            while len(self._entries) > self.max_entries or (self.max_bytes and self._size > self.max_bytes):
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class RedisCache:
+    """Same interface as LRUCache, shared between workers through Redis"""
+
+    def __init__(self, url, prefix, ttl=60):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=ttl or self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+class ResponseCache:
+    """Cache of pre-serialized JSON response bodies, keyed by resource id.
+
+    Configured from `<NAME>_CACHE_BACKEND` ('memory' or 'redis'),
+    `<NAME>_CACHE_TTL`, `<NAME>_CACHE_MAX_ENTRIES` and (memory only)
+    `<NAME>_CACHE_MAX_BYTES`. Cache failures never fail the request; they
+    just fall through to the database.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.backend = LRUCache()
+
+    def init_app(self, app):
+        config_prefix = self.name.upper()
+        ttl = app.config.get(f'{config_prefix}_CACHE_TTL', 60)
+        if app.config.get(f'{config_prefix}_CACHE_BACKEND', 'memory') == 'redis':
+            self.backend = RedisCache(app.config['REDIS_URL'], f'cache:{self.name}:', ttl=ttl)
+        else:
+            self.backend = LRUCache(
+                max_entries=app.config.get(f'{config_prefix}_CACHE_MAX_ENTRIES', 1024),
+                ttl=ttl,
+                max_bytes=app.config.get(f'{config_prefix}_CACHE_MAX_BYTES')
+            )
+
+    def get(self, key):
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            print(f"Cache get failed for {self.name}:{key}: {e}")
+            return None
+
+    def set(self, key, body):
+        try:
+            self.backend.set(key, body)
+        except Exception as e:
+            print(f"Cache set failed for {self.name}:{key}: {e}")
+
+    def invalidate(self, key):
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            print(f"Cache invalidate failed for {self.name}:{key}: {e}")
+
+    def invalidate_all(self):
+        try:
+            self.backend.clear()
+        except Exception as e:
+            print(f"Cache clear failed for {self.name}: {e}")
+
+
+# Employer fields left out of cached job details: logins and email verification
+# change them without invalidating the cache
+VOLATILE_EMPLOYER_FIELDS = ('last_login', 'is_verified')
+
+
+def invalidate_employer_jobs(user):
+    """Drop the cached job details of `user`'s postings, which embed the employer's user record"""
+    from app import db, job_cache
+    from app.models.job import Job
+    from app.models.user import UserRole
+
+    if user.role != UserRole.EMPLOYER:
+        return
+    for (job_id,) in db.session.query(Job.id).filter(Job.employer_id == user.id):
+        job_cache.invalidate(job_id)
@@ -0,0 +1,119 @@
+from sqlalchemy import func, literal, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+
+# Stay well below SQLite's bound-parameter limit in multi-row upserts
+UPSERT_CHUNK_ROWS = 200
+
+
+def increment(model, filters, **deltas):
+    """UPDATE model SET col = col + n ... WHERE filters, as a single statement.
+
+    Runs in the caller's transaction (no commit) and returns the number of
+    rows matched.
+    """
+    stmt = update(model).where(
+        *[getattr(model, column) == value for column, value in filters.items()]
+    ).values({
+        getattr(model, column): getattr(model, column) + delta for column, delta in deltas.items()
+    }).execution_options(synchronize_session=False)
+    return db.session.execute(stmt).rowcount
+
+
+def upsert_counters(model, keys, increments, values=None, computed=None):
+    """Add `increments` to the row identified by `keys`, creating it if missing.
+
+    One INSERT ... ON CONFLICT DO UPDATE statement on SQLite and PostgreSQL
+    (`keys` must be covered by a unique index); other databases fall back
+    to UPDATE, then INSERT, then UPDATE again if a concurrent insert won.
+
+    `values` are plain column values written on insert and update.
+    `computed` maps a column to `fn(new)`, where `new(column)` is the SQL
+    expression for that column's value after this statement, e.g. a rate
+    derived from two counters. Runs in the caller's transaction.
+    """
+    upsert_counters_many(model, list(keys), [(keys, increments, values or {})], computed)
+
+
+def upsert_counters_many(model, key_columns, rows, computed=None):
+    """upsert_counters for many rows: `rows` is a list of (keys, increments, values).
+
+    Rows are written with multi-row INSERT ... ON CONFLICT statements of up
+    to UPSERT_CHUNK_ROWS rows. A None in `values` leaves the stored value
+    unchanged.
+    """
+    computed = computed or {}
+    if not rows:
+        return
+    dialect = db.session.get_bind().dialect.name
+    if dialect not in ('sqlite', 'postgresql'):
+        for keys, increments, values in rows:
+            _upsert_fallback(model, keys, increments, values, computed)
+        return
+
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+
+    table = model.__table__
+    counter_columns = sorted({column for _, increments, _ in rows for column in increments})
+    value_columns = sorted({column for _, _, values in rows for column in values})
+
+    for start in range(0, len(rows), UPSERT_CHUNK_ROWS):
+        chunk = []
+        for keys, increments, values in rows[start:start + UPSERT_CHUNK_ROWS]:
+            row = {column: keys[column] for column in key_columns}
+            row.update({column: increments.get(column, 0) for column in counter_columns})
+            row.update({column: values.get(column) for column in value_columns})
+            row.update({column: fn(lambda c, row=row: literal(row.get(c, 0))) for column, fn in computed.items()})
+            chunk.append(row)
+        stmt = insert(table).values(chunk)
+
+        def updated(column):
+            if column in counter_columns:
+                return table.c[column] + stmt.excluded[column]
+            if column in value_columns:
+                return func.coalesce(stmt.excluded[column], table.c[column])
+            return table.c[column]
+
+        set_ = {column: updated(column) for column in [*counter_columns, *value_columns]}
+        set_.update({column: fn(updated) for column, fn in computed.items()})
+        if set_:
+            stmt = stmt.on_conflict_do_update(index_elements=list(key_columns), set_=set_)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(key_columns))
+        db.session.execute(stmt)
+
+
+def _upsert_fallback(model, keys, increments, values, computed):
+    table = model.__table__
+    values = {column: value for column, value in values.items() if value is not None}
+    row = {**keys, **increments, **values}
+
+    def inserted(column):
+        return literal(row.get(column, 0))
+
+    def update_existing():
+        def updated(column):
+            if column in increments:
+                return table.c[column] + increments[column]
+            if column in values:
+                return literal(values[column])
+            return table.c[column]
+
+        set_ = {column: updated(column) for column in [*increments, *values]}
+        set_.update({column: fn(updated) for column, fn in computed.items()})
+        if not set_:
+            return db.session.query(model).filter_by(**keys).count()
+        stmt = update(table).where(*[table.c[column] == value for column, value in keys.items()]).values(set_)
+        return db.session.execute(stmt).rowcount
+
+    if update_existing():
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(table.insert().values(**row, **{column: fn(inserted) for column, fn in computed.items()}))
+    except IntegrityError:
+        update_existing()
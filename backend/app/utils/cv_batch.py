@@ -0,0 +1,189 @@
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from app.utils.cv_parser import parse_cv_file
+
+ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
+
+
+class CVSource:
+    """One CV in a batch: a display name plus a way to get it onto disk.
+
+    `materialize(workdir)` returns a local path; sources backed by uploads
+    or zip members are only written out right before they are submitted,
+    so a large batch never sits on disk (or in memory) all at once.
+    A source with an `error` could not be read at all (e.g. a corrupt
+    archive) and is reported as failed without being parsed.
+    """
+
+    def __init__(self, name, path=None, opener=None, size=None, error=None):
+        self.name = name
+        self.error = error
+        self.extension = name.lower().rsplit('.', 1)[-1] if '.' in name else ''
+        self.size = size
+        self._path = path
+        self._opener = opener
+        self.temporary = path is None
+
+    def materialize(self, workdir):
+        if self._path is not None:
+            return self._path
+        fd, path = tempfile.mkstemp(suffix=f'.{self.extension}', dir=workdir)
+        with os.fdopen(fd, 'wb') as out, self._opener() as src:
+            shutil.copyfileobj(src, out)
+        return path
+
+
+class _unclosed:
+    """Context manager over an upload stream that leaves it open"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __enter__(self):
+        self.stream.seek(0)
+        return self.stream
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _zip_sources(zip_file, label):
+    try:
+        archive = zipfile.ZipFile(zip_file)
+    except (zipfile.BadZipFile, OSError) as e:
+        yield CVSource(label, error=f'Invalid zip archive: {str(e)}')
+        return
+    for info in archive.infolist():
+        if info.is_dir() or os.path.basename(info.filename).startswith('.'):
+            continue
+        yield CVSource(f'{label}:{info.filename}', opener=lambda info=info: archive.open(info), size=info.file_size)
+
+
+def sources_from_paths(paths):
+    """Files, directories (recursively) and .zip archives on the local disk"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield from sources_from_paths([os.path.join(root, name)])
+        elif path.lower().endswith('.zip'):
+            yield from _zip_sources(path, path)
+        else:
+            yield CVSource(path, path=path, size=os.path.getsize(path))
+
+
+def sources_from_uploads(files):
+    """werkzeug FileStorage objects; .zip uploads are expanded member by member"""
+    for storage in files:
+        if not storage.filename:
+            continue
+        if storage.filename.lower().endswith('.zip'):
+            yield from _zip_sources(storage.stream, storage.filename)
+        else:
+            storage.stream.seek(0, os.SEEK_END)
+            yield CVSource(storage.filename, opener=lambda storage=storage: _unclosed(storage.stream),
+                           size=storage.stream.tell())
+
+
+def _result(source, status, **fields):
+    return {'file': source.name, 'status': status, **fields}
+
+
+def _new_executor(workers):
+    # 'spawn' keeps the parent's threads and sockets out of the workers
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+_shared_executor = None
+_shared_lock = threading.Lock()
+
+
+def shared_executor(workers=None):
+    """The process pool shared by every batch request in this process.
+
+    Created on first use with `workers` processes (default: CPU count);
+    concurrent batches queue on it rather than each starting a pool.
+    """
+    global _shared_executor
+    if _shared_executor is None:
+        with _shared_lock:
+            if _shared_executor is None:
+                _shared_executor = _new_executor(workers or os.cpu_count() or 1)
+    return _shared_executor
+
+
+def parse_batch(sources, workers=None, max_file_bytes=None, limits=None, executor=None):
+    """Parse CVs in a process pool, yielding one result dict per source as it completes.
+
+    At most 2 * workers files are in flight (and on disk) at any time, so
+    memory stays flat however many sources there are. Results arrive in
+    completion order, not input order. `limits` are extraction budgets
+    passed through to parse_cv_file (see cv_parser.extraction_limits).
+    With `executor` the batch runs on that pool and leaves it running;
+    otherwise a pool is started for the batch and shut down afterwards.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = workers * 2
+    workdir = tempfile.mkdtemp(prefix='cv_batch_')
+    owns_executor = executor is None
+    if owns_executor:
+        executor = _new_executor(workers)
+    in_flight = {}
+    sources = iter(sources)
+    try:
+        exhausted = False
+        while in_flight or not exhausted:
+            while not exhausted and len(in_flight) < window:
+                source = next(sources, None)
+                if source is None:
+                    exhausted = True
+                    break
+                if source.error:
+                    yield _result(source, 'failed', error=source.error)
+                    continue
+                if source.extension not in ALLOWED_EXTENSIONS:
+                    yield _result(source, 'skipped', error='Unsupported file type')
+                    continue
+                if max_file_bytes and source.size and source.size > max_file_bytes:
+                    yield _result(source, 'failed', error='File too large')
+                    continue
+                try:
+                    path = source.materialize(workdir)
+                except Exception as e:
+                    yield _result(source, 'failed', error=f'Failed to read file: {str(e)}')
+                    continue
+                in_flight[executor.submit(parse_cv_file, path, source.extension, **(limits or {}))] = (source, path)
+
+            if not in_flight:
+                continue
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                source, path = in_flight.pop(future)
+                if source.temporary:
+                    os.remove(path)
+                try:
+                    parsed = future.result()
+                    yield _result(source, 'completed', extracted=parsed['extracted'], raw_data=parsed['raw_data'],
+                                  extraction=parsed['extraction'])
+                except Exception as e:
+                    yield _result(source, 'failed', error=f'Failed to process CV: {str(e)}')
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            for future in in_flight:
+                future.cancel()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def to_ndjson(results):
+    for result in results:
+        yield json.dumps(result) + '\n'
@@ -0,0 +1,456 @@
+import re
+import time
+from bisect import bisect_left
+
+# Bump whenever parsing output changes so cached results are not reused
+PARSER_VERSION = 1
+
+
+class CVParseError(Exception):
+    pass
+
+
+class ExtractionStats:
+    """How much of a document was read, and how long each page took"""
+
+    def __init__(self):
+        self.pages_read = 0
+        self.total_pages = None
+        self.text_bytes = 0
+        self.page_timings_ms = []
+        self.elapsed_ms = 0.0
+        # None, 'sections_complete', 'max_pages' or 'max_text_bytes'
+        self.stop_reason = None
+
+    def to_dict(self):
+        return {
+            'pages_read': self.pages_read,
+            'total_pages': self.total_pages,
+            'text_bytes': self.text_bytes,
+            'page_timings_ms': self.page_timings_ms,
+            'elapsed_ms': self.elapsed_ms,
+            'stop_reason': self.stop_reason
+        }
+
+
+def extraction_limits(config):
+    """Extraction budget from app config, as keyword arguments for parse_cv_file"""
+    return {
+        'max_pages': config.get('CV_PARSE_MAX_PAGES'),
+        'max_text_bytes': config.get('CV_PARSE_MAX_TEXT_BYTES')
+    }
+
+
+def iter_pdf_pages(file_path, stats):
+    """Yield the text of each PDF page, loading pages one at a time"""
+    import PyPDF2
+    with open(file_path, 'rb') as pdf_file:
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        stats.total_pages = len(pdf_reader.pages)
+        for page in pdf_reader.pages:
+            yield (page.extract_text() or '') + "\n"
+
+
+def _iter_document(file_path, file_extension, stats, max_text_bytes):
+    if file_extension == 'pdf':
+        yield from iter_pdf_pages(file_path, stats)
+    elif file_extension in ['doc', 'docx']:
+        # For DOC/DOCX files, try to extract text using python-docx
+        try:
+            from docx import Document
+        except ImportError:
+            raise CVParseError('DOC/DOCX parsing requires python-docx library')
+        doc = Document(file_path)
+        yield ''.join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+    else:  # txt file
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as txt_file:
+            # Never read (much) more than the budget; the loop below trims exactly
+            yield txt_file.read(max_text_bytes + 1 if max_text_bytes else -1)
+
+
+def extract_text(file_path, file_extension, max_pages=None, max_text_bytes=None, stats=None):
+    """Extract plain text from a PDF, DOC/DOCX or TXT file.
+
+    PDF pages are read lazily, and reading stops as soon as every CV section
+    is complete (more pages could not change the parse), after `max_pages`
+    pages, or once `max_text_bytes` of UTF-8 text has been collected.
+    Progress and per-page timings are recorded on `stats`.
+    """
+    stats = stats if stats is not None else ExtractionStats()
+    started = time.perf_counter()
+    parts = []
+    pages = _iter_document(file_path, file_extension, stats, max_text_bytes)
+    try:
+        while True:
+            if max_pages and stats.pages_read >= max_pages:
+                stats.stop_reason = 'max_pages'
+                break
+            page_started = time.perf_counter()
+            page_text = next(pages, None)
+            if page_text is None:
+                break
+            stats.pages_read += 1
+            stats.page_timings_ms.append(round((time.perf_counter() - page_started) * 1000, 2))
+
+            page_bytes = len(page_text.encode('utf-8'))
+            if max_text_bytes and stats.text_bytes + page_bytes > max_text_bytes:
+                remaining = max_text_bytes - stats.text_bytes
+                page_text = page_text.encode('utf-8')[:remaining].decode('utf-8', errors='ignore')
+                page_bytes = len(page_text.encode('utf-8'))
+                stats.stop_reason = 'max_text_bytes'
+            parts.append(page_text)
+            stats.text_bytes += page_bytes
+            if stats.stop_reason:
+                break
+
+            if file_extension == 'pdf' and _sections_complete(''.join(parts)):
+                stats.stop_reason = 'sections_complete'
+                break
+    finally:
+        pages.close()
+        stats.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    return ''.join(parts)
+
+
+def build_extracted(data):
+    """Map raw parsed CV data onto profile fields, dropping empty values"""
+    extracted = {
+        'username': data.get('name', '').strip() if data.get('name') else '',
+        'phone': data.get('phone', '') or '',
+        'skills': ', '.join(data.get('skills', [])) if data.get('skills') else '',
+        'summary': data.get('summary', '') or '',
+        'experience_years': _extract_experience_years(data.get('experience', [])),
+        'education_level': _extract_highest_education(data.get('education', [])),
+        'work_experience': _format_work_experience(data.get('experience', [])),
+        'education': _format_education(data.get('education', [])),
+        'languages': _extract_languages(data.get('languages', [])),
+        'certifications': _extract_certifications(data.get('certifications', [])),
+        'headline': _extract_headline(data.get('experience', []), data.get('skills', [])),
+    }
+    return {k: v for k, v in extracted.items() if v and v != ''}
+
+
+def parse_cv_file(file_path, file_extension, max_pages=None, max_text_bytes=None):
+    """Full pipeline for one file: text extraction, parsing and field mapping.
+
+    Runs in worker processes, so it only depends on this module.
+    """
+    stats = ExtractionStats()
+    try:
+        text_content = extract_text(file_path, file_extension, max_pages, max_text_bytes, stats)
+    except CVParseError:
+        raise
+    except Exception as e:
+        raise CVParseError(f'Failed to extract text from file: {str(e)}')
+
+    data = _parse_cv_text(text_content)
+    return {
+        'text': text_content,
+        'extracted': build_extracted(data),
+        'raw_data': data,
+        'extraction': stats.to_dict()
+    }
+
+_SECTION_KEYWORDS = {
+    'skills': ('skills', 'technical skills', 'competencies', 'technologies'),
+    'summary': ('summary', 'objective', 'profile', 'about'),
+    'experience': ('experience', 'work experience', 'employment history', 'professional experience'),
+    'education': ('education', 'academic background', 'qualifications'),
+    'languages': ('languages', 'language skills'),
+    'certifications': ('certifications', 'certificates', 'accreditations'),
+}
+
+# A short line containing one of these ends the current section
+_MAJOR_SECTIONS = ('experience', 'education', 'skills', 'languages', 'certifications', 'projects', 'achievements')
+_MAJOR = '_major'
+
+_HEADER_KEYWORDS = [(keyword, section) for section, keywords in _SECTION_KEYWORDS.items() for keyword in keywords]
+_HEADER_KEYWORDS += [(keyword, _MAJOR) for keyword in _MAJOR_SECTIONS]
+
+
+def _keyword_pattern(keywords):
+    """Compile keywords into one alternation shaped like a trie, so each
+    position in the text is tested once per character instead of once per keyword"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def to_regex(node):
+        branches = [re.escape(char) + to_regex(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:%s)' % '|'.join(branches)
+        return '(?:%s)?' % body if '' in node else body
+
+    return re.compile(to_regex(trie))
+
+
+_HEADER_RE = _keyword_pattern({keyword for keyword, _ in _HEADER_KEYWORDS})
+
+_PHONE_RES = (
+    re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),  # (555) 123-4567 or 555-123-4567
+    re.compile(r'\+?\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}'),  # International format
+)
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_LIST_SPLIT_RE = re.compile(r'[,;•\n]')
+_EXPERIENCE_SPLIT_RE = re.compile(r'\n(?=[A-Z][a-z]+\s+at\s+|\d{4}|[A-Z][a-z]+\s+\d{4})')
+_EDUCATION_SPLIT_RE = re.compile(r'\n(?=[A-Z][a-z]+\s+|\d{4}|University|College|School)')
+_CERTIFICATION_SPLIT_RE = re.compile(r'\n(?=[A-Z]|\d{4})')
+_NAME_EXCLUDE = ('phone', 'email', 'address', 'summary', 'experience', 'education')
+
+
+def _parse_cv_text(text_content):
+    """Parse CV text content using pattern matching"""
+    lines = text_content.split('\n')
+    
+    data = {
+        'name': '',
+        'phone': '',
+        'email': '',
+        'skills': [],
+        'summary': '',
+        'experience': [],
+        'education': [],
+        'languages': [],
+        'certifications': []
+    }
+    
+    # Extract name (usually the first line or after "name:")
+    for line in lines[:5]:  # Check first 5 lines
+        line_stripped = line.strip()
+        if line_stripped and not any(keyword in line_stripped.lower() for keyword in _NAME_EXCLUDE):
+            # This might be the name
+            data['name'] = line_stripped
+            break
+    
+    # Extract phone number
+    for pattern in _PHONE_RES:
+        phone_match = pattern.search(text_content)
+        if phone_match:
+            data['phone'] = phone_match.group()
+            break
+    
+    # Extract email
+    email_match = _EMAIL_RE.search(text_content)
+    if email_match:
+        data['email'] = email_match.group()
+    
+    sections = _split_sections(text_content)
+    
+    # Extract skills
+    if sections['skills']:
+        # Split by common delimiters and clean up
+        skills = _LIST_SPLIT_RE.split(sections['skills'])
+        data['skills'] = [skill.strip() for skill in skills if skill.strip() and len(skill.strip()) > 1]
+    
+    # Extract summary/objective
+    if sections['summary']:
+        data['summary'] = sections['summary'][:500]  # Limit to 500 characters
+    
+    # Extract experience
+    if sections['experience']:
+        # Split into individual experiences
+        experiences = _EXPERIENCE_SPLIT_RE.split(sections['experience'])
+        data['experience'] = [exp.strip() for exp in experiences if exp.strip()]
+    
+    # Extract education
+    if sections['education']:
+        # Split into individual education entries
+        educations = _EDUCATION_SPLIT_RE.split(sections['education'])
+        data['education'] = [edu.strip() for edu in educations if edu.strip()]
+    
+    # Extract languages
+    if sections['languages']:
+        languages = _LIST_SPLIT_RE.split(sections['languages'])
+        data['languages'] = [lang.strip() for lang in languages if lang.strip()]
+    
+    # Extract certifications
+    if sections['certifications']:
+        certifications = _CERTIFICATION_SPLIT_RE.split(sections['certifications'])
+        data['certifications'] = [cert.strip() for cert in certifications if cert.strip()]
+    
+    return data
+
+def _scan_headers(text):
+    """Find section header lines in one scan.
+
+    Returns ({section: first header line}, sorted major-section line numbers).
+    """
+    lower = text.lower()
+    lower_lines = lower.split('\n')
+    
+    # One regex pass finds the (few) lines mentioning any header keyword;
+    # only those lines are checked keyword by keyword
+    first_header = {}
+    major_lines = []
+    line_no = 0
+    scanned_to = 0
+    match = _HEADER_RE.search(lower)
+    while match:
+        line_no += lower.count('\n', scanned_to, match.start())
+        line = lower_lines[line_no]
+        for keyword, section in _HEADER_KEYWORDS:
+            if keyword not in line:
+                continue
+            if section != _MAJOR:
+                first_header.setdefault(section, line_no)
+            elif not major_lines or major_lines[-1] != line_no:
+                if len(line.strip()) < 50:
+                    major_lines.append(line_no)
+        scanned_to = lower.find('\n', match.start())
+        if scanned_to == -1:
+            break
+        match = _HEADER_RE.search(lower, scanned_to)
+    return first_header, major_lines
+
+def _split_sections(text):
+    """Slice every known section out of the text in one scan.
+
+    A section starts after the first line containing one of its keywords
+    and runs until the next short (< 50 chars) line naming a major section.
+    Returns {section: text or None}.
+    """
+    first_header, major_lines = _scan_headers(text)
+    lines = text.split('\n')
+    sections = {}
+    for section in _SECTION_KEYWORDS:
+        if section not in first_header:
+            sections[section] = None
+            continue
+        section_start = first_header[section] + 1
+        next_major = bisect_left(major_lines, section_start)
+        section_end = major_lines[next_major] if next_major < len(major_lines) else len(lines)
+        sections[section] = '\n'.join(lines[section_start:section_end]).strip()
+    return sections
+
+def _sections_complete(text):
+    """True when appending more text could not change what _parse_cv_text returns:
+    every section has started and been closed by a later major header, and
+    the email and (primary pattern) phone number have already been found"""
+    if not (_EMAIL_RE.search(text) and _PHONE_RES[0].search(text)):
+        return False
+    first_header, major_lines = _scan_headers(text)
+    if len(first_header) < len(_SECTION_KEYWORDS):
+        return False
+    last_start = max(first_header.values()) + 1
+    return bool(major_lines) and major_lines[-1] >= last_start
+
+def _extract_experience_years(experience_list):
+    """Extract total years of experience from experience list"""
+    if not experience_list:
+        return ''
+    
+    try:
+        # Simple heuristic: count number of experiences and estimate years
+        # This is a basic implementation - could be enhanced with date parsing
+        return str(len(experience_list))
+    except:
+        return ''
+
+def _extract_highest_education(education_list):
+    """Extract highest education level"""
+    if not education_list:
+        return ''
+    
+    education_levels = ['phd', 'doctorate', 'master', 'bachelor', 'associate', 'diploma', 'high school']
+    
+    for edu in education_list:
+        edu_lower = str(edu).lower()
+        for level in education_levels:
+            if level in edu_lower:
+                return level.title()
+    
+    return education_list[0] if education_list else ''
+
+def _format_work_experience(experience_list):
+    """Format work experience for JSON storage"""
+    if not experience_list:
+        return []
+    
+    formatted = []
+    for exp in experience_list:
+        if isinstance(exp, str):
+            formatted.append({
+                'title': exp,
+                'company': '',
+                'duration': '',
+                'description': exp
+            })
+        elif isinstance(exp, dict):
+            formatted.append(exp)
+    
+    return formatted
+
+def _format_education(education_list):
+    """Format education for JSON storage"""
+    if not education_list:
+        return []
+    
+    formatted = []
+    for edu in education_list:
+        if isinstance(edu, str):
+            formatted.append({
+                'degree': edu,
+                'institution': '',
+                'year': '',
+                'description': edu
+            })
+        elif isinstance(edu, dict):
+            formatted.append(edu)
+    
+    return formatted
+
+def _extract_languages(languages_list):
+    """Extract languages and proficiency levels"""
+    if not languages_list:
+        return []
+    
+    formatted = []
+    for lang in languages_list:
+        if isinstance(lang, str):
+            formatted.append({
+                'language': lang,
+                'proficiency': 'Fluent'
+            })
+        elif isinstance(lang, dict):
+            formatted.append(lang)
+    
+    return formatted
+
+def _extract_certifications(certifications_list):
+    """Extract certifications"""
+    if not certifications_list:
+        return []
+    
+    formatted = []
+    for cert in certifications_list:
+        if isinstance(cert, str):
+            formatted.append({
+                'name': cert,
+                'issuer': '',
+                'year': '',
+                'description': cert
+            })
+        elif isinstance(cert, dict):
+            formatted.append(cert)
+    
+    return formatted
+
+def _extract_headline(experience_list, skills_list):
+    """Extract professional headline from experience and skills"""
+    if experience_list:
+        # Use the most recent job title
+        if isinstance(experience_list[0], dict) and 'title' in experience_list[0]:
+            return experience_list[0]['title']
+        elif isinstance(experience_list[0], str):
+            return experience_list[0]
+    
+    if skills_list:
+        # Create headline from top skills
+        top_skills = skills_list[:3] if len(skills_list) > 3 else skills_list
+        return f"{', '.join(top_skills)} Professional"
+    
+    return "Professional"
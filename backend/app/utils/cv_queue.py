@@ -0,0 +1,177 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from app.utils.cache import ResponseCache
+from app.utils.cv_parser import PARSER_VERSION, extraction_limits, parse_cv_file
+
+
+class QueueFull(Exception):
+    pass
+
+
+class CVParseQueue:
+    """Runs CV parsing in a process pool and records results on CVParseJob rows.
+
+    Concurrency is bounded by CV_PARSE_WORKERS processes; each user may have
+    at most CV_PARSE_MAX_PENDING_PER_USER unfinished jobs. Jobs still queued
+    after CV_PARSE_JOB_TIMEOUT seconds (e.g. lost in a restart) no longer
+    count against that limit. On completion a `cv_parsed` SocketIO event is
+    pushed to the user's room.
+
+    Results are cached by the SHA-256 of the file plus PARSER_VERSION
+    (`CV_PARSE_CACHE_*` settings), so re-uploading the same CV completes
+    immediately without extracting text again.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.cache = ResponseCache('cv_parse')
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.cache.init_app(app)
+        app.extensions['cv_parse_queue'] = self
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # 'spawn' keeps the parent's threads and sockets out of the workers
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.app.config.get('CV_PARSE_WORKERS', 2),
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def pending_count(self, user_id):
+        from app.models.cv_parse_job import CVParseJob, CVParseStatus
+
+        cutoff = datetime.utcnow() - timedelta(seconds=self.app.config.get('CV_PARSE_JOB_TIMEOUT', 600))
+        return CVParseJob.query.filter(
+            CVParseJob.user_id == user_id,
+            CVParseJob.status == CVParseStatus.QUEUED,
+            CVParseJob.created_at >= cutoff
+        ).count()
+
+    def cache_key(self, file_path):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        # Different extraction budgets can produce different results
+        limits = extraction_limits(self.app.config)
+        return f"v{PARSER_VERSION}:{limits['max_pages']}:{limits['max_text_bytes']}:{digest.hexdigest()}"
+
+    def _cached_result(self, key):
+        body = self.cache.get(key)
+        if body is None:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
+
+    def submit(self, user_id, file_path, file_extension, filename=None):
+        """Create a CVParseJob and hand the file to the pool.
+
+        The pool owns `file_path` from here on and deletes it when done.
+        On a cache hit the job is returned already completed. Raises
+        QueueFull when the user already has too many pending jobs; if the
+        pool refuses the file, the job is marked failed and the error re-raised
+        (the caller still owns `file_path` then).
+        """
+        from app import db
+        from app.models.cv_parse_job import CVParseJob, CVParseStatus
+
+        cache_key = self.cache_key(file_path)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            os.remove(file_path)
+            job = CVParseJob(
+                user_id=user_id,
+                filename=filename,
+                status=CVParseStatus.COMPLETED,
+                result=self._job_result(cached),
+                finished_at=datetime.utcnow()
+            )
+            db.session.add(job)
+            db.session.commit()
+            return job
+
+        if self.pending_count(user_id) >= self.app.config.get('CV_PARSE_MAX_PENDING_PER_USER', 3):
+            raise QueueFull('Too many CVs are already being parsed. Please wait for them to finish.')
+
+        job = CVParseJob(user_id=user_id, filename=filename)
+        db.session.add(job)
+        db.session.commit()
+
+        try:
+            future = self.executor.submit(parse_cv_file, file_path, file_extension, **extraction_limits(self.app.config))
+        except Exception as e:
+            # Otherwise the job would stay queued forever and count against the pending limit
+            job.status = CVParseStatus.FAILED
+            job.error = f'Failed to queue CV: {str(e)}'
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            raise
+        future.add_done_callback(lambda f, job_id=job.id: self._finish(job_id, user_id, file_path, cache_key, f))
+        return job
+
+    @staticmethod
+    def _job_result(result):
+        # The extracted text is only kept in the cache, not on every job row
+        return {k: v for k, v in result.items() if k != 'text'}
+
+    def _log_if_slow(self, job, extraction):
+        if extraction['elapsed_ms'] >= self.app.config.get('CV_PARSE_SLOW_MS', 2000):
+            slowest = max(extraction['page_timings_ms'], default=0)
+            print(f"Slow CV extraction for job {job.id} ({job.filename}): {extraction['elapsed_ms']} ms, "
+                  f"{extraction['pages_read']}/{extraction['total_pages']} pages, slowest page {slowest} ms, "
+                  f"stop reason {extraction['stop_reason']}")
+
+    def _finish(self, job_id, user_id, file_path, cache_key, future):
+        """Store the result (runs on the pool's result thread)"""
+        from app import db, socketio
+        from app.utils.realtime import user_room
+        from app.models.cv_parse_job import CVParseJob, CVParseStatus
+
+        if os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+        with self.app.app_context():
+            try:
+                job = CVParseJob.query.get(job_id)
+                if job is None:
+                    return
+                try:
+                    result = future.result()
+                    self.cache.set(cache_key, json.dumps(result))
+                    self._log_if_slow(job, result['extraction'])
+                    job.result = self._job_result(result)
+                    job.status = CVParseStatus.COMPLETED
+                except Exception as e:
+                    job.error = f'Failed to process CV: {str(e)}'
+                    job.status = CVParseStatus.FAILED
+                job.finished_at = datetime.utcnow()
+                db.session.commit()
+
+                socketio.emit('cv_parsed', job.to_dict(), room=user_room(user_id))
+            except Exception as e:
+                db.session.rollback()
+                print(f"Failed to record CV parse result for job {job_id}: {e}")
@@ -1,15 +1,23 @@
 from flask import current_app, render_template_string
-from flask_mail import Message
-from app import mail, db
+from app import db
+from app.models.outbox import EmailOutbox
 import uuid
 
+def queue_email(subject, recipients, html):
+    """Add an email to the outbox in the caller's transaction.
+
+    The row is committed with the caller's own changes; call
+    email_dispatcher.wake() after that commit so delivery starts in the
+    background (see app.utils.email_queue) and the request never waits on SMTP.
+    """
+    db.session.add(EmailOutbox(subject=subject, recipients=recipients, html=html))
+
 def send_verification_email(user):
     """Send email verification email"""
     try:
         # Generate verification token
         verification_token = str(uuid.uuid4())
         user.email_verification_token = verification_token
-        db.session.commit()
         
         # Create verification URL
         verification_url = f"{current_app.config.get('FRONTEND_URL', 'http://localhost:3000')}/verify-email/{verification_token}"
@@ -34,17 +42,16 @@ def send_verification_email(user):
         </html>
         """
         
-        msg = Message(
+        queue_email(
             subject="Verify Your Email - HandmadeCareers",
             recipients=[user.email],
             html=render_template_string(html_template, verification_url=verification_url)
         )
-        
-        mail.send(msg)
         return True
         
-    except Exception as e:
-        print(f"Error sending verification email: {e}")
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("Error queueing verification email")
         return False
 
 def send_password_reset_email(user, reset_token):
@@ -74,17 +81,16 @@ def send_password_reset_email(user, reset_token):
         </html>
         """
         
-        msg = Message(
+        queue_email(
             subject="Reset Your Password - HandmadeCareers",
             recipients=[user.email],
             html=render_template_string(html_template, reset_url=reset_url)
         )
-        
-        mail.send(msg)
         return True
         
-    except Exception as e:
-        print(f"Error sending password reset email: {e}")
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("Error queueing password reset email")
         return False
 
 def send_application_notification(user, job_title, company_name):
@@ -105,17 +111,16 @@ def send_application_notification(user, job_title, company_name):
         </html>
         """
         
-        msg = Message(
+        queue_email(
             subject=f"Application Received - {job_title}",
             recipients=[user.email],
             html=render_template_string(html_template, job_title=job_title, company_name=company_name)
         )
-        
-        mail.send(msg)
         return True
         
-    except Exception as e:
-        print(f"Error sending application notification: {e}")
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("Error queueing application notification")
         return False
 
 def send_interview_invitation(user, job_title, company_name, interview_date, interview_location):
@@ -138,7 +143,7 @@ def send_interview_invitation(user, job_title, company_name, interview_date, int
         </html>
         """
         
-        msg = Message(
+        queue_email(
             subject=f"Interview Invitation - {job_title}",
             recipients=[user.email],
             html=render_template_string(html_template, 
@@ -147,10 +152,9 @@ def send_interview_invitation(user, job_title, company_name, interview_date, int
                                       interview_date=interview_date,
                                       interview_location=interview_location)
         )
-        
-        mail.send(msg)
         return True
         
-    except Exception as e:
-        print(f"Error sending interview invitation: {e}")
-        return False 
\ No newline at end of file
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("Error queueing interview invitation")
+        return False
@@ -0,0 +1,182 @@
+import threading
+from datetime import datetime, timedelta
+from flask_mail import Message
+from sqlalchemy import or_, and_
+
+
+class EmailDispatcher:
+    """Delivers queued EmailOutbox rows outside the request.
+
+    Routes only insert outbox rows (in their own transaction) and call
+    wake(). Delivery happens in one of three modes, from MAIL_DISPATCH_MODE:
+
+    - 'thread' (default): a pool of MAIL_WORKERS background threads, no broker
+    - 'celery': a Celery task on the REDIS_URL broker drains the outbox;
+      run `celery -A main_app.celery worker`
+    - 'sync': deliver before returning; for scripts and debugging only
+
+    Each drain claims up to MAIL_BATCH_SIZE rows and sends them over one
+    SMTP connection. Failures are retried with exponential backoff until
+    MAIL_MAX_ATTEMPTS, after which the row is marked failed.
+    """
+
+    # A row stuck in 'sending' this long belongs to a crashed worker
+    STALE_LOCK = timedelta(minutes=10)
+
+    def __init__(self):
+        self.app = None
+        self.celery = None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['email_dispatcher'] = self
+        if app.config.get('MAIL_DISPATCH_MODE') == 'celery':
+            self.celery = self._make_celery(app)
+
+    def _make_celery(self, app):
+        from celery import Celery
+
+        celery = Celery(app.import_name, broker=app.config['REDIS_URL'])
+
+        @celery.task(name='email.drain_outbox', ignore_result=True)
+        def drain_outbox():
+            with app.app_context():
+                self.drain()
+
+        self._celery_task = drain_outbox
+        return celery
+
+    @property
+    def mode(self):
+        return self.app.config.get('MAIL_DISPATCH_MODE', 'thread')
+
+    def wake(self):
+        """Signal that new rows were committed to the outbox"""
+        if self.mode == 'sync':
+            self.drain()
+        elif self.mode == 'celery':
+            self._celery_task.delay()
+        else:
+            self._ensure_workers()
+            self._wakeup.set()
+
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.app.config.get('MAIL_WORKERS', 2)):
+                thread = threading.Thread(target=self._worker, name=f'email-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self):
+        poll_interval = self.app.config.get('MAIL_POLL_INTERVAL', 5)
+        while not self._stopping.is_set():
+            self._wakeup.wait(timeout=poll_interval)
+            self._wakeup.clear()
+            with self.app.app_context():
+                try:
+                    # Keep draining while full batches come back
+                    while self.drain() == self.app.config.get('MAIL_BATCH_SIZE', 20):
+                        pass
+                except Exception as e:
+                    print(f"Email worker error: {e}")
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping.clear()
+
+    def _claim_batch(self):
+        """Atomically move a batch of due rows to 'sending' and return them"""
+        from app import db
+        from app.models.outbox import EmailOutbox, OutboxStatus
+
+        now = datetime.utcnow()
+        candidates = db.session.query(EmailOutbox.id).filter(
+            or_(
+                and_(EmailOutbox.status == OutboxStatus.PENDING, EmailOutbox.next_attempt_at <= now),
+                and_(EmailOutbox.status == OutboxStatus.SENDING, EmailOutbox.locked_at < now - self.STALE_LOCK)
+            )
+        ).order_by(EmailOutbox.next_attempt_at).limit(self.app.config.get('MAIL_BATCH_SIZE', 20)).all()
+
+        claimed = []
+        for (outbox_id,) in candidates:
+            # Conditional UPDATE so two workers never claim the same row
+            updated = EmailOutbox.query.filter(
+                EmailOutbox.id == outbox_id,
+                or_(
+                    EmailOutbox.status == OutboxStatus.PENDING,
+                    and_(EmailOutbox.status == OutboxStatus.SENDING, EmailOutbox.locked_at < now - self.STALE_LOCK)
+                )
+            ).update({
+                EmailOutbox.status: OutboxStatus.SENDING,
+                EmailOutbox.locked_at: now,
+                EmailOutbox.attempts: EmailOutbox.attempts + 1
+            }, synchronize_session=False)
+            if updated:
+                claimed.append(outbox_id)
+        db.session.commit()
+
+        if not claimed:
+            return []
+        return EmailOutbox.query.filter(EmailOutbox.id.in_(claimed)).all()
+
+    def _mark_failed_attempt(self, row, error):
+        from app.models.outbox import OutboxStatus
+
+        row.last_error = str(error)[:1000]
+        row.locked_at = None
+        if row.attempts >= self.app.config.get('MAIL_MAX_ATTEMPTS', 5):
+            row.status = OutboxStatus.FAILED
+        else:
+            row.status = OutboxStatus.PENDING
+            row.next_attempt_at = datetime.utcnow() + timedelta(seconds=30 * 2 ** (row.attempts - 1))
+
+    def drain(self):
+        """Send one batch of due emails over a single SMTP connection.
+
+        Returns the number of rows claimed.
+        """
+        from app import db, mail
+        from app.models.outbox import OutboxStatus
+
+        batch = self._claim_batch()
+        if not batch:
+            return 0
+
+        try:
+            with mail.connect() as connection:
+                for row in batch:
+                    try:
+                        connection.send(Message(
+                            subject=row.subject,
+                            recipients=row.recipients,
+                            html=row.html,
+                            sender=row.sender or self.app.config.get('MAIL_DEFAULT_SENDER')
+                        ))
+                        row.status = OutboxStatus.SENT
+                        row.sent_at = datetime.utcnow()
+                        row.locked_at = None
+                        row.last_error = None
+                    except Exception as e:
+                        print(f"Error sending email {row.id}: {e}")
+                        self._mark_failed_attempt(row, e)
+        except Exception as e:
+            # Could not connect (or the connection dropped): retry everything not yet sent
+            print(f"SMTP connection error: {e}")
+            for row in batch:
+                if row.status == OutboxStatus.SENDING:
+                    self._mark_failed_attempt(row, e)
+
+        db.session.commit()
+        return len(batch)
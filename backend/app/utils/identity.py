@@ -0,0 +1,87 @@
+import functools
+import json
+
+from flask import current_app, jsonify
+from flask_jwt_extended import current_user
+
+from app import db, identity_cache
+from app.models.user import User, UserRole
+
+
+class CurrentUser:
+    """The authenticated user for one request, as returned by flask_jwt_extended.current_user.
+
+    `id`, `role` and `is_active` come from the access token's claims (or,
+    for tokens without them, the identity cache), so role checks cost no
+    query. `user` loads the full User row on first access;
+    when the identity was a cache miss, that row is already loaded, so a
+    request never looks the user up more than once.
+    """
+
+    def __init__(self, id, role, is_active, user=None):
+        self.id = id
+        self.role = role
+        self.is_active = is_active
+        self._user = user
+
+    @property
+    def user(self):
+        if self._user is None:
+            self._user = db.session.get(User, self.id)
+        return self._user
+
+
+def access_claims(user):
+    """Additional access-token claims that let requests authorize without loading the user"""
+    return {'role': user.role.value, 'active': bool(user.is_active)}
+
+
+def identity_from_token(jwt_payload):
+    """user_lookup_loader: trust the role claims of access tokens, look anything else up"""
+    user_id = jwt_payload[current_app.config['JWT_IDENTITY_CLAIM']]
+    if jwt_payload.get('type') == 'access' and 'role' in jwt_payload:
+        identity = CurrentUser(user_id, UserRole(jwt_payload['role']), jwt_payload.get('active', True))
+        return identity if identity.is_active else None
+    return load_identity(user_id)
+
+
+def load_identity(user_id):
+    """Resolve a JWT identity to a CurrentUser, or None if the user is missing or deactivated"""
+    cached = identity_cache.get(user_id)
+    if cached is not None:
+        flags = json.loads(cached)
+        identity = CurrentUser(user_id, UserRole(flags['role']), flags['is_active'])
+    else:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        identity = CurrentUser(user.id, user.role, user.is_active, user=user)
+        identity_cache.set(user_id, json.dumps({'role': user.role.value, 'is_active': user.is_active}))
+    return identity if identity.is_active else None
+
+
+def invalidate_identity(user_id):
+    """Drop a user's cached role and active flag; call after changing either"""
+    identity_cache.invalidate(user_id)
+
+
+def role_required(*roles, message=None):
+    """Decorator (after jwt_required) allowing only users with one of `roles`, checked from the token.
+
+    Others get a 403 with `message`, or a generic "<Role> access required".
+    """
+    if message is None:
+        names = ' or '.join(role.value.replace('_', ' ') for role in roles)
+        message = f'{names[0].upper()}{names[1:]} access required'
+
+    def decorator(f):
+        @functools.wraps(f)
+        def decorated_function(*args, **kwargs):
+            if current_user.role not in roles:
+                return jsonify({'error': message}), 403
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+admin_required = role_required(UserRole.ADMIN)
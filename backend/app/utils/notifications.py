@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from app import db, socketio
+from app.models.notification import Notification, NotificationPriority
+from app.utils.realtime import user_room
+
+
+def live_notifications(user_id):
+    """The user's notifications that are not deleted, filtered to match the partial indexes"""
+    return Notification.query.filter(Notification.user_id == user_id, Notification.is_deleted == db.false())
+
+
+def notify(user_id, notification_type, title, message, priority=NotificationPriority.MEDIUM, **fields):
+    """Add a notification for `user_id` to the caller's transaction.
+
+    `fields` are any other Notification columns or relationships (e.g.
+    related_application=application, resolved at flush). Call
+    push_notifications() with the result after committing.
+    """
+    notification = Notification(
+        user_id=user_id,
+        notification_type=notification_type,
+        title=title,
+        message=message,
+        priority=priority,
+        **fields
+    )
+    db.session.add(notification)
+    return notification
+
+
+def push_notifications(*notifications):
+    """Send committed notifications to their users' sockets; best effort, the API is the source of truth"""
+    for notification in notifications:
+        try:
+            socketio.emit('notification', notification.to_dict(), to=user_room(notification.user_id))
+        except Exception as e:
+            print(f"Failed to push notification {notification.id}: {e}")
+
+
+def mark_notifications_read(user_id, notification_ids=None):
+    """Mark `user_id`'s unread notifications (all, or just `notification_ids`) read in one UPDATE.
+
+    Runs in the caller's transaction and returns the ids marked read.
+    """
+    filters = [
+        Notification.user_id == user_id,
+        Notification.is_read == db.false(),
+        Notification.is_deleted == db.false()
+    ]
+    if notification_ids is not None:
+        if not notification_ids:
+            return []
+        filters.append(Notification.id.in_(notification_ids))
+    result = db.session.execute(
+        db.update(Notification).where(*filters).values(is_read=True, read_at=datetime.utcnow())
+        .returning(Notification.id),
+        execution_options={'synchronize_session': False}
+    )
+    return [row[0] for row in result]
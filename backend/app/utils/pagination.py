@@ -0,0 +1,106 @@
+import base64
+import json
+from datetime import datetime, date
+from sqlalchemy import and_, or_, literal
+
+# Sort keys for keyset pagination: (column attribute name, descending)
+JOB_LIST_KEYS = (('is_featured', True), ('created_at', True), ('id', True))
+NEWEST_FIRST_KEYS = (('created_at', True), ('id', True))
+APPLICATION_LIST_KEYS = (('applied_at', True), ('id', True))
+INBOX_KEYS = (('last_message_at', True), ('id', True))
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    """Encode the sort key values of the last row into an opaque cursor"""
+    payload = [value.isoformat() if isinstance(value, (datetime, date)) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, columns):
+    """Decode a cursor back into typed values for `columns`"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise InvalidCursor('Invalid cursor')
+
+    values = []
+    for value, column in zip(payload, columns):
+        python_type = column.type.python_type
+        try:
+            if value is not None and python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif value is not None and python_type is date:
+                value = date.fromisoformat(value)
+        except (ValueError, TypeError):
+            raise InvalidCursor('Invalid cursor')
+        # A tampered cursor must not reach the database with the wrong type (bool is an int in JSON terms)
+        if value is not None and (not isinstance(value, python_type) or
+                                  (isinstance(value, bool) and python_type is not bool)):
+            raise InvalidCursor('Invalid cursor')
+        values.append(value)
+    return values
+
+
+def _after(columns, directions, values):
+    """Row-value comparison `(k1, k2, ...) after (v1, v2, ...)` honouring per-key direction"""
+    # Bind as typed literals so booleans compare with < / > like any other key
+    values = [literal(value, column.type) for value, column in zip(values, columns)]
+    clauses = []
+    for i, (column, descending) in enumerate(zip(columns, directions)):
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+class KeysetPage:
+    def __init__(self, items, per_page, next_cursor, total=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.has_next = next_cursor is not None
+        self.total = total
+
+    def to_dict(self):
+        return {
+            'per_page': self.per_page,
+            'next_cursor': self.next_cursor,
+            'has_next': self.has_next,
+            'total': self.total
+        }
+
+
+def keyset_paginate(query, model, keys, cursor=None, per_page=10, include_total=False):
+    """Fetch one page after `cursor` using keyset (seek) pagination.
+
+    `keys` is a sequence of (attribute name, descending) tuples that must end
+    in a unique column. The query is ordered by those keys, so any ordering
+    already on the query is replaced. The total is only counted on request
+    because COUNT(*) is the part that grows with the table.
+    """
+    columns = [getattr(model, name) for name, _ in keys]
+    directions = [descending for _, descending in keys]
+
+    total = query.order_by(None).count() if include_total else None
+
+    if cursor:
+        query = query.filter(_after(columns, directions, decode_cursor(cursor, columns)))
+    query = query.order_by(None).order_by(
+        *[column.desc() if descending else column.asc() for column, descending in zip(columns, directions)]
+    )
+
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, name) for name, _ in keys])
+
+    return KeysetPage(items, per_page, next_cursor, total)
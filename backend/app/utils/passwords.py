@@ -0,0 +1,113 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+# Flask-Bcrypt's default BCRYPT_LOG_ROUNDS; calibration never picks a weaker cost
+BASELINE_ROUNDS = 12
+
+
+def _hash_password(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check_password(password, password_hash):
+    return bcrypt.checkpw(password, password_hash)
+
+
+def hash_rounds(password_hash):
+    """The cost factor stored in a bcrypt hash ($2b$<rounds>$...), or None if it is not one"""
+    parts = (password_hash or '').split('$')
+    return int(parts[2]) if len(parts) > 3 and parts[2].isdigit() else None
+
+
+def calibrate_rounds(target_ms, min_rounds=BASELINE_ROUNDS, max_rounds=14):
+    """Largest bcrypt cost whose hash time stays within target_ms on this machine.
+
+    Times one hash at min_rounds and doubles the estimate per extra round,
+    so calibration itself costs a single cheap hash.
+    """
+    started = time.perf_counter()
+    _hash_password(b'calibration', min_rounds)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+    return rounds
+
+
+class PasswordHasher:
+    """bcrypt hashing and verification with a calibrated cost.
+
+    By default hashes run inline: bcrypt releases the GIL, so concurrent
+    requests already hash in parallel and a pool would only add a round
+    trip while the request thread waits on it. PASSWORD_HASH_WORKERS > 0
+    opts in to a pool of that many processes, which caps how many cores a
+    burst of logins can take at the cost of queueing them.
+
+    The cost factor is PASSWORD_HASH_ROUNDS, or, when that is unset,
+    calibrated at startup so one hash takes about PASSWORD_HASH_TARGET_MS,
+    never below BCRYPT_LOG_ROUNDS or PASSWORD_HASH_MIN_ROUNDS. Hashes stored
+    with a lower cost report needs_rehash() and are upgraded on the next
+    successful login.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.rounds = BASELINE_ROUNDS
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        min_rounds = max(app.config.get('PASSWORD_HASH_MIN_ROUNDS', BASELINE_ROUNDS),
+                         app.config.get('BCRYPT_LOG_ROUNDS', BASELINE_ROUNDS))
+        max_rounds = max(app.config.get('PASSWORD_HASH_MAX_ROUNDS', 14), min_rounds)
+        if app.config.get('PASSWORD_HASH_ROUNDS'):
+            self.rounds = app.config['PASSWORD_HASH_ROUNDS']
+        elif multiprocessing.parent_process() is not None:
+            # A spawned pool worker re-importing the app; it is handed the cost with every job
+            self.rounds = min_rounds
+        else:
+            self.rounds = calibrate_rounds(app.config.get('PASSWORD_HASH_TARGET_MS', 250), min_rounds, max_rounds)
+        app.extensions['password_hasher'] = self
+
+    @property
+    def executor(self):
+        workers = self.app.config.get('PASSWORD_HASH_WORKERS', 0) if self.app else 0
+        if not workers:
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _run(self, fn, *args):
+        executor = self.executor
+        if executor is None:
+            return fn(*args)
+        return executor.submit(fn, *args).result()
+
+    def hash(self, password):
+        return self._run(_hash_password, password.encode('utf-8'), self.rounds)
+
+    def verify(self, password_hash, password):
+        if not password_hash:
+            return False
+        return self._run(_check_password, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash):
+        rounds = hash_rounds(password_hash)
+        return rounds is not None and rounds < self.rounds
@@ -0,0 +1,18 @@
+def user_room(user_id):
+    """SocketIO room every socket of `user_id` joins on connect"""
+    return f'user_{user_id}'
+
+
+def conversation_room(conversation_id):
+    """SocketIO room for sockets currently viewing a conversation (typing indicators)"""
+    return f'conversation_{conversation_id}'
+
+
+def socketio_message_queue(config):
+    """Message queue URL for SocketIO.init_app, or None to deliver in this process only.
+
+    SOCKETIO_BACKEND 'redis' relays emits through REDIS_URL, so an event
+    emitted by one gunicorn worker (or a CLI/background process) reaches
+    sockets connected to any other worker.
+    """
+    return config['REDIS_URL'] if config.get('SOCKETIO_BACKEND', 'memory') == 'redis' else None
@@ -0,0 +1,78 @@
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import func
+
+from app import db, analytics_buffer
+from app.models.analytics import DailyRollup, JobAnalytics
+from app.models.application import Application
+from app.models.job import Job
+from app.models.user import User
+from app.utils.counters import upsert_counters_many
+
+ROLLUP_COUNTERS = ('new_users', 'new_jobs', 'applications', 'job_views')
+
+
+def rollup_entry(counter, count=1, day=None):
+    """An analytics_buffer.record_batch entry adding `count` to today's rollup row"""
+    return (DailyRollup, {'date': day or datetime.utcnow().date()}, {counter: count}, None, None)
+
+
+def record_rollup(counter, count=1, day=None):
+    """Count an event in the daily rollups, after the event itself has been committed.
+
+    Best effort: a failure is logged rather than failing the request, and
+    the next `flask analytics rollup` run repairs the day.
+    """
+    try:
+        analytics_buffer.record_batch([rollup_entry(counter, count, day)])
+    except Exception as e:
+        print(f"Failed to record daily rollup {counter}: {e}")
+
+
+def _daily_counts(column, start, end):
+    """{date: count} for rows whose `column` falls in [start, end), via a range scan on the raw column"""
+    day = func.date(column)
+    rows = db.session.query(day, func.count()).filter(
+        column >= start, column < end
+    ).group_by(day).all()
+    return {
+        (datetime.strptime(value, '%Y-%m-%d').date() if isinstance(value, str) else value): total or 0
+        for value, total in rows
+    }
+
+
+def rebuild_rollups(start_date, end_date):
+    """Recompute the rollup rows for start_date..end_date (inclusive) from the source tables.
+
+    Overwrites the stored counters, so this also repairs drift from
+    deleted rows or events lost on a crash. Pending buffered events are
+    flushed first so they are not counted twice; events buffered by other
+    processes for these days still are, so prefer rebuilding closed days.
+    Returns the number of days written.
+    """
+    analytics_buffer.flush()
+
+    start = datetime.combine(start_date, time.min)
+    end = datetime.combine(end_date + timedelta(days=1), time.min)
+    counts = {
+        'new_users': _daily_counts(User.created_at, start, end),
+        'new_jobs': _daily_counts(Job.created_at, start, end),
+        'applications': _daily_counts(Application.applied_at, start, end),
+    }
+    views = db.session.query(JobAnalytics.date, func.sum(JobAnalytics.views)).filter(
+        JobAnalytics.date >= start_date, JobAnalytics.date <= end_date
+    ).group_by(JobAnalytics.date).all()
+    counts['job_views'] = {day: total or 0 for day, total in views}
+
+    rows = []
+    day = start_date
+    while day <= end_date:
+        rows.append(({'date': day}, {}, {counter: counts[counter].get(day, 0) for counter in ROLLUP_COUNTERS}))
+        day += timedelta(days=1)
+    try:
+        upsert_counters_many(DailyRollup, ['date'], rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return len(rows)
@@ -0,0 +1,146 @@
+import re
+from sqlalchemy import DDL, event, func, or_, literal_column, table, column
+
+_TOKEN_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# SQLite: FTS5 external-content table kept in sync with `jobs` by triggers.
+# `jobs` has a string primary key and its implicit rowid may be renumbered by
+# VACUUM, so the index is keyed on `search_rowid`, an integer column the
+# insert trigger numbers after the highest one in use.
+SQLITE_JOB_SEARCH_DDL = [
+    "ALTER TABLE jobs ADD COLUMN search_rowid INTEGER",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_jobs_search_rowid ON jobs (search_rowid)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+    "title, description, requirements, content='jobs', content_rowid='search_rowid', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN "
+    "UPDATE jobs SET search_rowid = (SELECT coalesce(max(search_rowid), 0) + 1 FROM jobs) "
+    "WHERE id = new.id; "
+    "INSERT INTO jobs_fts(rowid, title, description, requirements) "
+    "VALUES ((SELECT search_rowid FROM jobs WHERE id = new.id), new.title, new.description, new.requirements); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN "
+    "INSERT INTO jobs_fts(jobs_fts, rowid, title, description, requirements) "
+    "VALUES ('delete', old.search_rowid, old.title, old.description, old.requirements); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description, requirements ON jobs BEGIN "
+    "INSERT INTO jobs_fts(jobs_fts, rowid, title, description, requirements) "
+    "VALUES ('delete', old.search_rowid, old.title, old.description, old.requirements); "
+    "INSERT INTO jobs_fts(rowid, title, description, requirements) "
+    "VALUES (new.search_rowid, new.title, new.description, new.requirements); END",
+]
+
+SQLITE_JOB_SEARCH_DROP = [
+    "DROP TRIGGER IF EXISTS jobs_fts_au",
+    "DROP TRIGGER IF EXISTS jobs_fts_ad",
+    "DROP TRIGGER IF EXISTS jobs_fts_ai",
+    "DROP TABLE IF EXISTS jobs_fts",
+    "DROP INDEX IF EXISTS ix_jobs_search_rowid",
+    "ALTER TABLE jobs DROP COLUMN search_rowid",
+]
+
+# PostgreSQL: generated tsvector column (title weighted highest) with a GIN index
+POSTGRES_JOB_SEARCH_DDL = [
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(requirements, '')), 'C')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)",
+]
+
+POSTGRES_JOB_SEARCH_DROP = [
+    "DROP INDEX IF EXISTS ix_jobs_search_vector",
+    "ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector",
+]
+
+_jobs_fts = table('jobs_fts', column('rowid'), column('rank'))
+
+
+def install_job_search_ddl(jobs_table):
+    """Create the search index alongside the jobs table on db.create_all()"""
+    for statement in SQLITE_JOB_SEARCH_DDL:
+        event.listen(jobs_table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    for statement in POSTGRES_JOB_SEARCH_DDL:
+        event.listen(jobs_table, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+
+
+def parse_search_query(search):
+    """Parse a search box string into terms.
+
+    Returns a list of (words, is_prefix) tuples. Quoted text becomes a
+    phrase, a trailing '*' marks a prefix term, and the last bare word is
+    treated as a prefix so results update while the user is still typing.
+    """
+    terms = []
+    for phrase, bare in _TOKEN_PATTERN.findall(search or ''):
+        if phrase:
+            words = _WORD_PATTERN.findall(phrase.lower())
+            if words:
+                terms.append((words, False))
+        else:
+            is_prefix = bare.endswith('*')
+            for word in _WORD_PATTERN.findall(bare.lower()):
+                terms.append(([word], is_prefix))
+    if terms and len(terms[-1][0]) == 1 and not (search or '').rstrip().endswith('"'):
+        terms[-1] = (terms[-1][0], True)
+    return terms
+
+
+def to_fts5_query(terms):
+    """Build an FTS5 MATCH expression (implicit AND between terms)"""
+    parts = []
+    for words, is_prefix in terms:
+        part = '"' + ' '.join(words) + '"'
+        parts.append(part + '*' if is_prefix else part)
+    return ' '.join(parts)
+
+
+def to_tsquery(terms):
+    """Build a PostgreSQL to_tsquery expression (phrases use <->)"""
+    parts = []
+    for words, is_prefix in terms:
+        if is_prefix:
+            words = words[:-1] + [words[-1] + ':*']
+        parts.append(' <-> '.join(words))
+    return ' & '.join(parts)
+
+
+def apply_job_search(query, search, dialect_name):
+    """Filter a Job query by full-text search.
+
+    Returns (query, rank) where rank is an expression to order by (ascending)
+    or None when we fall back to ILIKE: on backends without a search index,
+    and for input with no searchable words (e.g. '!!!').
+    """
+    from app.models.job import Job
+
+    terms = parse_search_query(search)
+    if not terms:
+        if not (search or '').strip():
+            return query, None
+    elif dialect_name == 'sqlite':
+        query = query.join(_jobs_fts, _jobs_fts.c.rowid == literal_column('jobs.search_rowid')).filter(
+            literal_column('jobs_fts').op('MATCH')(to_fts5_query(terms))
+        )
+        # bm25() is lower-is-better
+        return query, _jobs_fts.c.rank
+    elif dialect_name == 'postgresql':
+        search_vector = literal_column('jobs.search_vector')
+        tsquery = func.to_tsquery('english', to_tsquery(terms))
+        query = query.filter(search_vector.op('@@')(tsquery))
+        # ts_rank is higher-is-better
+        return query, -func.ts_rank(search_vector, tsquery)
+
+    query = query.filter(
+        or_(
+            Job.title.ilike(f'%{search}%'),
+            Job.description.ilike(f'%{search}%'),
+            Job.requirements.ilike(f'%{search}%')
+        )
+    )
+    return query, None
+
+
+def rebuild_job_search_index(connection):
+    """Repopulate the search index from existing rows (SQLite only; PostgreSQL is generated)"""
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
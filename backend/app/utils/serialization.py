@@ -0,0 +1,31 @@
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+
+def serialization_options(model, parent=None):
+    """Build loader options for everything `model.to_dict()` serializes.
+
+    Each model lists the relationships its to_dict() embeds in
+    `serialize_relations`; nested models are followed recursively so one
+    call covers the whole tree (e.g. Application -> Job -> employer).
+    Many-to-one relations are joined into the main query, collections are
+    fetched with one extra SELECT ... IN per relation.
+    """
+    mapper = inspect(model)
+    options = []
+    for name in getattr(model, 'serialize_relations', ()):
+        relationship = mapper.relationships[name]
+        attribute = getattr(model, name)
+        strategy = 'selectinload' if relationship.uselist else 'joinedload'
+        if parent is None:
+            loader = selectinload(attribute) if relationship.uselist else joinedload(attribute)
+        else:
+            loader = getattr(parent, strategy)(attribute)
+        options.append(loader)
+        options.extend(serialization_options(relationship.mapper.class_, loader))
+    return options
+
+
+def with_serialization(query, model):
+    """Apply serialization_options() for `model` to a query"""
+    return query.options(*serialization_options(model))
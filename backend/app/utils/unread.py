@@ -0,0 +1,45 @@
+from sqlalchemy import func, select, update
+
+from app import db
+from app.models.message import Conversation, Message
+from app.models.user import User
+
+
+def _unread(*filters):
+    """Correlated COUNT of unread messages matching `filters`"""
+    return select(func.count(Message.id)).where(Message.is_read == False, *filters).scalar_subquery()
+
+
+def reconcile_unread_counts():
+    """Recompute the denormalised unread counters from the Message rows and commit.
+
+    Conversation.unread_count_p1/p2 and User.unread_messages_count are
+    maintained incrementally by send_message and Message.mark_read; this
+    repairs any drift (e.g. messages deleted or edited outside the app).
+    Only rows whose stored value is wrong are written. Returns
+    (conversations fixed, users fixed).
+    """
+    p1_unread = _unread(Message.conversation_id == Conversation.id, Message.recipient_id == Conversation.participant1_id)
+    p2_unread = _unread(
+        Message.conversation_id == Conversation.id,
+        Message.recipient_id == Conversation.participant2_id,
+        Conversation.participant1_id != Conversation.participant2_id
+    )
+    user_unread = _unread(Message.recipient_id == User.id)
+    try:
+        conversations = db.session.execute(
+            update(Conversation).where(
+                (Conversation.unread_count_p1 != p1_unread) | (Conversation.unread_count_p2 != p2_unread)
+            ).values(unread_count_p1=p1_unread, unread_count_p2=p2_unread)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        users = db.session.execute(
+            update(User).where(User.unread_messages_count != user_unread)
+            .values(unread_messages_count=user_unread)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return conversations, users
@@ -8,7 +8,8 @@ from flask_socketio import SocketIO
 from datetime import timedelta
 import os
 from dotenv import load_dotenv
-from app import db, bcrypt, migrate, jwt, mail, socketio
+from app import db, bcrypt, migrate, jwt, mail, socketio, job_cache, dashboard_cache, identity_cache, token_blocklist, password_hasher, email_dispatcher, cv_parse_queue, analytics_buffer
+from app.utils.realtime import socketio_message_queue
 
 # Load environment variables
 load_dotenv()
@@ -33,15 +34,82 @@ def create_app(config_name='development'):
     app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
     app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER')
     
+    # Email delivery: 'thread' (built-in workers), 'celery' (REDIS_URL broker) or 'sync'
+    app.config['MAIL_DISPATCH_MODE'] = os.getenv('MAIL_DISPATCH_MODE', 'thread')
+    app.config['MAIL_WORKERS'] = int(os.getenv('MAIL_WORKERS', 2))
+    app.config['MAIL_BATCH_SIZE'] = int(os.getenv('MAIL_BATCH_SIZE', 20))
+    app.config['MAIL_MAX_ATTEMPTS'] = int(os.getenv('MAIL_MAX_ATTEMPTS', 5))
+    
     # Redis configuration for Celery
     app.config['REDIS_URL'] = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
     
+    # Job detail response cache ('memory' per worker, or 'redis' shared via REDIS_URL)
+    app.config['JOB_CACHE_BACKEND'] = os.getenv('JOB_CACHE_BACKEND', 'memory')
+    app.config['JOB_CACHE_TTL'] = int(os.getenv('JOB_CACHE_TTL', 60))
+    app.config['JOB_CACHE_MAX_ENTRIES'] = int(os.getenv('JOB_CACHE_MAX_ENTRIES', 1024))
+    
+    # Admin dashboard snapshot, shared by all admins for a few seconds
+    app.config['DASHBOARD_CACHE_BACKEND'] = os.getenv('DASHBOARD_CACHE_BACKEND', 'memory')
+    app.config['DASHBOARD_CACHE_TTL'] = int(os.getenv('DASHBOARD_CACHE_TTL', 15))
+    app.config['DASHBOARD_CACHE_MAX_ENTRIES'] = 1
+    
+    # Cached role/active flags behind the JWT user lookup ('redis' shares invalidations between workers)
+    app.config['IDENTITY_CACHE_BACKEND'] = os.getenv('IDENTITY_CACHE_BACKEND', 'memory')
+    app.config['IDENTITY_CACHE_TTL'] = int(os.getenv('IDENTITY_CACHE_TTL', 30))
+    app.config['IDENTITY_CACHE_MAX_ENTRIES'] = int(os.getenv('IDENTITY_CACHE_MAX_ENTRIES', 10000))
+    
+    # Revoked tokens and users ('memory' per worker, or 'redis' shared via REDIS_URL)
+    app.config['TOKEN_BLOCKLIST_BACKEND'] = os.getenv('TOKEN_BLOCKLIST_BACKEND', 'memory')
+    
+    # Realtime events ('memory' within this process, or 'redis' relayed via REDIS_URL to every worker)
+    app.config['SOCKETIO_BACKEND'] = os.getenv('SOCKETIO_BACKEND', 'memory')
+    
+    # Password hashing: bcrypt inline (workers > 0 caps hashing at a process pool); the cost is
+    # calibrated to PASSWORD_HASH_TARGET_MS at startup unless PASSWORD_HASH_ROUNDS is set
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', 0))
+    app.config['PASSWORD_HASH_ROUNDS'] = int(os.getenv('PASSWORD_HASH_ROUNDS', 0)) or None
+    app.config['PASSWORD_HASH_TARGET_MS'] = int(os.getenv('PASSWORD_HASH_TARGET_MS', 250))
+    app.config['BCRYPT_LOG_ROUNDS'] = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    app.config['PASSWORD_HASH_MIN_ROUNDS'] = int(os.getenv('PASSWORD_HASH_MIN_ROUNDS', 12))
+    app.config['PASSWORD_HASH_MAX_ROUNDS'] = int(os.getenv('PASSWORD_HASH_MAX_ROUNDS', 14))
+    
+    # Background CV parsing
+    app.config['CV_PARSE_WORKERS'] = int(os.getenv('CV_PARSE_WORKERS', 2))
+    app.config['CV_PARSE_MAX_PENDING_PER_USER'] = int(os.getenv('CV_PARSE_MAX_PENDING_PER_USER', 3))
+    app.config['CV_PARSE_JOB_TIMEOUT'] = int(os.getenv('CV_PARSE_JOB_TIMEOUT', 600))
+    app.config['CV_PARSE_MAX_PAGES'] = int(os.getenv('CV_PARSE_MAX_PAGES', 20))
+    app.config['CV_PARSE_MAX_TEXT_BYTES'] = int(os.getenv('CV_PARSE_MAX_TEXT_BYTES', 256 * 1024))
+    app.config['CV_PARSE_SLOW_MS'] = int(os.getenv('CV_PARSE_SLOW_MS', 2000))
+    app.config['CV_PARSE_CACHE_BACKEND'] = os.getenv('CV_PARSE_CACHE_BACKEND', 'memory')
+    app.config['CV_PARSE_CACHE_TTL'] = int(os.getenv('CV_PARSE_CACHE_TTL', 86400))
+    app.config['CV_PARSE_CACHE_MAX_ENTRIES'] = int(os.getenv('CV_PARSE_CACHE_MAX_ENTRIES', 512))
+    app.config['CV_PARSE_CACHE_MAX_BYTES'] = int(os.getenv('CV_PARSE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    
+    # Write-behind analytics counters
+    app.config['ANALYTICS_BUFFER_ENABLED'] = os.getenv('ANALYTICS_BUFFER_ENABLED', 'True').lower() == 'true'
+    app.config['ANALYTICS_FLUSH_INTERVAL_MS'] = int(os.getenv('ANALYTICS_FLUSH_INTERVAL_MS', 1000))
+    app.config['ANALYTICS_FLUSH_MAX_EVENTS'] = int(os.getenv('ANALYTICS_FLUSH_MAX_EVENTS', 1000))
+    app.config['ANALYTICS_BUFFER_MAX_KEYS'] = int(os.getenv('ANALYTICS_BUFFER_MAX_KEYS', 10000))
+    app.config['ANALYTICS_MAX_BATCH_EVENTS'] = int(os.getenv('ANALYTICS_MAX_BATCH_EVENTS', 1000))
+    
+    # Batch CV ingestion (worker count defaults to the number of cores)
+    app.config['CV_BATCH_WORKERS'] = int(os.getenv('CV_BATCH_WORKERS', 0)) or None
+    app.config['CV_BATCH_MAX_FILE_BYTES'] = int(os.getenv('CV_BATCH_MAX_FILE_BYTES', 10 * 1024 * 1024))
+    
     # Initialize extensions with app
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
     bcrypt.init_app(app)
     mail.init_app(app)
+    job_cache.init_app(app)
+    dashboard_cache.init_app(app)
+    identity_cache.init_app(app)
+    token_blocklist.init_app(app)
+    password_hasher.init_app(app)
+    email_dispatcher.init_app(app)
+    cv_parse_queue.init_app(app)
+    analytics_buffer.init_app(app)
     
     # Comprehensive CORS configuration
     CORS(app, 
@@ -52,10 +120,10 @@ def create_app(config_name='development'):
          expose_headers=["Content-Type", "Authorization"],
          max_age=3600)
     
-    socketio.init_app(app, cors_allowed_origins="*")
+    socketio.init_app(app, cors_allowed_origins="*", message_queue=socketio_message_queue(app.config))
     
     # Import models to register them with SQLAlchemy
-    from app.models import User, UserProfile, Job, JobCategory, Application, Message, Conversation, Notification, Wishlist, Feedback, UserAnalytics, JobAnalytics
+    from app.models import User, UserProfile, Job, JobCategory, Application, Message, Conversation, Notification, Wishlist, Feedback, UserAnalytics, JobAnalytics, DailyRollup, EmailOutbox, CVParseJob
     
     # Import and register blueprints
     from app.auth.routes import auth_bp
@@ -65,6 +133,7 @@ def create_app(config_name='development'):
     from app.messages.routes import messages_bp
     from app.admin.routes import admin_bp
     from app.analytics.routes import analytics_bp
+    from app.notifications.routes import notifications_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(users_bp, url_prefix='/api/users')
@@ -73,11 +142,20 @@ def create_app(config_name='development'):
     app.register_blueprint(messages_bp, url_prefix='/api/messages')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
     app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
+    app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
     
     # Error handlers
     from app.utils.error_handlers import register_error_handlers
     register_error_handlers(app)
     
+    # CLI commands
+    from app.cli import register_commands
+    register_commands(app)
+    
+    # Realtime (SocketIO) event handlers
+    from app.messages.events import register_socketio_handlers
+    register_socketio_handlers(socketio)
+    
     # JWT error handlers
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
@@ -91,6 +169,24 @@ def create_app(config_name='development'):
     def missing_token_callback(error):
         return {'message': 'Token is missing'}, 401
     
+    @jwt.token_in_blocklist_loader
+    def token_in_blocklist_callback(jwt_header, jwt_payload):
+        return token_blocklist.is_revoked(jwt_payload)
+    
+    @jwt.revoked_token_loader
+    def revoked_token_callback(jwt_header, jwt_payload):
+        return {'message': 'Token has been revoked'}, 401
+    
+    # Resolve the token's identity once per request (see flask_jwt_extended.current_user)
+    @jwt.user_lookup_loader
+    def user_lookup_callback(jwt_header, jwt_payload):
+        from app.utils.identity import identity_from_token
+        return identity_from_token(jwt_payload)
+    
+    @jwt.user_lookup_error_loader
+    def user_lookup_error_callback(jwt_header, jwt_payload):
+        return {'message': 'User not found or inactive'}, 401
+    
     # Add OPTIONS handler for all routes
     @app.route('/', defaults={'path': ''}, methods=['OPTIONS'])
     @app.route('/<path:path>', methods=['OPTIONS'])
@@ -106,6 +202,9 @@ def create_app(config_name='development'):
 # Create app instance at module level for Flask CLI
 app = create_app()
 
+# Celery application for MAIL_DISPATCH_MODE=celery (`celery -A main_app.celery worker`)
+celery = email_dispatcher.celery
+
 @app.route('/uploads/<filename>', methods=['GET'])
 def uploaded_file(filename):
     uploads_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), 'uploads'))
@@ -0,0 +1,67 @@
+"""Key the SQLite job search index on a stable jobs.search_rowid
+
+Revision ID: 1c9e4a7d3b58
+Revises: f7a1c5e9d284
+Create Date: 2026-10-17 23:41:27.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.search import SQLITE_JOB_SEARCH_DDL, SQLITE_JOB_SEARCH_DROP, rebuild_job_search_index
+
+
+# revision identifiers, used by Alembic.
+revision = '1c9e4a7d3b58'
+down_revision = 'f7a1c5e9d284'
+branch_labels = None
+depends_on = None
+
+# The index keyed on jobs' implicit rowid, as created by b4e1c7d20f31
+ROWID_KEYED_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+    "title, description, requirements, content='jobs', content_rowid='rowid', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN "
+    "INSERT INTO jobs_fts(rowid, title, description, requirements) "
+    "VALUES (new.rowid, new.title, new.description, new.requirements); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN "
+    "INSERT INTO jobs_fts(jobs_fts, rowid, title, description, requirements) "
+    "VALUES ('delete', old.rowid, old.title, old.description, old.requirements); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description, requirements ON jobs BEGIN "
+    "INSERT INTO jobs_fts(jobs_fts, rowid, title, description, requirements) "
+    "VALUES ('delete', old.rowid, old.title, old.description, old.requirements); "
+    "INSERT INTO jobs_fts(rowid, title, description, requirements) "
+    "VALUES (new.rowid, new.title, new.description, new.requirements); END",
+]
+
+ROWID_KEYED_DROP = [
+    "DROP TRIGGER IF EXISTS jobs_fts_au",
+    "DROP TRIGGER IF EXISTS jobs_fts_ad",
+    "DROP TRIGGER IF EXISTS jobs_fts_ai",
+    "DROP TABLE IF EXISTS jobs_fts",
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    for statement in ROWID_KEYED_DROP:
+        op.execute(statement)
+    for statement in SQLITE_JOB_SEARCH_DDL:
+        op.execute(statement)
+    # Today's rowids are unique, so they seed the new keys
+    op.execute("UPDATE jobs SET search_rowid = rowid")
+    rebuild_job_search_index(bind)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    for statement in SQLITE_JOB_SEARCH_DROP:
+        op.execute(statement)
+    for statement in ROWID_KEYED_DDL:
+        op.execute(statement)
+    rebuild_job_search_index(bind)
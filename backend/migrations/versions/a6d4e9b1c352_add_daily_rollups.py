@@ -0,0 +1,70 @@
+"""Add daily rollup table for the admin analytics overview
+
+Revision ID: a6d4e9b1c352
+Revises: f3c6d1a8b925
+Create Date: 2026-10-17 17:48:12.527304
+
+"""
+from datetime import date, datetime
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d4e9b1c352'
+down_revision = 'f3c6d1a8b925'
+branch_labels = None
+depends_on = None
+
+# rollup column -> (source table, column grouped by day, SQL aggregate)
+SOURCES = {
+    'new_users': ('users', 'created_at', 'COUNT(*)'),
+    'new_jobs': ('jobs', 'created_at', 'COUNT(*)'),
+    'applications': ('applications', 'applied_at', 'COUNT(*)'),
+    'job_views': ('job_analytics', 'date', 'SUM(COALESCE(views, 0))'),
+}
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def upgrade():
+    daily_rollups = op.create_table('daily_rollups',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('new_users', sa.Integer(), nullable=True),
+    sa.Column('new_jobs', sa.Integer(), nullable=True),
+    sa.Column('applications', sa.Integer(), nullable=True),
+    sa.Column('job_views', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_daily_rollups_date', 'daily_rollups', ['date'], unique=True)
+
+    # Backfill from existing data so the overview is complete right after upgrading
+    bind = op.get_bind()
+    days = {}
+    for counter, (table, column, aggregate) in SOURCES.items():
+        rows = bind.execute(sa.text(
+            f'SELECT DATE({column}), {aggregate} FROM {table} WHERE {column} IS NOT NULL GROUP BY DATE({column})'
+        ))
+        for day, total in rows:
+            days.setdefault(_as_date(day), dict.fromkeys(SOURCES, 0))[counter] = int(total or 0)
+    if days:
+        now = datetime.utcnow()
+        op.bulk_insert(daily_rollups, [
+            {'id': str(uuid.uuid4()), 'date': day, 'created_at': now, **counters}
+            for day, counters in sorted(days.items())
+        ])
+
+
+def downgrade():
+    op.drop_index('ix_daily_rollups_date', table_name='daily_rollups')
+    op.drop_table('daily_rollups')
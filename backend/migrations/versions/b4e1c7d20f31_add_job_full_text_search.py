@@ -0,0 +1,65 @@
+"""Add full-text search index for jobs
+
+Revision ID: b4e1c7d20f31
+Revises: a73ad925cdda
+Create Date: 2026-10-17 09:12:41.503118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.search import POSTGRES_JOB_SEARCH_DDL, POSTGRES_JOB_SEARCH_DROP, rebuild_job_search_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e1c7d20f31'
+down_revision = 'a73ad925cdda'
+branch_labels = None
+depends_on = None
+
+# The SQLite index as first created, keyed on jobs' implicit rowid; 1c9e4a7d3b58
+# re-keys it on jobs.search_rowid (app.utils.search.SQLITE_JOB_SEARCH_DDL)
+SQLITE_JOB_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+    "title, description, requirements, content='jobs', content_rowid='rowid', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN "
+    "INSERT INTO jobs_fts(rowid, title, description, requirements) "
+    "VALUES (new.rowid, new.title, new.description, new.requirements); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN "
+    "INSERT INTO jobs_fts(jobs_fts, rowid, title, description, requirements) "
+    "VALUES ('delete', old.rowid, old.title, old.description, old.requirements); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description, requirements ON jobs BEGIN "
+    "INSERT INTO jobs_fts(jobs_fts, rowid, title, description, requirements) "
+    "VALUES ('delete', old.rowid, old.title, old.description, old.requirements); "
+    "INSERT INTO jobs_fts(rowid, title, description, requirements) "
+    "VALUES (new.rowid, new.title, new.description, new.requirements); END",
+]
+
+SQLITE_JOB_SEARCH_DROP = [
+    "DROP TRIGGER IF EXISTS jobs_fts_au",
+    "DROP TRIGGER IF EXISTS jobs_fts_ad",
+    "DROP TRIGGER IF EXISTS jobs_fts_ai",
+    "DROP TABLE IF EXISTS jobs_fts",
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for statement in SQLITE_JOB_SEARCH_DDL:
+            op.execute(statement)
+        rebuild_job_search_index(bind)
+    elif bind.dialect.name == 'postgresql':
+        for statement in POSTGRES_JOB_SEARCH_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for statement in SQLITE_JOB_SEARCH_DROP:
+            op.execute(statement)
+    elif bind.dialect.name == 'postgresql':
+        for statement in POSTGRES_JOB_SEARCH_DROP:
+            op.execute(statement)
@@ -0,0 +1,48 @@
+"""Add denormalised unread message counters to conversations and users
+
+Revision ID: c2e7f4a9b816
+Revises: a6d4e9b1c352
+Create Date: 2026-10-17 19:06:41.318520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2e7f4a9b816'
+down_revision = 'a6d4e9b1c352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('unread_count_p1', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('unread_count_p2', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('unread_messages_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing messages (same counts as `flask messages reconcile-unread`)
+    op.execute(
+        'UPDATE conversations SET '
+        'unread_count_p1 = (SELECT COUNT(*) FROM messages m WHERE m.conversation_id = conversations.id '
+        'AND m.recipient_id = conversations.participant1_id AND m.is_read = false), '
+        'unread_count_p2 = (SELECT COUNT(*) FROM messages m WHERE m.conversation_id = conversations.id '
+        'AND m.recipient_id = conversations.participant2_id AND m.is_read = false '
+        'AND conversations.participant1_id <> conversations.participant2_id)'
+    )
+    op.execute(
+        'UPDATE users SET unread_messages_count = '
+        '(SELECT COUNT(*) FROM messages m WHERE m.recipient_id = users.id AND m.is_read = false)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('unread_messages_count')
+
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_column('unread_count_p2')
+        batch_op.drop_column('unread_count_p1')
@@ -0,0 +1,41 @@
+"""Add composite indexes for hot query paths
+
+Revision ID: c81f3a9e5d02
+Revises: b4e1c7d20f31
+Create Date: 2026-10-17 10:03:18.274611
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81f3a9e5d02'
+down_revision = 'b4e1c7d20f31'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_jobs_listing', 'jobs', ['is_active', 'status', 'is_featured', 'created_at']),
+    ('ix_jobs_employer_created', 'jobs', ['employer_id', 'created_at']),
+    ('ix_applications_applicant_applied', 'applications', ['applicant_id', 'applied_at']),
+    ('ix_applications_job_applied', 'applications', ['job_id', 'applied_at']),
+    ('ix_applications_job_applicant', 'applications', ['job_id', 'applicant_id']),
+    ('ix_messages_recipient_unread', 'messages', ['recipient_id', 'is_read']),
+    ('ix_messages_conversation_created', 'messages', ['conversation_id', 'created_at']),
+    ('ix_conversations_participant1_last', 'conversations', ['participant1_id', 'last_message_at']),
+    ('ix_conversations_participant2_last', 'conversations', ['participant2_id', 'last_message_at']),
+    ('ix_user_analytics_user_date', 'user_analytics', ['user_id', 'date']),
+    ('ix_job_analytics_job_date', 'job_analytics', ['job_id', 'date']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
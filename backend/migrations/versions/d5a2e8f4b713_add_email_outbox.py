@@ -0,0 +1,41 @@
+"""Add email outbox table
+
+Revision ID: d5a2e8f4b713
+Revises: c81f3a9e5d02
+Create Date: 2026-10-17 11:40:52.118934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a2e8f4b713'
+down_revision = 'c81f3a9e5d02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('email_outbox',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('subject', sa.String(length=255), nullable=False),
+    sa.Column('recipients', sa.JSON(), nullable=False),
+    sa.Column('html', sa.Text(), nullable=False),
+    sa.Column('sender', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'SENDING', 'SENT', 'FAILED', name='outboxstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_email_outbox_status_next_attempt', 'email_outbox', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_email_outbox_status_next_attempt', table_name='email_outbox')
+    op.drop_table('email_outbox')
+    sa.Enum(name='outboxstatus').drop(op.get_bind(), checkfirst=True)
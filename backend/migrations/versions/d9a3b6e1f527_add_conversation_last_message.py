@@ -0,0 +1,35 @@
+"""Add conversations.last_message_id for the single-query inbox
+
+Revision ID: d9a3b6e1f527
+Revises: c2e7f4a9b816
+Create Date: 2026-10-17 19:52:17.604183
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a3b6e1f527'
+down_revision = 'c2e7f4a9b816'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_message_id', sa.String(length=36), nullable=True))
+        batch_op.create_foreign_key('fk_conversations_last_message_id', 'messages', ['last_message_id'], ['id'])
+
+    # Backfill with each conversation's newest message
+    op.execute(
+        'UPDATE conversations SET last_message_id = ('
+        'SELECT m.id FROM messages m WHERE m.conversation_id = conversations.id '
+        'ORDER BY m.created_at DESC, m.id DESC LIMIT 1)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_conversations_last_message_id', type_='foreignkey')
+        batch_op.drop_column('last_message_id')
@@ -0,0 +1,38 @@
+"""Add CV parse jobs table
+
+Revision ID: e2b9c4f7a160
+Revises: d5a2e8f4b713
+Create Date: 2026-10-17 13:05:27.640215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b9c4f7a160'
+down_revision = 'd5a2e8f4b713'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cv_parse_jobs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.Enum('QUEUED', 'COMPLETED', 'FAILED', name='cvparsestatus'), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_cv_parse_jobs_user_status', 'cv_parse_jobs', ['user_id', 'status'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_cv_parse_jobs_user_status', table_name='cv_parse_jobs')
+    op.drop_table('cv_parse_jobs')
+    sa.Enum(name='cvparsestatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,36 @@
+"""Add partial indexes for the notifications list and unread count
+
+Revision ID: e4b8d2f6a193
+Revises: d9a3b6e1f527
+Create Date: 2026-10-17 20:41:55.870264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b8d2f6a193'
+down_revision = 'd9a3b6e1f527'
+branch_labels = None
+depends_on = None
+
+# Index predicates as each dialect renders booleans (matching the model's db.false() filters)
+LIVE = {
+    'postgresql_where': sa.text('is_deleted = false'),
+    'sqlite_where': sa.text('is_deleted = 0'),
+}
+UNREAD = {
+    'postgresql_where': sa.text('is_read = false AND is_deleted = false'),
+    'sqlite_where': sa.text('is_read = 0 AND is_deleted = 0'),
+}
+
+
+def upgrade():
+    op.create_index('ix_notifications_user_created', 'notifications', ['user_id', 'created_at'], unique=False, **LIVE)
+    op.create_index('ix_notifications_user_unread', 'notifications', ['user_id'], unique=False, **UNREAD)
+
+
+def downgrade():
+    op.drop_index('ix_notifications_user_unread', table_name='notifications')
+    op.drop_index('ix_notifications_user_created', table_name='notifications')
@@ -0,0 +1,49 @@
+"""Make per-day analytics rows unique so counters can be upserted
+
+Revision ID: f3c6d1a8b925
+Revises: e2b9c4f7a160
+Create Date: 2026-10-17 15:22:41.306118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c6d1a8b925'
+down_revision = 'e2b9c4f7a160'
+branch_labels = None
+depends_on = None
+
+USER_COUNTERS = ['page_views', 'sessions', 'session_duration', 'jobs_viewed', 'jobs_applied', 'jobs_saved',
+                 'jobs_shared', 'profile_views', 'profile_edits', 'messages_sent', 'messages_received',
+                 'searches_performed']
+JOB_COUNTERS = ['views', 'unique_views', 'time_spent', 'applications', 'saves', 'shares', 'clicks']
+
+
+def _merge_duplicates(table, owner, counters):
+    """Fold concurrent duplicates of a (owner, date) row into the one with the lowest id"""
+    keep = f'(SELECT MIN(d.id) FROM {table} d WHERE d.{owner} = {table}.{owner} AND d.date = {table}.date)'
+    totals = ', '.join(
+        f'{column} = (SELECT SUM(COALESCE(d.{column}, 0)) FROM {table} d '
+        f'WHERE d.{owner} = {table}.{owner} AND d.date = {table}.date)'
+        for column in counters
+    )
+    op.execute(f'UPDATE {table} SET {totals} WHERE id = {keep}')
+    op.execute(f'DELETE FROM {table} WHERE id <> {keep}')
+
+
+def upgrade():
+    _merge_duplicates('user_analytics', 'user_id', USER_COUNTERS)
+    _merge_duplicates('job_analytics', 'job_id', JOB_COUNTERS)
+    op.drop_index('ix_user_analytics_user_date', table_name='user_analytics')
+    op.create_index('ix_user_analytics_user_date', 'user_analytics', ['user_id', 'date'], unique=True)
+    op.drop_index('ix_job_analytics_job_date', table_name='job_analytics')
+    op.create_index('ix_job_analytics_job_date', 'job_analytics', ['job_id', 'date'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_job_analytics_job_date', table_name='job_analytics')
+    op.create_index('ix_job_analytics_job_date', 'job_analytics', ['job_id', 'date'], unique=False)
+    op.drop_index('ix_user_analytics_user_date', table_name='user_analytics')
+    op.create_index('ix_user_analytics_user_date', 'user_analytics', ['user_id', 'date'], unique=False)
@@ -0,0 +1,24 @@
+"""Index users.last_login for the admin overview's active-user count
+
+Revision ID: f7a1c5e9d284
+Revises: e4b8d2f6a193
+Create Date: 2026-10-17 22:14:09.402718
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7a1c5e9d284'
+down_revision = 'e4b8d2f6a193'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_users_last_login', 'users', ['last_login'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_users_last_login', table_name='users')
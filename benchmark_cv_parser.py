@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark CV section extraction over a corpus of synthetic CVs.
+
+Compares the legacy per-section scan (one full pass over the document for
+each of the six sections) with the single-pass extractor in
+app.utils.cv_parser, and reports documents/second for both.
+
+    python benchmark_cv_parser.py [--docs 2000] [--seed 42]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_path = Path(__file__).parent / 'backend'
+sys.path.insert(0, str(backend_path))
+
+from app.utils.cv_parser import _parse_cv_text, _split_sections  # noqa: E402
+from test_cv_section_extractor import corpus, legacy_sections  # noqa: E402
+
+
+def _throughput(func, docs, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for doc in docs:
+            func(doc)
+        best = min(best, time.perf_counter() - started)
+    return len(docs) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    docs = corpus(args.docs, args.seed)
+    mismatches = sum(1 for doc in docs if legacy_sections(doc) != _split_sections(doc))
+    print(f"Corpus: {len(docs)} synthetic CVs, {sum(map(len, docs)) / len(docs):.0f} chars on average, "
+          f"{mismatches} section mismatches")
+
+    before = _throughput(legacy_sections, docs)
+    after = _throughput(_split_sections, docs)
+    print(f"Section extraction: {before:10.0f} docs/s before, {after:10.0f} docs/s after ({after / before:.1f}x)")
+    print(f"Full _parse_cv_text:                          {_throughput(_parse_cv_text, docs):10.0f} docs/s")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -453,6 +453,31 @@ export default function ProfilePage() {
     });
   };
 
+  // Queue a CV for parsing, then poll the job until the server has finished with it
+  const parseCV = async (formData: FormData) => {
+    const token = localStorage.getItem('access_token');
+    const headers = token ? { Authorization: `Bearer ${token}` } : undefined;
+    const response = await fetch("http://localhost:5000/api/users/profile/parse-cv", {
+      method: "POST",
+      body: formData,
+      headers,
+    });
+    let data = await response.json();
+    if (!response.ok) return data;
+
+    const deadline = Date.now() + 2 * 60 * 1000;
+    while (data.status === "queued" && Date.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      const poll = await fetch(`http://localhost:5000/api/users/profile/parse-cv/${data.job_id}`, { headers });
+      data = await poll.json();
+      if (!poll.ok) return data;
+    }
+    if (data.status === "queued") {
+      return { error: "CV parsing is taking longer than expected. Please try again later." };
+    }
+    return data;
+  };
+
   // Handle CV upload and parsing
   const handleCVUpload = async (e: React.ChangeEvent<HTMLInputElement>) => {
     const file = e.target.files?.[0];
@@ -463,16 +488,9 @@ export default function ProfilePage() {
     formData.append("cv", file);
     
     try {
-      const token = localStorage.getItem('access_token');
-      const response = await fetch("http://localhost:5000/api/users/profile/parse-cv", {
-        method: "POST",
-        body: formData,
-        headers: token ? { Authorization: `Bearer ${token}` } : undefined,
-      });
-      
-      const data = await response.json();
+      const data = await parseCV(formData);
       
-      if (response.ok && data.extracted) {
+      if (data.status === "completed" && data.extracted) {
         // Automatically fill profile with parsed data
         fillProfileFromCV(data.extracted);
         
@@ -509,14 +527,8 @@ export default function ProfilePage() {
     const formData = new FormData();
     formData.append("cv", file);
     try {
-      const token = localStorage.getItem('access_token');
-      const response = await fetch("http://localhost:5000/api/users/profile/parse-cv", {
-        method: "POST",
-        body: formData,
-        headers: token ? { Authorization: `Bearer ${token}` } : undefined,
-      });
-      const data = await response.json();
-      if (data.extracted) {
+      const data = await parseCV(formData);
+      if (data.status === "completed" && data.extracted) {
         setJobSeekerForm((prev) => ({
           ...prev,
           ...data.extracted,
@@ -0,0 +1,205 @@
+"""
+Shared fixtures for the backend tests: a fresh app and database per test, seed data and query counting
+"""
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the backend directory to Python path
+backend_path = Path(__file__).parent / 'backend'
+sys.path.insert(0, str(backend_path))
+
+# Environment every test app is created with; a module adds to it by overriding `app_env`
+TEST_ENV = {
+    'MAIL_SERVER': '127.0.0.1',
+    'MAIL_PORT': '1',
+    'PASSWORD_HASH_ROUNDS': '4',
+    'PASSWORD_HASH_WORKERS': '0',
+    'BCRYPT_LOG_ROUNDS': '4',
+}
+
+
+@pytest.fixture(autouse=True)
+def _push_request_context():
+    """Replace pytest-flask's test-wide request context.
+
+    Its context would be reused by every request, so all of them would share
+    one database session; requests here get their own context, as in production.
+    """
+    yield
+
+
+@pytest.fixture
+def app_env():
+    """Extra environment variables for create_app()"""
+    return {}
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch, app_env):
+    """An application on its own SQLite file with the schema created"""
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    for key, value in {**TEST_ENV, **app_env}.items():
+        monkeypatch.setenv(key, str(value))
+
+    from main_app import create_app
+    from app import db, password_hasher, email_dispatcher, cv_parse_queue, analytics_buffer
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+    yield app
+
+    email_dispatcher.stop()
+    analytics_buffer.stop()
+    password_hasher.shutdown()
+    cv_parse_queue.shutdown()
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def db(app):
+    from app import db
+
+    return db
+
+
+@pytest.fixture
+def count_queries(app, db):
+    """Context manager collecting the SQL statements executed while it is open"""
+    from sqlalchemy import event
+
+    with app.app_context():
+        engine = db.engine
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+    return counter
+
+
+@pytest.fixture
+def seed(app, db):
+    """Create an employer, a job seeker, 10 jobs, 10 applications and a conversation"""
+    from app.models import User, UserProfile, Job, JobCategory, Application, Message, Conversation
+    from app.models.user import UserRole
+    from app.models.job import JobType, ExperienceLevel
+
+    with app.app_context():
+        employer = User(email='employer@example.com', role=UserRole.EMPLOYER, password_hash='x')
+        seeker = User(email='seeker@example.com', role=UserRole.JOB_SEEKER, password_hash='x')
+        db.session.add_all([employer, seeker])
+        db.session.flush()
+        db.session.add_all([
+            UserProfile(user_id=employer.id, username='employer', company_name='Acme'),
+            UserProfile(user_id=seeker.id, username='seeker'),
+        ])
+
+        categories = [JobCategory(name=f'Category {i}') for i in range(3)]
+        db.session.add_all(categories)
+        db.session.flush()
+
+        jobs = [
+            Job(employer_id=employer.id, category_id=categories[i % 3].id, title=f'Job {i}',
+                description='Description', job_type=JobType.FULL_TIME, experience_level=ExperienceLevel.MID)
+            for i in range(10)
+        ]
+        db.session.add_all(jobs)
+        db.session.flush()
+
+        applications = [
+            Application(job_id=job.id, applicant_id=seeker.id, status_updated_by=employer.id)
+            for job in jobs
+        ]
+        db.session.add_all(applications)
+
+        # Inserted directly, so the denormalised unread counters start at zero
+        conversation = Conversation(participant1_id=employer.id, participant2_id=seeker.id, job_id=jobs[0].id)
+        db.session.add(conversation)
+        db.session.flush()
+        db.session.add_all([
+            Message(conversation_id=conversation.id, sender_id=employer.id, recipient_id=seeker.id, content=f'Hi {i}')
+            for i in range(10)
+        ])
+        db.session.commit()
+
+        return SimpleNamespace(
+            employer_id=employer.id,
+            seeker_id=seeker.id,
+            job_id=jobs[0].id,
+            category_id=jobs[0].category_id,
+            application_id=applications[0].id,
+            conversation_id=conversation.id,
+        )
+
+
+@pytest.fixture
+def admin_id(app, db):
+    """Create an admin account and return its id"""
+    from app.models import User
+    from app.models.user import UserRole
+
+    with app.app_context():
+        admin = User(email='admin@example.com', role=UserRole.ADMIN, password_hash='x')
+        db.session.add(admin)
+        db.session.commit()
+        return admin.id
+
+
+@pytest.fixture
+def auth_headers(app):
+    """Build an Authorization header carrying a fresh access token for a user id"""
+    from flask_jwt_extended import create_access_token
+
+    def headers(user_id, **kwargs):
+        with app.app_context():
+            return {'Authorization': f'Bearer {create_access_token(identity=user_id, **kwargs)}'}
+
+    return headers
+
+
+@pytest.fixture
+def register(client):
+    """Sign up through the API and return Authorization headers from logging in"""
+    def register_and_login(email, role='job_seeker', password='password123'):
+        client.post('/api/auth/register', json={
+            'email': email, 'password': password, 'username': email.split('@')[0], 'role': role
+        })
+        response = client.post('/api/auth/login', json={'email': email, 'password': password})
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+    return register_and_login
+
+
+@pytest.fixture
+def user_lookups():
+    """Filter counted statements down to SELECTs against the users table"""
+    def lookups(statements, by_id=False):
+        return [s for s in statements if 'FROM users' in s and (not by_id or 'users.id = ?' in s)]
+
+    return lookups
+
+
+@pytest.fixture
+def socket_events():
+    """Payloads a SocketIO test client received for one event name"""
+    def events(socket, name):
+        return [event['args'][0] for event in socket.get_received() if event['name'] == name]
+
+    return events
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test the admin dashboard: conditional-aggregate statistics and the cached snapshot
+"""
+
+import pytest
+
+
+@pytest.fixture
+def app_env():
+    return {'DASHBOARD_CACHE_TTL': 60}
+
+
+def test_admin_dashboard(app, db, client, seed, admin_id, auth_headers, count_queries):
+    """Dashboard counters come from one statement and are shared between requests for a short TTL"""
+    from app.models import Job, Feedback
+    from app.models.feedback import FeedbackType, FeedbackPriority
+
+    with app.app_context():
+        Job.query.filter_by(id=seed.job_id).update({'is_featured': True})
+        db.session.add_all([
+            Feedback(user_id=seed.seeker_id, feedback_type=FeedbackType.BUG_REPORT, subject='Broken',
+                     message='It broke', priority=FeedbackPriority.URGENT),
+            Feedback(user_id=seed.seeker_id, feedback_type=FeedbackType.COMPLIMENT, subject='Nice', message='Thanks'),
+        ])
+        db.session.commit()
+    headers = auth_headers(admin_id)
+
+    with count_queries() as statements:
+        response = client.get('/api/admin/dashboard', headers=headers)
+    assert response.status_code == 200
+    stats = response.get_json()['statistics']
+    assert stats['users'] == {'total': 3, 'job_seekers': 1, 'employers': 1, 'new_today': 3}
+    assert stats['jobs'] == {'total': 10, 'active': 10, 'featured': 1, 'new_today': 10}
+    assert stats['applications'] == {'total': 10, 'today': 10}
+    assert stats['feedback'] == {'open': 2, 'urgent': 1}
+    assert len([s for s in statements if 'count(' in s.lower()]) == 1
+    assert len(response.get_json()['recent_activity']['jobs']) == 5
+
+    # Warm: the snapshot and the admin's cached identity mean no SQL at all
+    with count_queries() as statements:
+        response = client.get('/api/admin/dashboard', headers=headers)
+    assert response.status_code == 200 and len(statements) == 0
+
+    # Admin changes to a counter drop the snapshot
+    assert client.put(f'/api/admin/jobs/{seed.job_id}/toggle-featured', headers=headers).status_code == 200
+    stats = client.get('/api/admin/dashboard', headers=headers).get_json()['statistics']
+    assert stats['jobs']['featured'] == 0
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test the batch analytics endpoint: mixed user and job events applied in one transaction
+"""
+
+import pytest
+
+
+@pytest.fixture
+def app_env():
+    # The batch endpoint bypasses the buffer, so its rows are visible straight away
+    return {'ANALYTICS_BUFFER_ENABLED': 'True', 'ANALYTICS_FLUSH_INTERVAL_MS': 60000}
+
+
+def test_analytics_batch(app, db, client, auth_headers, count_queries):
+    """One request of mixed events becomes one UPSERT per table (daily rollup included) and a single commit"""
+    from app import analytics_buffer
+    from app.models import User, UserAnalytics, JobAnalytics
+    from app.models.user import UserRole
+
+    with app.app_context():
+        seeker = User(email='seeker@example.com', role=UserRole.JOB_SEEKER, password_hash='x')
+        db.session.add(seeker)
+        db.session.commit()
+        seeker_id = seeker.id
+    headers = auth_headers(seeker_id)
+
+    events = (
+        [{'type': 'page_view'}] * 30 + [{'type': 'job_view'}] * 10 +
+        [{'type': 'view', 'job_id': f'job-{i % 3}'} for i in range(45)] +
+        [{'type': 'save', 'job_id': 'job-0'}] * 5 +
+        [{'type': 'bogus'}, 'not an event', {'type': 'teleport', 'job_id': 'job-0'}]
+    )
+    with count_queries() as statements:
+        response = client.post('/api/analytics/track/batch', json={'events': events, 'browser': 'Safari'},
+                               headers=headers)
+    body = response.get_json()
+    writes = [s for s in statements if s.lstrip().upper().startswith('INSERT')]
+    assert response.status_code == 200
+    assert body['accepted'] == 90 and body['rejected'] == [90, 91, 92]
+    assert len(writes) == 3 and len(statements) <= 4
+    assert analytics_buffer.metrics()['pending_events'] == 0
+
+    with app.app_context():
+        user_row = UserAnalytics.query.filter_by(user_id=seeker_id).one()
+        assert user_row.page_views == 30 and user_row.jobs_viewed == 10 and user_row.browser == 'Safari'
+        jobs = {row.job_id: row for row in JobAnalytics.query.all()}
+        assert {job_id: row.views for job_id, row in jobs.items()} == {'job-0': 15, 'job-1': 15, 'job-2': 15}
+        assert jobs['job-0'].saves == 5 and abs(jobs['job-0'].view_to_save_rate - 5 * 100.0 / 15) < 1e-6
+
+
+def test_analytics_batch_validation(client):
+    """Without a login only job events count; an empty batch is refused"""
+    response = client.post('/api/analytics/track/batch',
+                           json={'events': [{'type': 'page_view'}, {'type': 'click', 'job_id': 'job-1'}]})
+    assert response.status_code == 200 and response.get_json()['rejected'] == [0]
+    assert client.post('/api/analytics/track/batch', json={'events': []}).status_code == 400
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the write-behind analytics buffer: coalescing, bulk flushes, backpressure and metrics
+"""
+
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def app_env():
+    # Long interval and high threshold so only the test triggers flushes at first
+    return {
+        'ANALYTICS_BUFFER_ENABLED': 'True',
+        'ANALYTICS_FLUSH_INTERVAL_MS': 60000,
+        'ANALYTICS_FLUSH_MAX_EVENTS': 100000,
+    }
+
+
+def test_analytics_buffer(app, db, admin_id, auth_headers):
+    """Tracking events are held in memory and written by a few bulk upserts"""
+    from app import analytics_buffer
+    from app.models import User, UserAnalytics, JobAnalytics, DailyRollup
+    from app.models.user import UserRole
+
+    with app.app_context():
+        seeker = User(email='seeker@example.com', role=UserRole.JOB_SEEKER, password_hash='x')
+        db.session.add(seeker)
+        db.session.commit()
+        seeker_id = seeker.id
+    admin_headers = auth_headers(admin_id)
+    seeker_headers = auth_headers(seeker_id)
+    # Flush metrics are process-wide, so compare against what earlier tests left
+    events_before = analytics_buffer.metrics()['events_flushed']
+
+    def send(i):
+        client = app.test_client()
+        for n in range(50):
+            client.post('/api/analytics/track', json={'type': 'page_view', 'browser': 'Firefox'}, headers=seeker_headers)
+            client.post('/api/analytics/jobs/job-1/track', json={'type': 'application' if n % 10 == 0 else 'view'})
+
+    threads = [threading.Thread(target=send, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = analytics_buffer.metrics()
+    # Job views also count towards today's site-wide rollup row
+    assert metrics['pending_events'] == 580 and metrics['pending_rows'] == 3
+    with app.app_context():
+        assert UserAnalytics.query.count() == 0
+
+    assert analytics_buffer.flush() == 3
+    with app.app_context():
+        user_row = UserAnalytics.query.filter_by(user_id=seeker_id).one()
+        job_row = JobAnalytics.query.filter_by(job_id='job-1').one()
+        assert user_row.page_views == 200 and user_row.browser == 'Firefox'
+        assert job_row.views == 180 and job_row.applications == 20
+        assert abs(job_row.view_to_application_rate - 20 * 100.0 / 180) < 1e-6
+        assert DailyRollup.query.one().job_views == 180
+
+    # The event threshold wakes the background flusher
+    app.config['ANALYTICS_FLUSH_MAX_EVENTS'] = 10
+    client = app.test_client()
+    for _ in range(10):
+        client.post('/api/analytics/jobs/job-1/track', json={'type': 'view'})
+    deadline = time.time() + 5
+    while analytics_buffer.metrics()['pending_events'] and time.time() < deadline:
+        time.sleep(0.05)
+    with app.app_context():
+        assert JobAnalytics.query.filter_by(job_id='job-1').one().views == 190
+
+    # A full buffer flushes inline instead of growing or dropping events
+    app.config['ANALYTICS_FLUSH_MAX_EVENTS'] = 100000
+    app.config['ANALYTICS_BUFFER_MAX_KEYS'] = 2
+    for job in ('job-2', 'job-3', 'job-4'):
+        client.post(f'/api/analytics/jobs/{job}/track', json={'type': 'save'})
+    assert analytics_buffer.metrics()['inline_flushes'] == 1
+    analytics_buffer.stop()
+    with app.app_context():
+        assert JobAnalytics.query.filter(JobAnalytics.job_id.in_(['job-2', 'job-3', 'job-4'])).count() == 3
+
+    response = client.get('/api/analytics/buffer', headers=admin_headers)
+    buffer = response.get_json()['buffer']
+    assert response.status_code == 200
+    assert buffer['flushes'] >= 3 and buffer['events_flushed'] - events_before == 603 and buffer['max_flush_ms'] > 0
+    assert client.get('/api/analytics/buffer', headers=seeker_headers).status_code == 403
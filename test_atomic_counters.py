@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test that counters stay exact when many requests update them concurrently
+"""
+
+import threading
+
+import pytest
+
+THREADS = 8
+EVENTS_PER_THREAD = 25
+
+
+@pytest.fixture
+def app_env():
+    # Exercise the direct UPSERT path; the write-behind buffer has its own test
+    return {'MAIL_DISPATCH_MODE': 'sync', 'ANALYTICS_BUFFER_ENABLED': 'False'}
+
+
+def _hammer(worker):
+    """Run worker(i) on THREADS threads at once and re-raise the first failure"""
+    barrier = threading.Barrier(THREADS)
+    errors = []
+
+    def run(i):
+        try:
+            barrier.wait()
+            worker(i)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def test_atomic_counters(app, db, auth_headers):
+    """Concurrent applies and tracking events lose no increments and create one row per day"""
+    from app.models import User, UserProfile, Job, JobCategory, UserAnalytics, JobAnalytics
+    from app.models.user import UserRole
+    from app.models.job import JobType, ExperienceLevel
+
+    with app.app_context():
+        employer = User(email='employer@example.com', role=UserRole.EMPLOYER, password_hash='x')
+        seekers = [User(email=f'seeker{i}@example.com', role=UserRole.JOB_SEEKER, password_hash='x') for i in range(THREADS)]
+        db.session.add_all([employer, *seekers])
+        db.session.flush()
+        category = JobCategory(name='Engineering')
+        db.session.add_all([UserProfile(user_id=employer.id, username='employer', company_name='Acme'), category])
+        db.session.flush()
+        job = Job(employer_id=employer.id, category_id=category.id, title='Engineer', description='Build things',
+                  job_type=JobType.FULL_TIME, experience_level=ExperienceLevel.MID)
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+        seeker_ids = [s.id for s in seekers]
+    seeker_headers = [auth_headers(seeker_id) for seeker_id in seeker_ids]
+
+    # Every seeker applies at the same moment
+    def apply(i):
+        response = app.test_client().post('/api/applications/', json={'job_id': job_id}, headers=seeker_headers[i])
+        assert response.status_code == 201, response.get_json()
+    _hammer(apply)
+
+    # One user's tracking events arrive from many tabs at once
+    def track_user(i):
+        client = app.test_client()
+        for _ in range(EVENTS_PER_THREAD):
+            response = client.post('/api/analytics/track', json={'type': 'job_view', 'browser': 'Firefox'},
+                                   headers=seeker_headers[0])
+            assert response.status_code == 200, response.get_json()
+    _hammer(track_user)
+
+    # Anonymous job views, with every fifth event an application
+    def track_job(i):
+        client = app.test_client()
+        for n in range(EVENTS_PER_THREAD):
+            event = 'application' if n % 5 == 0 else 'view'
+            response = client.post(f'/api/analytics/jobs/{job_id}/track', json={'type': event})
+            assert response.status_code == 200, response.get_json()
+    _hammer(track_job)
+
+    total = THREADS * EVENTS_PER_THREAD
+    with app.app_context():
+        current_applications = db.session.get(Job, job_id).current_applications
+        assert current_applications == THREADS
+
+        user_rows = UserAnalytics.query.filter_by(user_id=seeker_ids[0]).all()
+        assert len(user_rows) == 1
+        assert user_rows[0].jobs_viewed == total
+        assert user_rows[0].browser == 'Firefox'
+
+        job_rows = JobAnalytics.query.filter_by(job_id=job_id).all()
+        row = job_rows[0]
+        assert len(job_rows) == 1
+        assert row.views == total * 4 // 5
+        assert row.applications == total // 5
+        assert abs(row.view_to_application_rate - row.applications * 100.0 / row.views) < 1e-6
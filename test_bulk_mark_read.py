@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test bulk mark-as-read: one UPDATE per page or high-water mark, one read receipt per batch
+"""
+
+from datetime import datetime, timedelta
+
+
+def _updates(statements):
+    return [s for s in statements if s.lstrip().upper().startswith('UPDATE MESSAGES')]
+
+
+def test_bulk_mark_read(app, db, client, seed, auth_headers, count_queries, monkeypatch):
+    """Opening a conversation marks only the returned page as read, in a single statement"""
+    from app import socketio
+    from app.models import Message
+
+    employer_id, seeker_id = seed.employer_id, seed.seeker_id
+    with app.app_context():
+        # 60 more unread messages with distinct timestamps, oldest first
+        started = datetime.utcnow() - timedelta(hours=1)
+        db.session.add_all([
+            Message(conversation_id=seed.conversation_id, sender_id=employer_id, recipient_id=seeker_id,
+                    content=f'Update {i}', created_at=started + timedelta(seconds=i))
+            for i in range(60)
+        ])
+        db.session.commit()
+    employer_headers = auth_headers(employer_id)
+    seeker_headers = auth_headers(seeker_id)
+
+    def unread():
+        with app.app_context():
+            return Message.query.filter_by(recipient_id=seeker_id, is_read=False).count()
+
+    emitted = []
+    monkeypatch.setattr(socketio, 'emit', lambda event, data=None, **kwargs: emitted.append((event, data, kwargs)))
+    url = f'/api/messages/conversations/{seed.conversation_id}/messages'
+
+    # The sender opening the conversation marks nothing
+    response = client.get(url, headers=employer_headers)
+    assert response.status_code == 200
+    assert unread() == 70 and not emitted
+
+    # The recipient's first page: one UPDATE for 20 messages, one receipt
+    with count_queries() as statements:
+        response = client.get(f'{url}?per_page=20', headers=seeker_headers)
+    assert response.status_code == 200
+    assert len(_updates(statements)) == 1, statements
+    page = response.get_json()['messages']
+    assert len(page) == 20 and all(msg['is_read'] and msg['read_at'] for msg in page)
+    assert unread() == 50
+    assert len(emitted) == 1
+    event, data, kwargs = emitted[0]
+    assert event == 'messages_read' and kwargs['to'] == [f'user_{employer_id}', f'user_{seeker_id}']
+    assert data['reader_id'] == seeker_id
+    assert sorted(data['message_ids']) == sorted(msg['id'] for msg in page)
+
+    # Re-reading an already-read page writes nothing
+    emitted.clear()
+    with count_queries() as statements:
+        client.get(f'{url}?per_page=20', headers=seeker_headers)
+    assert not _updates(statements) and not emitted
+
+    # High-water mark: everything up to 'Update 29' is read in one statement
+    with app.app_context():
+        mark_id = Message.query.filter_by(content='Update 29').first().id
+    with count_queries() as statements:
+        response = client.put(f'/api/messages/messages/{mark_id}/read', headers=seeker_headers)
+    assert response.status_code == 200
+    assert len(_updates(statements)) == 1
+    assert response.get_json()['marked_read'] == 30
+    assert unread() == 20 and len(emitted) == 1
+    with app.app_context():
+        assert not Message.query.filter_by(content='Update 30').first().is_read
+
+    # Only the recipient may move the high-water mark
+    response = client.put(f'/api/messages/messages/{mark_id}/read', headers=employer_headers)
+    assert response.status_code == 403
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test batch CV ingestion: multipart files and zip archives stream back as NDJSON
+"""
+
+import io
+import json
+import zipfile
+
+import pytest
+
+
+@pytest.fixture
+def app_env():
+    return {'MAIL_DISPATCH_MODE': 'sync', 'CV_BATCH_WORKERS': 2, 'CV_BATCH_MAX_FILE_BYTES': 4096}
+
+
+def _cv(name):
+    return f"{name}\n{name.lower().replace(' ', '.')}@example.com\nSkills\nPython, SQL\nEducation\nBachelor of Science\n".encode()
+
+
+def test_cv_batch(client, register):
+    """Employers get one NDJSON line per file; job seekers are refused"""
+    from app.utils.cv_batch import shared_executor
+
+    employer = register('recruiter@example.com', 'employer')
+    seeker = register('seeker@example.com')
+
+    bundle = io.BytesIO()
+    with zipfile.ZipFile(bundle, 'w') as archive:
+        for i in range(3):
+            archive.writestr(f'zipped/cv{i}.txt', _cv(f'Zip Person {i}'))
+    bundle.seek(0)
+
+    files = [
+        (io.BytesIO(_cv('Alice Smith')), 'alice.txt'),
+        (io.BytesIO(_cv('Bob Jones')), 'bob.txt'),
+        (bundle, 'bundle.zip'),
+        (io.BytesIO(b'not a cv'), 'notes.md'),
+        (io.BytesIO(b'this is not a zip archive'), 'broken.zip'),
+        (io.BytesIO(_cv('Huge Applicant') * 100), 'huge.txt'),
+    ]
+    response = client.post('/api/users/cv/batch-parse', data={'cvs': files}, headers=employer,
+                           content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+
+    # Corrupt archives and oversized uploads fail per file without ending the stream
+    results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    by_file = {result['file']: result for result in results}
+    assert len(results) == 8
+    assert by_file['notes.md']['status'] == 'skipped'
+    assert by_file['broken.zip']['status'] == 'failed'
+    assert by_file['broken.zip']['error'].startswith('Invalid zip archive')
+    assert by_file['huge.txt'] == {'file': 'huge.txt', 'status': 'failed', 'error': 'File too large'}
+    assert by_file['alice.txt']['extracted']['username'] == 'Alice Smith'
+    assert by_file['bundle.zip:zipped/cv2.txt']['extracted']['username'] == 'Zip Person 2'
+    assert sum(r['status'] == 'completed' for r in results) == 5
+
+    # A second batch runs on the same pool instead of starting another
+    pool = shared_executor()
+    again = client.post('/api/users/cv/batch-parse', data={'cvs': [(io.BytesIO(_cv('Carol King')), 'carol.txt')]},
+                        headers=employer, content_type='multipart/form-data')
+    assert json.loads(again.get_data(as_text=True))['status'] == 'completed'
+    assert shared_executor() is pool and pool._max_workers == 2
+
+    refused = client.post('/api/users/cv/batch-parse', data={'cvs': [(io.BytesIO(_cv('Eve')), 'eve.txt')]},
+                          headers=seeker, content_type='multipart/form-data')
+    assert refused.status_code == 403
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test streaming CV text extraction: lazy PDF pages, early stop and page/byte budgets
+"""
+
+from app.utils import cv_parser
+
+FIRST_PAGE = """Jane Doe
+jane@example.com
+(555) 123-4567
+Summary
+Backend engineer
+Skills
+Python, SQL
+Experience
+2019 Engineer at Acme
+Education
+Bachelor of Science
+Languages
+English, German
+Certifications
+AWS Certified Developer
+Projects
+"""
+
+
+class FakePDF:
+    """Stands in for iter_pdf_pages and counts how many pages were pulled"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.pulled = 0
+
+    def __call__(self, file_path, stats):
+        stats.total_pages = len(self.pages)
+        for page in self.pages:
+            self.pulled += 1
+            yield page + "\n"
+
+
+def test_stops_once_sections_complete(monkeypatch):
+    """A long PDF stops after the page that completes every section, with the same parse"""
+    pages = [FIRST_PAGE] + ['Lots of project detail. ' * 40] * 499
+    fake = FakePDF(pages)
+    monkeypatch.setattr(cv_parser, 'iter_pdf_pages', fake)
+    result = cv_parser.parse_cv_file('cv.pdf', 'pdf')
+    assert result['extraction']['stop_reason'] == 'sections_complete'
+    assert fake.pulled == 1
+    assert result['raw_data'] == cv_parser._parse_cv_text(''.join(page + "\n" for page in pages))
+
+
+def test_page_budget(monkeypatch):
+    """Without section headers, reading stops at max_pages and every page is timed"""
+    fake = FakePDF(['No headers here, just text.'] * 500)
+    monkeypatch.setattr(cv_parser, 'iter_pdf_pages', fake)
+    stats = cv_parser.ExtractionStats()
+    cv_parser.extract_text('cv.pdf', 'pdf', max_pages=20, stats=stats)
+    assert stats.stop_reason == 'max_pages'
+    assert stats.pages_read == 20 and fake.pulled == 20
+    assert len(stats.page_timings_ms) == 20
+
+
+def test_text_byte_budget(tmp_path):
+    """A huge text file is cut at max_text_bytes without reading it all"""
+    path = tmp_path / 'cv.txt'
+    path.write_text('é' * 1_000_000, encoding='utf-8')
+    stats = cv_parser.ExtractionStats()
+    text = cv_parser.extract_text(str(path), 'txt', max_text_bytes=4097, stats=stats)
+    assert stats.stop_reason == 'max_text_bytes'
+    assert len(text.encode('utf-8')) == stats.text_bytes == 4096
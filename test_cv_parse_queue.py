@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test background CV parsing: the upload returns a job id immediately and the result is polled;
+re-uploading the same file is answered from the content-hash cache
+"""
+
+import io
+import time
+
+import pytest
+
+SAMPLE_CV = b"""John Doe
+john@example.com
++1 555 123 4567
+Senior Software Engineer
+
+Skills
+Python, Flask, SQL
+
+Experience
+Acme Corp 2018 - 2023 Software Engineer
+
+Education
+Bachelor of Science in Computer Science
+"""
+
+
+@pytest.fixture
+def app_env():
+    return {'MAIL_DISPATCH_MODE': 'sync', 'CV_PARSE_MAX_PENDING_PER_USER': 1}
+
+
+def _upload(client, headers):
+    return client.post('/api/users/profile/parse-cv', data={'cv': (io.BytesIO(SAMPLE_CV), 'cv.txt')},
+                       headers=headers, content_type='multipart/form-data')
+
+
+def test_cv_parse_queue(client, register):
+    """parse-cv returns 202 with a job id and the status endpoint eventually has the extracted data"""
+    headers = register('cv@example.com')
+    other_headers = register('other@example.com')
+
+    response = _upload(client, headers)
+    assert response.status_code == 202, response.get_json()
+    job_id = response.get_json()['job_id']
+
+    # Only one pending job per user in this configuration
+    assert _upload(client, headers).status_code == 429
+
+    # Other users cannot see the job
+    assert client.get(f'/api/users/profile/parse-cv/{job_id}', headers=other_headers).status_code == 404
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        data = client.get(f'/api/users/profile/parse-cv/{job_id}', headers=headers).get_json()
+        if data['status'] != 'queued':
+            break
+        time.sleep(0.2)
+    assert data['status'] == 'completed', data
+    assert 'Python' in data['extracted']['skills']
+
+    # The same bytes again are served from the content-hash cache
+    response = _upload(client, headers)
+    cached = response.get_json()
+    assert response.status_code == 200 and cached['status'] == 'completed'
+    assert cached['extracted'] == data['extracted']
+    assert cached['job_id'] != job_id
+
+
+class _RefusingPool:
+    def submit(self, *args, **kwargs):
+        raise RuntimeError('cannot schedule new futures after shutdown')
+
+
+def test_submit_failure_marks_job_failed(app, client, register, monkeypatch):
+    """A job the pool refuses is failed, not left queued against the pending limit"""
+    from app import cv_parse_queue
+    from app.models.cv_parse_job import CVParseJob, CVParseStatus
+
+    headers = register('cv@example.com')
+    with monkeypatch.context() as patch:
+        patch.setattr(cv_parse_queue, '_executor', _RefusingPool())
+        response = _upload(client, headers)
+    assert response.status_code == 500
+
+    with app.app_context():
+        job = CVParseJob.query.one()
+        assert job.status == CVParseStatus.FAILED and 'after shutdown' in job.error and job.finished_at
+
+    # The failed job does not use up the single pending slot
+    assert _upload(client, headers).status_code == 202
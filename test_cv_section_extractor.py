@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test that the single-pass CV section extractor matches the legacy per-section scan
+"""
+
+import random
+
+from app.utils.cv_parser import _split_sections
+
+EDGE_CASES = [
+    '',
+    'Skills',
+    'Jane Doe\nSkills\nPython, SQL',
+    'Jane Doe\r\nLanguage Skills\r\nEnglish, French\r\nExperience\r\n2020 Engineer at Acme',
+    'Summary\nExperience\nEducation\nSkills',
+    'About\nI have broad experience and education in many technology stacks and fields of study\nProjects\nA thing',
+    'İSTANBUL\nSkills\nPython\nEducation\nİstanbul Technical University',
+    'Objective\nBuild things\n\n  WORK EXPERIENCE  \nAcme\nCertificates\nAWS',
+]
+
+LEGACY_SECTIONS = {
+    'skills': ['skills', 'technical skills', 'competencies', 'technologies'],
+    'summary': ['summary', 'objective', 'profile', 'about'],
+    'experience': ['experience', 'work experience', 'employment history', 'professional experience'],
+    'education': ['education', 'academic background', 'qualifications'],
+    'languages': ['languages', 'language skills'],
+    'certifications': ['certifications', 'certificates', 'accreditations'],
+}
+
+HEADERS = {
+    'summary': ['Summary', 'PROFESSIONAL SUMMARY', 'Objective', 'Profile', 'About Me'],
+    'skills': ['Skills', 'Technical Skills', 'Core Competencies', 'Technologies'],
+    'experience': ['Experience', 'Work Experience', 'Employment History', 'Professional Experience'],
+    'education': ['Education', 'Academic Background', 'Qualifications'],
+    'languages': ['Languages', 'Language Skills'],
+    'certifications': ['Certifications', 'Certificates', 'Accreditations'],
+    'projects': ['Projects', 'Side Projects'],
+    'achievements': ['Achievements', 'Key Achievements'],
+}
+
+WORDS = ('design build lead team deliver scalable service platform customer data pipeline cloud '
+         'api python java react sql kubernetes improved reduced latency revenue growth mentor').split()
+SKILLS = ['Python', 'Flask', 'SQL', 'React', 'Docker', 'AWS', 'Java', 'Go', 'Kubernetes', 'TypeScript']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries']
+
+
+def legacy_extract_section(text, keywords):
+    """The original implementation: re-splits and re-scans the document per section"""
+    lines = text.split('\n')
+    section_start = -1
+    section_end = -1
+
+    for i, line in enumerate(lines):
+        line_lower = line.lower().strip()
+        if any(keyword in line_lower for keyword in keywords):
+            section_start = i + 1
+            break
+
+    if section_start == -1:
+        return None
+
+    major_sections = ['experience', 'education', 'skills', 'languages', 'certifications', 'projects', 'achievements']
+    for i in range(section_start, len(lines)):
+        line_lower = lines[i].lower().strip()
+        if any(section in line_lower for section in major_sections) and len(line_lower) < 50:
+            section_end = i
+            break
+
+    if section_end == -1:
+        section_end = len(lines)
+
+    return '\n'.join(lines[section_start:section_end]).strip()
+
+
+def legacy_sections(text):
+    return {section: legacy_extract_section(text, keywords) for section, keywords in LEGACY_SECTIONS.items()}
+
+
+def _sentence(rng, low=6, high=18):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize() + '.'
+
+
+def synthetic_cv(rng):
+    """A plausible CV: contact block, then sections in random order with noisy body text"""
+    lines = [
+        f"{rng.choice(['Jane', 'John', 'Alex', 'Sam'])} {rng.choice(['Doe', 'Smith', 'Lee', 'Garcia'])}",
+        f"jane.doe{rng.randint(1, 99)}@example.com",
+        f"+1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        '',
+    ]
+    sections = rng.sample(list(HEADERS), rng.randint(3, len(HEADERS)))
+    for section in sections:
+        lines.append(rng.choice(HEADERS[section]))
+        if section in ('skills', 'languages'):
+            lines.append(', '.join(rng.sample(SKILLS, rng.randint(3, 8))))
+        elif section == 'experience':
+            for _ in range(rng.randint(1, 4)):
+                lines.append(f"{rng.randint(2005, 2024)} Software Engineer at {rng.choice(COMPANIES)}")
+                lines.extend(_sentence(rng) for _ in range(rng.randint(2, 6)))
+        elif section == 'education':
+            lines.append(f"Bachelor of Science, University of {rng.choice(['Somewhere', 'Elsewhere'])}")
+            lines.append(str(rng.randint(1995, 2020)))
+        else:
+            lines.extend(_sentence(rng) for _ in range(rng.randint(1, 5)))
+        # Long prose that mentions a header keyword must not end a section
+        if rng.random() < 0.3:
+            lines.append('Hands-on experience with education technology and engineering skills across many teams.')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def corpus(count, seed=42):
+    rng = random.Random(seed)
+    return [synthetic_cv(rng) for _ in range(count)]
+
+
+def test_sections_match_legacy():
+    """Every section is sliced exactly as the legacy implementation did"""
+    documents = EDGE_CASES + corpus(500, seed=7)
+    for text in documents:
+        assert _split_sections(text) == legacy_sections(text), text
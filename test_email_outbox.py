@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test background email delivery through the outbox against a local SMTP stand-in
+"""
+
+import socketserver
+import threading
+import time
+
+import pytest
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """Minimal SMTP sink: accepts every message and records it"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, delay=0.0):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.delay = delay
+        self.messages = []
+        self.connections = 0
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self._reply('220 localhost test SMTP')
+        recipients = []
+        while True:
+            line = self.rfile.readline().decode(errors='replace').strip()
+            if not line:
+                return
+            command = line.split(' ', 1)[0].upper()
+            if command in ('EHLO', 'HELO'):
+                self._reply('250 localhost')
+            elif command == 'RCPT':
+                recipients.append(line.split(':', 1)[1].strip(' <>'))
+                self._reply('250 OK')
+            elif command == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                while True:
+                    chunk = self.rfile.readline().decode(errors='replace')
+                    if chunk.rstrip('\r\n') == '.':
+                        break
+                    data.append(chunk)
+                time.sleep(self.server.delay)
+                self.server.messages.append((recipients, ''.join(data)))
+                recipients = []
+                self._reply('250 OK queued')
+            elif command == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('250 OK')
+
+
+def _wait_for(predicate, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def smtp():
+    # Slow SMTP server: a synchronous send would add ~1s to the request
+    with LocalSMTPServer(delay=1.0) as server:
+        yield server
+
+
+@pytest.fixture
+def app_env(smtp):
+    return {
+        'MAIL_PORT': smtp.server_address[1],
+        'MAIL_USE_TLS': 'False',
+        'MAIL_USERNAME': '',
+        'MAIL_PASSWORD': '',
+        'MAIL_DEFAULT_SENDER': 'noreply@example.com',
+        'MAIL_DISPATCH_MODE': 'thread',
+    }
+
+
+def test_email_outbox(app, db, client, smtp):
+    """Registration returns without waiting on SMTP and the mail is delivered in the background"""
+    from app import email_dispatcher
+    from app.models import EmailOutbox
+    from app.models.outbox import OutboxStatus
+
+    started = time.time()
+    response = client.post('/api/auth/register', json={
+        'email': 'outbox@example.com',
+        'password': 'password123',
+        'username': 'outbox',
+        'role': 'job_seeker'
+    })
+    assert response.status_code == 201
+    assert time.time() - started < 0.9, "Request latency includes SMTP time"
+
+    assert _wait_for(lambda: len(smtp.messages) == 1), "Email was not delivered"
+    email_dispatcher.stop()
+
+    # A batch of queued emails goes out over a single SMTP connection
+    smtp.delay = 0
+    connections_before = smtp.connections
+    with app.app_context():
+        for i in range(5):
+            db.session.add(EmailOutbox(subject=f'Batch {i}', recipients=[f'user{i}@example.com'], html='<p>Hi</p>'))
+        db.session.commit()
+        email_dispatcher.drain()
+        assert EmailOutbox.query.filter_by(status=OutboxStatus.SENT).count() == 6
+    assert smtp.connections - connections_before == 1
+
+    # With the SMTP server gone, delivery fails and is rescheduled
+    smtp.shutdown()
+    smtp.server_close()
+    with app.app_context():
+        db.session.add(EmailOutbox(subject='Retry', recipients=['retry@example.com'], html='<p>Hi</p>'))
+        db.session.commit()
+        email_dispatcher.drain()
+        row = EmailOutbox.query.filter_by(subject='Retry').first()
+        assert row.status == OutboxStatus.PENDING and row.attempts == 1 and row.last_error
+
+
+def test_interview_invitation_commits_with_status(app, client, seed, auth_headers, monkeypatch):
+    """The invitation is queued in the status change's transaction: both are saved or neither is"""
+    from app.models import Application, EmailOutbox
+    from app.models.application import ApplicationStatus
+    from app.utils import email
+
+    url = f'/api/applications/{seed.application_id}/status'
+    headers = auth_headers(seed.employer_id)
+
+    def invitations():
+        with app.app_context():
+            return EmailOutbox.query.filter(EmailOutbox.subject.startswith('Interview Invitation')).count()
+
+    def application():
+        with app.app_context():
+            return Application.query.get(seed.application_id)
+
+    def broken_template(*args, **kwargs):
+        raise RuntimeError('template failed')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(email, 'render_template_string', broken_template)
+        response = client.put(url, json={'status': 'interview_scheduled', 'interview_date': '2026-11-02T10:00:00'},
+                              headers=headers)
+    assert response.status_code == 500
+    assert invitations() == 0
+    assert application().status != ApplicationStatus.INTERVIEW_SCHEDULED and application().interview_date is None
+
+    response = client.put(url, json={'status': 'interview_scheduled', 'interview_date': '2026-11-02T10:00:00'},
+                          headers=headers)
+    assert response.status_code == 200
+    assert invitations() == 1
+    assert application().status == ApplicationStatus.INTERVIEW_SCHEDULED and application().interview_date
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Test the cached JWT identity lookup: at most one user query per request, invalidated on deactivation
+"""
+
+
+def test_identity_cache(client, seed, admin_id, auth_headers, count_queries, user_lookups):
+    """Authenticated requests resolve the user from the identity cache and see deactivation at once"""
+    employer_id = seed.employer_id
+    admin_headers = auth_headers(admin_id)
+    employer_headers = auth_headers(employer_id)
+    seeker_headers = auth_headers(seed.seeker_id)
+
+    # Cold: one lookup, reused by routes that need the full user
+    with count_queries() as statements:
+        response = client.get('/api/auth/me', headers=seeker_headers)
+    assert response.status_code == 200 and response.get_json()['id'] == seed.seeker_id
+    assert len(user_lookups(statements, by_id=True)) == 1
+
+    # Warm: role checks are answered from the cache
+    with count_queries() as statements:
+        response = client.get('/api/jobs/employer', headers=employer_headers)
+    with count_queries() as warm_statements:
+        response = client.get('/api/jobs/employer', headers=employer_headers)
+    assert response.status_code == 200
+    assert len(user_lookups(statements, by_id=True)) == 1 and len(user_lookups(warm_statements, by_id=True)) == 0
+
+    # admin_required no longer loads the admin a second time
+    with count_queries() as statements:
+        response = client.get('/api/analytics/buffer', headers=admin_headers)
+    assert response.status_code == 200 and len(user_lookups(statements, by_id=True)) == 1
+    with count_queries() as statements:
+        client.get('/api/analytics/buffer', headers=admin_headers)
+    assert len(statements) == 0
+
+    # Roles are still enforced from the cache
+    assert client.get('/api/jobs/employer', headers=seeker_headers).status_code == 403
+
+    # Deactivation drops the cached identity, so the next request is refused
+    response = client.put(f'/api/admin/users/{employer_id}/toggle-status', headers=admin_headers)
+    assert response.status_code == 200
+    response = client.get('/api/jobs/employer', headers=employer_headers)
+    assert response.status_code == 401
+    client.put(f'/api/admin/users/{employer_id}/toggle-status', headers=admin_headers)
+    assert client.get('/api/jobs/employer', headers=employer_headers).status_code == 200
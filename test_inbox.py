@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test the paginated inbox: one query per page with participant summary, last message and unread count
+"""
+
+
+def test_inbox(app, db, client, seed, auth_headers, count_queries):
+    """The inbox is constant-query regardless of page size or conversation count"""
+    from app.models import User, UserProfile, Conversation
+    from app.models.user import UserRole
+    from app.utils.identity import access_claims
+
+    seeker_id, job_id = seed.seeker_id, seed.job_id
+    with app.app_context():
+        seeker_headers = auth_headers(seeker_id, additional_claims=access_claims(db.session.get(User, seeker_id)))
+        # 24 more employers, each in a conversation with the seeker
+        employer_headers = {}
+        conversation_ids = []
+        for i in range(24):
+            employer = User(email=f'recruiter{i}@example.com', role=UserRole.EMPLOYER, password_hash='x')
+            db.session.add(employer)
+            db.session.flush()
+            db.session.add(UserProfile(user_id=employer.id, username=f'recruiter{i}', company_name=f'Company {i}'))
+            conversation = Conversation(participant1_id=employer.id, participant2_id=seeker_id,
+                                        job_id=job_id if i % 2 else None)
+            db.session.add(conversation)
+            db.session.flush()
+            conversation_ids.append(conversation.id)
+            employer_headers[conversation.id] = auth_headers(employer.id, additional_claims=access_claims(employer))
+        db.session.commit()
+
+    # Each recruiter sends i + 1 messages, so later conversations are newer and have more unread
+    for i, conversation_id in enumerate(conversation_ids):
+        for n in range(i + 1):
+            content = f'Message {n} ' + 'x' * 200 if n == i else f'Message {n}'
+            response = client.post(f'/api/messages/conversations/{conversation_id}/messages',
+                                   json={'content': content}, headers=employer_headers[conversation_id])
+            assert response.status_code == 201
+
+    # One SELECT per page, whatever the page size
+    counts = {}
+    for per_page in (5, 20):
+        with count_queries() as statements:
+            response = client.get(f'/api/messages/inbox?per_page={per_page}', headers=seeker_headers)
+        assert response.status_code == 200
+        assert len(response.get_json()['conversations']) == per_page
+        counts[per_page] = len(statements)
+    assert counts[5] == counts[20] == 1, counts
+
+    # Newest activity first, with the other participant, snippet and unread count
+    first = client.get('/api/messages/inbox?per_page=5', headers=seeker_headers).get_json()['conversations'][0]
+    assert first['id'] == conversation_ids[-1]
+    assert first['unread_count'] == 24
+    assert first['other_participant']['username'] == 'recruiter23'
+    assert first['other_participant']['company_name'] == 'Company 23'
+    assert first['other_participant']['role'] == 'employer'
+    assert first['job'] == {'id': job_id, 'title': 'Job 0'}
+    assert first['last_message']['snippet'].startswith('Message 23 x')
+    assert len(first['last_message']['snippet']) == 120
+
+    # Walking the cursor visits every active conversation exactly once
+    seen = []
+    cursor = ''
+    while True:
+        response = client.get(f'/api/messages/inbox?per_page=10&include_total=true&cursor={cursor}', headers=seeker_headers)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['pagination']['total'] == 25
+        seen.extend(entry['id'] for entry in body['conversations'])
+        if not body['pagination']['has_next']:
+            break
+        cursor = body['pagination']['next_cursor']
+    assert len(seen) == len(set(seen)) == 25
+    assert seen[:24] == conversation_ids[::-1] and seen[24] == seed.conversation_id
+
+    # Reading a conversation clears its unread count in the inbox
+    client.get(f'/api/messages/conversations/{conversation_ids[-1]}/messages', headers=seeker_headers)
+    first = client.get('/api/messages/inbox?per_page=1', headers=seeker_headers).get_json()['conversations'][0]
+    assert first['unread_count'] == 0
+
+    # Deleted conversations drop out of the inbox
+    client.delete(f'/api/messages/conversations/{conversation_ids[-1]}', headers=seeker_headers)
+    body = client.get('/api/messages/inbox?include_total=true', headers=seeker_headers).get_json()
+    assert body['pagination']['total'] == 24 and conversation_ids[-1] not in [e['id'] for e in body['conversations']]
+    assert client.get('/api/messages/inbox?cursor=bogus', headers=seeker_headers).status_code == 400
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the job detail cache: warm hits skip the database, ETags revalidate, writes invalidate
+"""
+
+
+def test_job_cache(app, db, client, seed, admin_id, auth_headers, count_queries):
+    """GET /api/jobs/<id> is served from cache until something it embeds changes"""
+    from app.models import Job, User
+    from app.models.job import JobType, ExperienceLevel
+
+    employer_id, job_id, category_id = seed.employer_id, seed.job_id, seed.category_id
+    with app.app_context():
+        # A posting without applications, so it can be deleted
+        spare = Job(employer_id=employer_id, category_id=category_id, title='Spare Job', description='Description',
+                    job_type=JobType.FULL_TIME, experience_level=ExperienceLevel.MID)
+        db.session.add(spare)
+        db.session.get(User, employer_id).set_password('password123')
+        db.session.commit()
+        spare_id = spare.id
+    employer_headers = auth_headers(employer_id)
+    admin_headers = auth_headers(admin_id)
+
+    url = f'/api/jobs/{job_id}'
+
+    def fetch(url=url):
+        with count_queries() as statements:
+            response = client.get(url)
+        assert response.status_code == 200
+        return response, len(statements)
+
+    # First read fills the cache, the second touches no table
+    response, cold = fetch()
+    assert cold > 0
+    response, warm = fetch()
+    assert warm == 0
+    etag = response.headers['ETag']
+
+    # Revalidation with the current ETag is a bodyless 304
+    revalidated = client.get(url, headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304 and revalidated.get_data() == b''
+    assert client.get(url, headers={'If-None-Match': '"stale"'}).status_code == 200
+
+    # The cached employer fragment leaves out fields a login changes, so logging in keeps the entry
+    assert 'last_login' not in response.get_json()['job']['employer']
+    response = client.post('/api/auth/login', json={'email': 'employer@example.com', 'password': 'password123'})
+    assert response.status_code == 200, response.get_json()
+    assert fetch()[1] == 0
+
+    def assert_invalidated(change, check):
+        nonlocal etag
+        fetch()
+        assert fetch()[1] == 0
+        change()
+        response, statements = fetch()
+        assert statements > 0, 'cache was not invalidated'
+        assert response.headers['ETag'] != etag
+        assert client.get(url, headers={'If-None-Match': etag}).status_code == 200
+        check(response.get_json()['job'])
+        etag = response.headers['ETag']
+
+    def check_title(job):
+        assert job['title'] == 'Renamed Job'
+    assert_invalidated(lambda: client.put(url, json={'title': 'Renamed Job'}, headers=employer_headers), check_title)
+
+    def check_featured(job):
+        assert job['is_featured']
+    assert_invalidated(lambda: client.put(f'/api/admin/jobs/{job_id}/toggle-featured', headers=admin_headers),
+                       check_featured)
+
+    def check_category(job):
+        assert job['category']['name'] == 'Backend'
+    assert_invalidated(lambda: client.put(f'/api/admin/categories/{category_id}', json={'name': 'Backend'},
+                                          headers=admin_headers), check_category)
+
+    def check_employer(job):
+        assert job['employer']['is_active'] is False
+    assert_invalidated(lambda: client.put(f'/api/admin/users/{employer_id}/toggle-status', headers=admin_headers),
+                       check_employer)
+    client.put(f'/api/admin/users/{employer_id}/toggle-status', headers=admin_headers)
+
+    # A profile update drops the cached copy of every posting by that employer
+    spare_url = f'/api/jobs/{spare_id}'
+    fetch()
+    fetch(spare_url)
+    assert fetch()[1] == 0 and fetch(spare_url)[1] == 0
+    response = client.put('/api/users/profile', json={'phone': '+14155550123'}, headers=employer_headers)
+    assert response.status_code == 200, response.get_json()
+    assert fetch()[1] > 0 and fetch(spare_url)[1] > 0
+
+    # Deleting drops the entry so the job is gone, not served stale
+    assert fetch(spare_url)[1] == 0
+    response = client.delete(spare_url, headers=employer_headers)
+    assert response.status_code == 200, response.get_json()
+    assert client.get(spare_url).status_code == 404
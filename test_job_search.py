@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test job full-text search: query parsing, FTS5 ranking and index sync with the jobs table
+"""
+
+
+def test_search_query_parsing():
+    """Search box input becomes phrase and prefix terms for FTS5 and tsquery"""
+    from app.utils.search import parse_search_query, to_fts5_query, to_tsquery
+
+    assert parse_search_query('Python developer') == [(['python'], False), (['developer'], True)]
+    assert parse_search_query('"data engineer" remote') == [(['data', 'engineer'], False), (['remote'], True)]
+    assert parse_search_query('senior "machine learning"') == [(['senior'], False), (['machine', 'learning'], False)]
+    assert parse_search_query('dev* ops!') == [(['dev'], True), (['ops'], True)]
+    assert parse_search_query('c++, go') == [(['c'], False), (['go'], True)]
+    assert parse_search_query('!!!') == [] and parse_search_query('') == [] and parse_search_query(None) == []
+
+    terms = parse_search_query('"data engineer" pyth')
+    assert to_fts5_query(terms) == '"data engineer" "pyth"*'
+    assert to_tsquery(terms) == 'data <-> engineer & pyth:*'
+    assert to_tsquery(parse_search_query('"react native" dev* london')) == 'react <-> native & dev:* & london:*'
+
+
+def test_job_search(app, db, client, seed, auth_headers):
+    """/api/jobs?search= matches through the FTS index, ordered by relevance"""
+    from app.models import Job
+    from app.models.job import JobType, ExperienceLevel
+    from app.utils.search import rebuild_job_search_index
+
+    employer_id, category_id = seed.employer_id, seed.category_id
+    with app.app_context():
+        def job(title, description, requirements=None):
+            return Job(employer_id=employer_id, category_id=category_id, title=title, description=description,
+                       requirements=requirements, job_type=JobType.FULL_TIME, experience_level=ExperienceLevel.MID)
+
+        jobs = [
+            job('Python Developer', 'Build Python services. Python, Python everywhere.', 'Python 3'),
+            job('Data Engineer', 'Pipelines with some Python scripting.'),
+            job('Frontend Developer', 'React and TypeScript.'),
+            job('Machine Learning Engineer', 'Train models for data products.'),
+        ]
+        db.session.add_all(jobs)
+        db.session.commit()
+        ids = {j.title: j.id for j in jobs}
+    headers = auth_headers(employer_id)
+
+    def titles(search):
+        response = client.get('/api/jobs/', query_string={'search': search, 'per_page': 50})
+        assert response.status_code == 200, response.get_json()
+        return [j['title'] for j in response.get_json()['jobs']]
+
+    # Relevance: the posting that is all about Python beats a passing mention
+    assert titles('python') == ['Python Developer', 'Data Engineer']
+    # Stemming and the trailing prefix while typing
+    assert titles('pipeline') == ['Data Engineer']
+    assert titles('type') == ['Frontend Developer']
+    assert set(titles('develop')) == {'Python Developer', 'Frontend Developer'}
+
+    # Phrases must match as phrases; bare words are ANDed
+    assert titles('"machine learning"') == ['Machine Learning Engineer']
+    assert titles('"learning machine"') == []
+    assert titles('python pipelines') == ['Data Engineer']
+
+    # Input with no searchable words filters by substring instead of returning everything
+    assert titles('!!!') == []
+    assert len(titles('   ')) == 14
+
+    # Updates and deletes are reflected by the sync triggers
+    response = client.put(f"/api/jobs/{ids['Frontend Developer']}", json={'title': 'Golang Developer'}, headers=headers)
+    assert response.status_code == 200
+    assert titles('golang') == ['Golang Developer'] and titles('frontend') == []
+    response = client.delete(f"/api/jobs/{ids['Data Engineer']}", headers=headers)
+    assert response.status_code == 200
+    assert titles('python') == ['Python Developer'] and titles('pipelines') == []
+
+    # The index is keyed on search_rowid, so renumbering jobs' rowids (as VACUUM may) leaves it intact
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql('UPDATE jobs SET rowid = rowid + 1000')
+        with db.engine.connect() as connection:
+            connection.exec_driver_sql('VACUUM')
+    assert titles('python') == ['Python Developer']
+    assert titles('"machine learning"') == ['Machine Learning Engineer']
+    response = client.put(f"/api/jobs/{ids['Python Developer']}", json={'title': 'Rust Developer'}, headers=headers)
+    assert response.status_code == 200
+    assert titles('rust') == ['Rust Developer'] and titles('"python developer"') == []
+
+    # New postings are numbered past every key in use, and a rebuild changes nothing
+    with app.app_context():
+        db.session.add(job('Kotlin Developer', 'Android apps.'))
+        db.session.commit()
+        with db.engine.begin() as connection:
+            rebuild_job_search_index(connection)
+    assert titles('kotlin') == ['Kotlin Developer']
+    assert titles('rust') == ['Rust Developer'] and titles('golang') == ['Golang Developer']
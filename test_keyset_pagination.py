@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test keyset pagination: typed cursors, rejection of tampered cursors and complete walks
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta
+
+
+def _raw_cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def test_cursor_encoding():
+    """Bool and datetime sort keys survive a cursor round trip; malformed cursors are refused"""
+    from app.models import Job
+    from app.utils.pagination import encode_cursor, decode_cursor, InvalidCursor, JOB_LIST_KEYS
+
+    columns = [getattr(Job, name) for name, _ in JOB_LIST_KEYS]
+    created_at = datetime(2024, 5, 17, 9, 30, 15, 123456)
+    for featured in (True, False):
+        cursor = encode_cursor([featured, created_at, 'job-1'])
+        assert '=' not in cursor
+        values = decode_cursor(cursor, columns)
+        assert values == [featured, created_at, 'job-1']
+        assert type(values[0]) is bool and type(values[1]) is datetime
+
+    tampered = [
+        'bogus!',
+        _raw_cursor({'is_featured': True}),
+        _raw_cursor([True, created_at.isoformat()]),
+        _raw_cursor(['yes', created_at.isoformat(), 'job-1']),
+        _raw_cursor([1, created_at.isoformat(), 'job-1']),
+        _raw_cursor([True, 'yesterday', 'job-1']),
+        _raw_cursor([True, 1715938215, 'job-1']),
+        _raw_cursor([True, created_at.isoformat(), 42]),
+    ]
+    for cursor in tampered:
+        try:
+            decode_cursor(cursor, columns)
+        except InvalidCursor:
+            continue
+        raise AssertionError(f'Cursor {cursor!r} was accepted')
+
+
+def test_keyset_pagination(app, db, client, seed, auth_headers):
+    """/api/jobs/?cursor= walks every job exactly once, featured first"""
+    from app.models import Job
+
+    with app.app_context():
+        # Distinct timestamps plus a tie, and two featured jobs that must lead the walk
+        started = datetime.utcnow() - timedelta(days=1)
+        jobs = Job.query.order_by(Job.title).all()
+        for i, job in enumerate(jobs):
+            job.created_at = started + timedelta(minutes=min(i, 8))
+            job.is_featured = i in (2, 7)
+        db.session.commit()
+        expected = [job.id for job in sorted(jobs, key=lambda j: (j.is_featured, j.created_at, j.id), reverse=True)]
+
+    employer_headers = auth_headers(seed.employer_id)
+
+    seen, cursor, pages = [], '', 0
+    while cursor is not None:
+        response = client.get('/api/jobs/', query_string={'cursor': cursor, 'per_page': 3, 'include_total': 'true'})
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        assert body['pagination']['total'] == 10
+        seen.extend(job['id'] for job in body['jobs'])
+        cursor = body['pagination']['next_cursor']
+        assert body['pagination']['has_next'] == (cursor is not None)
+        pages += 1
+    assert seen == expected
+    assert pages == 4
+
+    # A page that ends exactly on the last row has no next cursor
+    body = client.get('/api/jobs/', query_string={'cursor': '', 'per_page': 10}).get_json()
+    assert len(body['jobs']) == 10 and body['pagination']['next_cursor'] is None
+    assert not body['pagination']['has_next']
+
+    # Tampered cursors are a client error, not a 500
+    for cursor in ('bogus!', _raw_cursor(['yes', datetime.utcnow().isoformat(), 'x']), _raw_cursor([True])):
+        response = client.get('/api/jobs/', query_string={'cursor': cursor})
+        assert response.status_code == 400, (cursor, response.get_json())
+
+    # Keyset order would drop relevance ranking, so search + cursor is refused
+    response = client.get('/api/jobs/', query_string={'search': 'job', 'cursor': ''})
+    assert response.status_code == 400
+    response = client.get('/api/jobs/', query_string={'search': 'job'})
+    assert response.status_code == 200 and response.get_json()['pagination']['total'] == 10
+
+    # The employer's own listing walks newest first
+    seen, cursor = [], ''
+    while cursor is not None:
+        response = client.get('/api/jobs/employer', query_string={'cursor': cursor, 'per_page': 4},
+                              headers=employer_headers)
+        assert response.status_code == 200, response.get_json()
+        seen.extend(job['id'] for job in response.get_json()['jobs'])
+        cursor = response.get_json()['pagination']['next_cursor']
+    assert sorted(seen) == sorted(expected) and len(set(seen)) == 10
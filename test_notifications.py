@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test the notifications subsystem: creation hooks, realtime push, paginated list, unread count, bulk read
+"""
+
+import pytest
+
+
+@pytest.fixture
+def app_env():
+    return {'ANALYTICS_BUFFER_ENABLED': 'False'}
+
+
+def test_notifications(app, db, client, seed, count_queries, socket_events):
+    """Events create notifications that are pushed live and served from slim, indexed queries"""
+    from app import socketio
+    from app.models import User, Job, Notification
+    from app.models.job import JobType, ExperienceLevel
+    from app.models.notification import NotificationType
+    from app.utils.identity import access_claims
+    from flask_jwt_extended import create_access_token
+
+    employer_id, seeker_id, conversation_id = seed.employer_id, seed.seeker_id, seed.conversation_id
+    with app.app_context():
+        job = Job(employer_id=employer_id, category_id=seed.category_id, title='Ceramicist', description='Description',
+                  job_type=JobType.FULL_TIME, experience_level=ExperienceLevel.MID)
+        db.session.add(job)
+        db.session.commit()
+        new_job_id = job.id
+        tokens = {
+            user.id: create_access_token(identity=user.id, additional_claims=access_claims(user))
+            for user in User.query.all()
+        }
+
+    employer_headers = {'Authorization': f'Bearer {tokens[employer_id]}'}
+    seeker_headers = {'Authorization': f'Bearer {tokens[seeker_id]}'}
+    employer_socket = socketio.test_client(app, flask_test_client=client, auth={'token': tokens[employer_id]})
+    seeker_socket = socketio.test_client(app, flask_test_client=client, auth={'token': tokens[seeker_id]})
+
+    # Applying notifies the employer, live
+    response = client.post('/api/applications/', json={'job_id': new_job_id}, headers=seeker_headers)
+    assert response.status_code == 201
+    application_id = response.get_json()['application']['id']
+    pushed = socket_events(employer_socket, 'notification')
+    assert len(pushed) == 1
+    assert pushed[0]['notification_type'] == 'application_received'
+    assert pushed[0]['related_application_id'] == application_id and pushed[0]['related_user_id'] == seeker_id
+    assert not socket_events(seeker_socket, 'notification')
+
+    # Status changes notify the applicant; interviews are high priority
+    response = client.put(f'/api/applications/{application_id}/status', json={'status': 'reviewing'},
+                          headers=employer_headers)
+    assert response.status_code == 200
+    response = client.put(f'/api/applications/{application_id}/status',
+                          json={'status': 'interview_scheduled', 'interview_date': '2026-11-02T10:00:00'},
+                          headers=employer_headers)
+    assert response.status_code == 200
+    pushed = socket_events(seeker_socket, 'notification')
+    assert [n['notification_type'] for n in pushed] == ['application_status_changed', 'interview_scheduled']
+    assert pushed[1]['priority'] == 'high' and 'Ceramicist' in pushed[1]['message']
+
+    # Messages notify the recipient with a snippet and the conversation
+    response = client.post(f'/api/messages/conversations/{conversation_id}/messages',
+                           json={'content': 'See you at the studio ' + 'x' * 300}, headers=employer_headers)
+    assert response.status_code == 201
+    pushed = socket_events(seeker_socket, 'notification')
+    assert len(pushed) == 1 and pushed[0]['notification_type'] == 'new_message'
+    assert pushed[0]['notification_metadata'] == {'conversation_id': conversation_id}
+    assert pushed[0]['message'].startswith('See you at the studio') and len(pushed[0]['message']) == 120
+
+    # Fill the seeker's list: 30 more, one of them deleted
+    with app.app_context():
+        for i in range(30):
+            db.session.add(Notification(user_id=seeker_id, title=f'Tip {i}', message='Tip',
+                                        notification_type=NotificationType.SYSTEM_ANNOUNCEMENT,
+                                        is_deleted=(i == 0), related_job_id=seed.job_id))
+        db.session.commit()
+
+    # Constant queries per page, and rows without nested related objects
+    counts = {}
+    for per_page in (5, 20):
+        with count_queries() as statements:
+            response = client.get(f'/api/notifications/?per_page={per_page}', headers=seeker_headers)
+        assert response.status_code == 200
+        assert len(response.get_json()['notifications']) == per_page
+        counts[per_page] = len(statements)
+    assert counts[5] == counts[20] == 1, counts
+    row = response.get_json()['notifications'][0]
+    assert not {'user', 'related_job', 'related_application', 'related_message', 'related_user'} & set(row)
+
+    # Cursor pagination over live notifications only
+    seen, cursor = [], ''
+    while True:
+        body = client.get(f'/api/notifications/?per_page=8&include_total=true&cursor={cursor}',
+                          headers=seeker_headers).get_json()
+        assert body['pagination']['total'] == 32
+        seen.extend(n['id'] for n in body['notifications'])
+        if not body['pagination']['has_next']:
+            break
+        cursor = body['pagination']['next_cursor']
+    assert len(seen) == len(set(seen)) == 32
+
+    # Unread count and bulk mark-read by ids, then everything
+    def unread_count():
+        return client.get('/api/notifications/unread-count', headers=seeker_headers).get_json()['unread_count']
+
+    assert unread_count() == 32
+    unread = client.get('/api/notifications/?unread_only=true&per_page=5', headers=seeker_headers).get_json()['notifications']
+    seeker_socket.get_received()
+    with count_queries() as statements:
+        response = client.put('/api/notifications/read', json={'ids': [n['id'] for n in unread]}, headers=seeker_headers)
+    assert response.status_code == 200 and response.get_json()['marked_read'] == 5
+    assert len([s for s in statements if s.lstrip().upper().startswith('UPDATE')]) == 1
+    receipts = socket_events(seeker_socket, 'notifications_read')
+    assert len(receipts) == 1 and sorted(receipts[0]['ids']) == sorted(n['id'] for n in unread)
+    assert unread_count() == 27
+    response = client.put('/api/notifications/read', json={'ids': [unread[0]['id']]}, headers=employer_headers)
+    assert response.get_json()['marked_read'] == 0
+    response = client.put('/api/notifications/read', json={'ids': 'nope'}, headers=seeker_headers)
+    assert response.status_code == 400
+    response = client.put('/api/notifications/read', headers=seeker_headers)
+    assert response.get_json()['marked_read'] == 27 and unread_count() == 0
+
+    employer_socket.disconnect()
+    seeker_socket.disconnect()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test password hashing: inline by default or in an opt-in pool, calibrated bcrypt cost and rehash on login
+"""
+
+import multiprocessing
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def app_env():
+    # The stored hash below uses cost 4, so logins must upgrade it
+    return {'PASSWORD_HASH_WORKERS': 2, 'PASSWORD_HASH_ROUNDS': 6}
+
+
+def _create_app(monkeypatch, **env):
+    monkeypatch.delenv('PASSWORD_HASH_ROUNDS', raising=False)
+    monkeypatch.setenv('PASSWORD_HASH_MIN_ROUNDS', '4')
+    monkeypatch.setenv('PASSWORD_HASH_MAX_ROUNDS', '8')
+    for key, value in env.items():
+        monkeypatch.setenv(key, str(value))
+
+    from main_app import create_app
+
+    return create_app()
+
+
+def test_calibrated_rounds(monkeypatch):
+    """The cost is calibrated within its bounds and never below BCRYPT_LOG_ROUNDS"""
+    from app import password_hasher
+    from app.utils.passwords import calibrate_rounds
+
+    assert calibrate_rounds(0, 4, 8) == 4 and calibrate_rounds(10 ** 6, 4, 8) == 8
+    assert calibrate_rounds(0) == 12
+    _create_app(monkeypatch, BCRYPT_LOG_ROUNDS=4)
+    assert 4 <= password_hasher.rounds <= 8
+
+    # Never below the configured Flask-Bcrypt cost, whatever the minimum says
+    _create_app(monkeypatch, BCRYPT_LOG_ROUNDS=7, PASSWORD_HASH_TARGET_MS=0)
+    assert password_hasher.rounds == 7
+
+
+def test_inline_by_default(monkeypatch):
+    """Without PASSWORD_HASH_WORKERS hashes run on the request thread, no pool is started"""
+    from app import password_hasher
+
+    monkeypatch.delenv('PASSWORD_HASH_WORKERS', raising=False)
+    app = _create_app(monkeypatch, BCRYPT_LOG_ROUNDS=4)
+    assert app.config['PASSWORD_HASH_WORKERS'] == 0
+    stored = password_hasher.hash('Secret123!')
+    assert password_hasher.verify(stored, 'Secret123!') and password_hasher._executor is None
+
+
+def test_pool_workers_skip_calibration(monkeypatch):
+    """Spawned pool workers re-import the app but skip the timing hash"""
+    from app import password_hasher
+    from app.utils import passwords
+
+    calls = []
+    monkeypatch.setattr(passwords, 'calibrate_rounds', lambda *args: calls.append(args) or 8)
+    monkeypatch.setattr(multiprocessing, 'parent_process', lambda: object())
+    _create_app(monkeypatch, BCRYPT_LOG_ROUNDS=7)
+    assert not calls and password_hasher.rounds == 7
+
+
+def test_login_rehash(app, db, client):
+    """Logins verify in the hash pool and upgrade hashes stored with an outdated cost"""
+    import bcrypt
+    from app import password_hasher
+    from app.models import User
+    from app.models.user import UserRole
+    from app.utils.passwords import hash_rounds
+
+    with app.app_context():
+        user = User(email='seeker@example.com', role=UserRole.JOB_SEEKER,
+                    password_hash=bcrypt.hashpw(b'Secret123!', bcrypt.gensalt(4)).decode('utf-8'))
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+    results = []
+
+    def login(password):
+        response = app.test_client().post('/api/auth/login', json={'email': 'seeker@example.com', 'password': password})
+        results.append(response.status_code)
+
+    threads = [threading.Thread(target=login, args=('Secret123!',)) for _ in range(6)]
+    threads.append(threading.Thread(target=login, args=('wrong',)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == [200] * 6 + [401], results
+    assert password_hasher._executor is not None
+
+    with app.app_context():
+        stored = db.session.get(User, user_id).password_hash
+    assert hash_rounds(stored) == 6 and not password_hasher.needs_rehash(stored)
+    assert client.post('/api/auth/login', json={'email': 'seeker@example.com', 'password': 'Secret123!'}).status_code == 200
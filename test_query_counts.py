@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test SQL statement budgets for list/detail endpoints (guards against N+1 lazy loads)
+"""
+
+# Maximum SQL statements per request, independent of page size
+QUERY_BUDGETS = {
+    '/api/jobs/': 4,
+    '/api/jobs/employer': 4,
+    '/api/jobs/{job_id}': 2,
+    '/api/applications/ (job seeker)': 4,
+    '/api/applications/ (employer)': 4,
+    '/api/applications/{application_id}': 4,
+    '/api/messages/conversations': 3,
+    '/api/messages/conversations/{conversation_id}/messages': 6,
+    '/api/messages/inbox': 2,
+    '/api/notifications/': 2,
+    '/api/notifications/unread-count': 2,
+}
+
+
+def test_query_counts(client, seed, auth_headers, count_queries):
+    """Assert each endpoint stays within its SQL statement budget"""
+    employer_headers = auth_headers(seed.employer_id)
+    seeker_headers = auth_headers(seed.seeker_id)
+
+    requests_to_check = [
+        ('/api/jobs/', '/api/jobs/', {}),
+        ('/api/jobs/employer', '/api/jobs/employer', employer_headers),
+        ('/api/jobs/{job_id}', f'/api/jobs/{seed.job_id}', {}),
+        ('/api/applications/ (job seeker)', '/api/applications/', seeker_headers),
+        ('/api/applications/ (employer)', '/api/applications/', employer_headers),
+        ('/api/applications/{application_id}', f'/api/applications/{seed.application_id}', seeker_headers),
+        ('/api/messages/conversations', '/api/messages/conversations', seeker_headers),
+        ('/api/messages/inbox', '/api/messages/inbox', seeker_headers),
+        ('/api/notifications/', '/api/notifications/', seeker_headers),
+        ('/api/notifications/unread-count', '/api/notifications/unread-count', seeker_headers),
+        ('/api/messages/conversations/{conversation_id}/messages',
+         f'/api/messages/conversations/{seed.conversation_id}/messages', seeker_headers),
+    ]
+
+    over_budget = {}
+    for name, url, headers in requests_to_check:
+        with count_queries() as statements:
+            response = client.get(url, headers=headers)
+        assert response.status_code == 200, (name, response.get_json())
+        if len(statements) > QUERY_BUDGETS[name]:
+            over_budget[name] = len(statements)
+
+    assert not over_budget, f"Endpoints over their query budget: {over_budget}"
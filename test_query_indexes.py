@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test that the hot query paths are served by indexes (EXPLAIN QUERY PLAN)
+"""
+
+from datetime import date, datetime
+
+
+def _query_plan(db, query):
+    """Return the EXPLAIN QUERY PLAN detail lines for a SQLAlchemy query"""
+    statement = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {statement}')).fetchall()
+    return [row[-1] for row in rows]
+
+
+def _uses_index(plan, table):
+    """True if every access to `table` goes through an index"""
+    accesses = [line for line in plan if f' {table}' in f' {line}' and line.startswith(('SCAN', 'SEARCH'))]
+    return bool(accesses) and all('INDEX' in line for line in accesses)
+
+
+def test_query_indexes(app, db):
+    """Assert each hot query path uses an index rather than a table scan"""
+    from sqlalchemy import desc
+    from app.models import User, Job, Application, Message, Conversation, Notification, UserAnalytics, JobAnalytics
+
+    with app.app_context():
+        hot_queries = {
+            'jobs listing': (
+                'jobs',
+                Job.query.filter(Job.is_active == True, Job.status == 'open')
+                .order_by(desc(Job.is_featured), desc(Job.created_at))
+            ),
+            'employer jobs': (
+                'jobs',
+                Job.query.filter(Job.employer_id == 'u1').order_by(desc(Job.created_at))
+            ),
+            'applicant applications': (
+                'applications',
+                Application.query.filter_by(applicant_id='u1').order_by(Application.applied_at.desc())
+            ),
+            'employer applications': (
+                'applications',
+                Application.query.join(Job).filter(Job.employer_id == 'u1').order_by(Application.applied_at.desc())
+            ),
+            'has applied': (
+                'applications',
+                Application.query.filter_by(job_id='j1', applicant_id='u1')
+            ),
+            'unread count': (
+                'messages',
+                Message.query.filter_by(recipient_id='u1', is_read=False)
+            ),
+            'conversation messages': (
+                'messages',
+                Message.query.filter_by(conversation_id='c1').order_by(Message.created_at.desc())
+            ),
+            'inbox': (
+                'conversations',
+                Conversation.query.filter(
+                    (Conversation.participant1_id == 'u1') | (Conversation.participant2_id == 'u1')
+                )
+            ),
+            'notifications list': (
+                'notifications',
+                Notification.query.filter(Notification.user_id == 'u1', Notification.is_deleted == db.false())
+                .order_by(Notification.created_at.desc())
+            ),
+            'notifications unread count': (
+                'notifications',
+                Notification.query.filter(Notification.user_id == 'u1', Notification.is_read == db.false(),
+                                          Notification.is_deleted == db.false())
+            ),
+            'user analytics day': (
+                'user_analytics',
+                UserAnalytics.query.filter_by(user_id='u1', date=date.today())
+            ),
+            'job analytics day': (
+                'job_analytics',
+                JobAnalytics.query.filter_by(job_id='j1', date=date.today())
+            ),
+            'active users': (
+                'users',
+                User.query.filter(User.last_login >= datetime(2024, 1, 1))
+            ),
+        }
+
+        failures = {}
+        for name, (table, query) in hot_queries.items():
+            plan = _query_plan(db, query)
+            if not _uses_index(plan, table):
+                failures[name] = ' | '.join(plan)
+
+        assert not failures, f"Queries not using an index: {failures}"
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test the authenticated SocketIO layer: per-user and per-conversation rooms, typing and read receipts
+"""
+
+
+def test_realtime(app, db, client, seed, socket_events):
+    """Sockets authenticate with an access token and receive only their own users' events"""
+    from app import socketio, token_blocklist
+    from app.models import User
+    from app.models.user import UserRole
+    from app.utils.identity import access_claims
+    from app.utils.unread import reconcile_unread_counts
+    from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
+
+    employer_id, seeker_id, conversation_id = seed.employer_id, seed.seeker_id, seed.conversation_id
+    assert app.config['SOCKETIO_BACKEND'] == 'memory'
+    with app.app_context():
+        outsider = User(email='outsider@example.com', role=UserRole.JOB_SEEKER, password_hash='x')
+        db.session.add(outsider)
+        db.session.commit()
+        reconcile_unread_counts()
+        tokens = {
+            user.id: create_access_token(identity=user.id, additional_claims=access_claims(user))
+            for user in User.query.all()
+        }
+        outsider_id = outsider.id
+        refresh_token = create_refresh_token(identity=seeker_id)
+
+    def connect(user_id, **kwargs):
+        return socketio.test_client(app, flask_test_client=client, auth={'token': tokens[user_id]}, **kwargs)
+
+    # Connecting requires a valid, unrevoked access token
+    assert not socketio.test_client(app, flask_test_client=client).is_connected()
+    assert not socketio.test_client(app, flask_test_client=client, auth={'token': 'garbage'}).is_connected()
+    assert not socketio.test_client(app, flask_test_client=client, auth={'token': refresh_token}).is_connected()
+    employer = connect(employer_id)
+    seeker = connect(seeker_id)
+    seeker_other_tab = socketio.test_client(app, flask_test_client=client,
+                                            headers={'Authorization': f'Bearer {tokens[seeker_id]}'})
+    outsider = connect(outsider_id)
+    assert employer.is_connected() and seeker.is_connected() and seeker_other_tab.is_connected()
+
+    # New messages reach both participants' sockets, including other tabs, and nobody else
+    for socket in (employer, seeker, seeker_other_tab, outsider):
+        socket.get_received()
+    response = client.post(f'/api/messages/conversations/{conversation_id}/messages',
+                           json={'content': 'Hello over the socket'},
+                           headers={'Authorization': f'Bearer {tokens[employer_id]}'})
+    assert response.status_code == 201
+    for socket in (employer, seeker, seeker_other_tab):
+        received = socket_events(socket, 'new_message')
+        assert len(received) == 1 and received[0]['message']['content'] == 'Hello over the socket'
+    assert not outsider.get_received()
+
+    # Only participants may join a conversation room
+    assert employer.emit('join_conversation', {'conversation_id': conversation_id}, callback=True) == {'ok': True}
+    assert seeker.emit('join_conversation', {'conversation_id': conversation_id}, callback=True) == {'ok': True}
+    assert outsider.emit('join_conversation', {'conversation_id': conversation_id}, callback=True) == {'error': 'Conversation not found'}
+    assert outsider.emit('typing', {'conversation_id': conversation_id}, callback=True) == {'error': 'Join the conversation first'}
+
+    # Typing goes to the other sockets viewing the conversation, not the sender or other tabs
+    assert seeker.emit('typing', {'conversation_id': conversation_id, 'is_typing': True}, callback=True) == {'ok': True}
+    typing = socket_events(employer, 'typing')
+    assert typing == [{'conversation_id': conversation_id, 'user_id': seeker_id, 'is_typing': True}]
+    assert not socket_events(seeker, 'typing') and not socket_events(seeker_other_tab, 'typing') and not outsider.get_received()
+
+    # Marking read over the socket sends one receipt for the whole batch
+    for socket in (employer, seeker, seeker_other_tab):
+        socket.get_received()
+    ack = seeker.emit('mark_read', {'conversation_id': conversation_id}, callback=True)
+    assert ack == {'ok': True, 'marked_read': 11}
+    receipts = socket_events(employer, 'messages_read')
+    assert len(receipts) == 1 and len(receipts[0]['message_ids']) == 11 and receipts[0]['reader_id'] == seeker_id
+    assert len(socket_events(seeker_other_tab, 'messages_read')) == 1
+    with app.app_context():
+        assert db.session.get(User, seeker_id).unread_messages_count == 0
+    assert seeker.emit('mark_read', {'conversation_id': conversation_id}, callback=True) == {'ok': True, 'marked_read': 0}
+    assert not socket_events(employer, 'messages_read')
+
+    # A revoked token stops working on an open socket
+    with app.app_context():
+        token_blocklist.revoke_token(decode_token(tokens[employer_id]))
+    assert employer.emit('typing', {'conversation_id': conversation_id}, callback=True) == {'error': 'Unauthorized'}
+    assert not connect(employer_id).is_connected()
+
+    for socket in (employer, seeker, seeker_other_tab, outsider):
+        if socket.is_connected():
+            socket.disconnect()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test role claims in access tokens: claim-based authorization, revocation on deactivation and refresh
+"""
+
+
+def test_role_claims(app, db, client, seed, admin_id, count_queries, user_lookups):
+    """Login tokens authorize role-gated routes without a user query; deactivation revokes them"""
+    from app import identity_cache
+    from app.models import User
+    from flask_jwt_extended import decode_token
+
+    employer_id = seed.employer_id
+    with app.app_context():
+        for user in User.query.filter(User.id.in_([employer_id, seed.seeker_id, admin_id])):
+            user.set_password('Secret123!')
+        db.session.commit()
+
+    def login(email):
+        response = client.post('/api/auth/login', json={'email': email, 'password': 'Secret123!'})
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()
+
+    employer_tokens = login('employer@example.com')
+    seeker_tokens = login('seeker@example.com')
+    admin_tokens = login('admin@example.com')
+    employer_headers = {'Authorization': f"Bearer {employer_tokens['access_token']}"}
+    seeker_headers = {'Authorization': f"Bearer {seeker_tokens['access_token']}"}
+    admin_headers = {'Authorization': f"Bearer {admin_tokens['access_token']}"}
+    with app.app_context():
+        claims = decode_token(employer_tokens['access_token'])
+    assert claims['role'] == 'employer' and claims['active'] is True
+
+    # Role-gated routes authorize from the token alone, even with a cold identity cache
+    identity_cache.invalidate_all()
+    with count_queries() as statements:
+        response = client.get('/api/jobs/employer', headers=employer_headers)
+    assert response.status_code == 200 and not user_lookups(statements)
+    response = client.put(f'/api/applications/{seed.application_id}/status', headers=employer_headers,
+                          json={'status': 'reviewing'})
+    assert response.status_code == 200, response.get_json()
+
+    response = client.get('/api/jobs/employer', headers=seeker_headers)
+    assert response.status_code == 403 and response.get_json()['error'] == 'Only employers can access this endpoint'
+    response = client.post('/api/users/cv/batch-parse', headers=seeker_headers)
+    assert response.status_code == 403 and response.get_json()['error'] == 'Only employers and admins can batch parse CVs'
+    assert client.get('/api/analytics/buffer', headers=seeker_headers).status_code == 403
+    assert client.get('/api/analytics/buffer', headers=admin_headers).status_code == 200
+
+    # Deactivation revokes the user's outstanding tokens, access and refresh alike
+    assert client.put(f'/api/admin/users/{employer_id}/toggle-status', headers=admin_headers).status_code == 200
+    response = client.get('/api/jobs/employer', headers=employer_headers)
+    assert response.status_code == 401 and response.get_json()['message'] == 'Token has been revoked'
+    refresh_headers = {'Authorization': f"Bearer {employer_tokens['refresh_token']}"}
+    assert client.post('/api/auth/refresh', headers=refresh_headers).status_code == 401
+
+    # Once reactivated, refresh mints a new access token with claims
+    assert client.put(f'/api/admin/users/{employer_id}/toggle-status', headers=admin_headers).status_code == 200
+    response = client.post('/api/auth/refresh', headers=refresh_headers)
+    assert response.status_code == 200
+    with app.app_context():
+        assert decode_token(response.get_json()['access_token'])['role'] == 'employer'
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test logout token revocation: JTI blocklist checks and expiry of blocklist entries
+"""
+
+import time
+
+import pytest
+
+
+@pytest.fixture
+def app_env():
+    return {'TOKEN_BLOCKLIST_BACKEND': 'memory'}
+
+
+def test_token_blocklist(app, db, client, seed, count_queries):
+    """Logged-out tokens are refused without any SQL; other sessions keep working"""
+    from app.models import User
+
+    with app.app_context():
+        db.session.get(User, seed.employer_id).set_password('Secret123!')
+        db.session.commit()
+
+    def login():
+        response = client.post('/api/auth/login', json={'email': 'employer@example.com', 'password': 'Secret123!'})
+        assert response.status_code == 200
+        tokens = response.get_json()
+        return {'Authorization': f"Bearer {tokens['access_token']}"}, tokens['refresh_token']
+
+    headers, refresh_token = login()
+    other_headers, _ = login()
+    assert client.get('/api/jobs/employer', headers=headers).status_code == 200
+
+    response = client.post('/api/auth/logout', headers=headers, json={'refresh_token': 'not-a-token'})
+    assert response.status_code == 400
+    response = client.post('/api/auth/logout', headers=headers, json={'refresh_token': refresh_token})
+    assert response.status_code == 200
+
+    with count_queries() as statements:
+        response = client.get('/api/jobs/employer', headers=headers)
+    assert response.status_code == 401 and response.get_json()['message'] == 'Token has been revoked'
+    assert statements == []
+    assert client.post('/api/auth/refresh', headers={'Authorization': f'Bearer {refresh_token}'}).status_code == 401
+
+    # Other sessions of the same user keep working
+    assert client.get('/api/jobs/employer', headers=other_headers).status_code == 200
+
+
+def test_blocklist_expiry():
+    """Entries expire with their token and are swept from memory"""
+    from app.utils.revocation import MemoryBlocklistStore
+
+    store = MemoryBlocklistStore()
+    store.add('jti:old', time.time() - 1)
+    store.add('jti:live', time.time() + 60)
+    assert not store.contains('jti:old') and store.contains('jti:missing', 'jti:live')
+    store._next_sweep = 0
+    store.add('jti:new', time.time() + 60)
+    assert set(store._entries) == {'jti:live', 'jti:new'}
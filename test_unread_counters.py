@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test the denormalised unread counters: maintained on send and read, O(1) to query, reconcilable
+"""
+
+
+def test_unread_counters(app, db, client, seed, auth_headers, count_queries):
+    """Unread badges come from counters kept in step with Message.is_read"""
+    from app.models import User, Message, Conversation
+    from app.utils.unread import reconcile_unread_counts
+
+    employer_id, seeker_id = seed.employer_id, seed.seeker_id
+    employer_headers = auth_headers(employer_id)
+    seeker_headers = auth_headers(seeker_id)
+
+    def counters():
+        with app.app_context():
+            conversation = db.session.get(Conversation, seed.conversation_id)
+            return (
+                conversation.unread_count_for(employer_id),
+                conversation.unread_count_for(seeker_id),
+                db.session.get(User, employer_id).unread_messages_count,
+                db.session.get(User, seeker_id).unread_messages_count,
+            )
+
+    # The seeded messages were inserted directly, so the counters start out of step
+    assert counters() == (0, 0, 0, 0)
+    with app.app_context():
+        assert reconcile_unread_counts() == (1, 1)
+        assert reconcile_unread_counts() == (0, 0)
+    assert counters() == (0, 10, 0, 10)
+
+    # Sending counts the message for the recipient only
+    url = f'/api/messages/conversations/{seed.conversation_id}/messages'
+    for i in range(5):
+        response = client.post(url, json={'content': f'Reply {i}'}, headers=seeker_headers)
+        assert response.status_code == 201
+    response = client.post(url, json={'content': 'Follow-up'}, headers=employer_headers)
+    assert response.status_code == 201
+    assert counters() == (5, 11, 5, 11)
+
+    # The navbar badge is a single primary-key read, no COUNT over messages
+    with count_queries() as statements:
+        response = client.get('/api/messages/unread-count', headers=seeker_headers)
+    assert response.status_code == 200 and response.get_json()['unread_count'] == 11
+    assert not [s for s in statements if 'count(' in s.lower()]
+
+    # Reading a page takes exactly the marked messages off both counters
+    response = client.get(f'{url}?per_page=8', headers=seeker_headers)
+    assert response.status_code == 200
+    assert counters() == (5, 8, 5, 8)
+    with app.app_context():
+        newest_id = Message.query.filter_by(recipient_id=employer_id).order_by(Message.created_at.desc()).first().id
+    response = client.put(f'/api/messages/messages/{newest_id}/read', headers=employer_headers)
+    assert response.status_code == 200
+    assert counters() == (0, 8, 0, 8)
+
+    # Counters match the messages table, so reconciliation finds nothing to fix
+    with app.app_context():
+        assert reconcile_unread_counts() == (0, 0)
+        assert Message.query.filter_by(recipient_id=seeker_id, is_read=False).count() == 8